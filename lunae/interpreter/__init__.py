@@ -2,9 +2,23 @@
 The `lunae.interpreter` package provides tools for interpreting parsed data and executing commands.
 """
 
-from typing import Any, Optional
-
-from lunae.interpreter.environment import Binding, Environment
+import sys
+from functools import partial
+from typing import Any, Callable, Iterator, Optional, TextIO
+
+from lunae.interpreter.bytecode import BytecodeCompiler, VirtualMachine
+from lunae.interpreter.closure import ClosureCompiler, SlotCompiler
+from lunae.interpreter.codegen import PythonCodeGenerator
+from lunae.interpreter.environment import Environment, LookupCache
+from lunae.interpreter.frame import Frame
+from lunae.interpreter.function import LunaeFunction
+from lunae.interpreter.memo import MISSING, MemoCache, effects, memoize
+from lunae.interpreter.operators import OPERATORS
+from lunae.interpreter.pool import escapes
+from lunae.interpreter.program import Program, tree_size
+from lunae.interpreter.resolver import Resolver
+from lunae.interpreter.stackmachine import StackMachine
+from lunae.interpreter.tailcall import tail_call
 from lunae.language.ast.base.block import Block
 from lunae.language.ast.base.expr import Expr
 from lunae.language.ast.controls.forexpr import ForExpr
@@ -16,23 +30,22 @@ from lunae.language.ast.values.assign import Assign
 from lunae.language.ast.values.number import Number
 from lunae.language.ast.values.string import String
 from lunae.language.ast.values.var import Var
-from lunae.language.typesystem import Type
-from lunae.parser import parse
-from lunae.tokenizer import tokenize
+from lunae.language.typesystem import FUNCTION
+from lunae.parser import parse, parse_iter
+from lunae.parser.cache import ASTCache
+from lunae.tokenizer import tokenize, tokenize_stream
+from lunae.tokenizer.stream import DEFAULT_CHUNK_SIZE
 from lunae.utils.errors import InterpreterError
 
-OPERATORS = {
-    "add": lambda a, b: a + b,
-    "sub": lambda a, b: a - b,
-    "mul": lambda a, b: a * b,
-    "div": lambda a, b: a / b,
-    "mod": lambda a, b: a % b,
-    "is": lambda a, b: a == b,
-    "less": lambda a, b: a < b,
-    "more": lambda a, b: a > b,
-    "neg": lambda a: -a,
-    "not": lambda a: not a,
-}
+ENGINES = ("tree", "closure", "bytecode", "python", "slots", "stack")
+"""
+tuple[str, ...]: The execution engines supported by the interpreter.
+"""
+
+DEFAULT_PROGRAMS = 128
+"""
+int: The default number of programs kept by `Interpreter.execute`.
+"""
 
 
 def create_global_env() -> Environment:
@@ -45,29 +58,76 @@ def create_global_env() -> Environment:
     env = Environment()
 
     for op, fn in OPERATORS.items():
-        env.define(op, Binding(fn, Type("FUNCTION"), False))
+        env.define(op, fn, FUNCTION)
 
     return env
 
 
+def binds(env: Environment, names: frozenset[str]) -> bool:
+    """
+    Checks whether an environment binds any of some names.
+
+    Args:
+        env (Environment): The environment.
+        names (frozenset[str]): The names.
+
+    Returns:
+        bool: True if a scope of the environment binds one of the names.
+    """
+    scope: Optional[Environment] = env
+    while scope is not None:
+        if not names.isdisjoint(scope.values):
+            return True
+        scope = scope.parent
+    return False
+
+
 class Interpreter:
     """
     The main interpreter class that evaluates the abstract syntax tree (AST).
     """
 
-    def __init__(self, global_env: Optional[Environment] = None):
+    def __init__(
+        self,
+        global_env: Optional[Environment] = None,
+        engine: str = "tree",
+        cache: Optional[ASTCache] = None,
+    ):
         """
         Initializes the interpreter with a global environment.
 
         Args:
             global_env (Optional[Environment]): The global environment to use.
+            engine (str): The execution engine, one of `ENGINES`. "tree" walks
+                the AST, "closure" compiles it to closures before running it,
+                "bytecode" compiles it to bytecode run by a virtual machine,
+                "python" generates and compiles Python code from it, "slots"
+                resolves its variables to frame slots and compiles it to closures,
+                "stack" evaluates it without recursion, for deep programs.
+            cache (Optional[ASTCache]): The cache of parsed sources used by
+                `execute`, by default the one set by `LUNAE_CACHE_DIR`, if any.
+
+        Raises:
+            InterpreterError: If the engine is unknown.
         """
+        if engine not in ENGINES:
+            raise InterpreterError(f"Unknown engine: {engine!r}", None)
+
         self.global_env = global_env or create_global_env()
+        self.engine = engine
+        self.cache = cache if cache is not None else ASTCache.for_file()
+        self.programs = MemoCache(DEFAULT_PROGRAMS)
+        self.bytecode_compiler = BytecodeCompiler()
+        self.vm = VirtualMachine()
+        self.code_generator = PythonCodeGenerator()
+        self.resolver = Resolver()
+        self.stack_machine = StackMachine()
 
     def execute(self, source: str):
         """
         Execute the provided source.
-        This method is sugar for interpreter.eval(parser.parse(tokenizer.tokenize(source)))
+        This method is sugar for interpreter.run(interpreter.compile(source)),
+        with the programs of the recently executed sources kept in `programs`.
 
         Args:
             source (str): The code to be executed.
@@ -75,9 +135,174 @@ class Interpreter:
         Returns:
             Any: The result of the execution
         """
-        tokens = tokenize(source)
-        ast = parse(tokens)
-        return self.eval(ast)
+        key = (source,)
+        program = self.programs.lookup(key)
+        if program is MISSING:
+            program = self.compile(source)
+            self.programs.store(key, program, program.nbytes)
+        return self.run(program)
+
+    def execute_stream(
+        self, stream: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[Any]:
+        """
+        Executes the source code read from a text stream, one top-level statement at a time.
+
+        Each statement is run as soon as it is parsed, and its tree is
+        released before the next one is read, so the first result comes
+        without reading the whole stream, and the memory used scales with
+        the largest statement.
+
+        Args:
+            stream (TextIO): The stream to read the source code from.
+            chunk_size (int): The number of characters to read at once.
+
+        Yields:
+            Any: The result of each top-level statement.
+        """
+        for statement in parse_iter(tokenize_stream(stream, chunk_size)):
+            yield self.eval(self.analyze(statement))
+
+    def compile(self, source: str, optimized: bool = False) -> Program:
+        """
+        Parses a source into a program, which can be run many times.
+
+        The `for` loops whose results are not used are marked so that they
+        collect nothing, by the usage analysis of `lunae.optimizer`.
+
+        Args:
+            source (str): The source code.
+            optimized (bool): Whether to optimize the tree for the global
+                environment of the interpreter.
+
+        Returns:
+            Program: The program.
+        """
+        if self.cache is not None:
+            ast: Expr = self.cache.parse(source)
+        else:
+            ast = parse(tokenize(source))
+        if optimized:
+            from lunae.optimizer import optimize
+
+            ast = optimize(ast, self.global_env)
+        else:
+            ast = self.analyze(ast)
+        return Program(source, ast, optimized, sys.getsizeof(source) + tree_size(ast))
+
+    def analyze(self, node: Expr) -> Expr:
+        """
+        Marks the `for` loops of a tree whose results are not used, so that
+        they collect nothing, without optimizing it otherwise.
+
+        The builtin operators may be rebound by the time the tree runs, so
+        their calls are not trusted to leave names alone.
+
+        Args:
+            node (Expr): The root node of the tree, whose own result is used.
+
+        Returns:
+            Expr: The annotated tree.
+        """
+        # pylint: disable=import-outside-toplevel,cyclic-import
+        from lunae.optimizer.usage import UsageAnalyzer
+
+        return UsageAnalyzer(()).analyze(node)
+
+    def run(self, program: Program, env: "Environment | None" = None) -> Any:
+        """
+        Runs a program.
+
+        The code compiled by the "bytecode" and "python" engines does not
+        depend on the environment, so it is kept in the program. The closures
+        compiled by the "closure" and "slots" engines inline the builtins of
+        an environment, so they are kept with the environment of the last run
+        and compiled again for another one, or once the environment binds a
+        name the slots engine resolved to a local.
+
+        Args:
+            program (Program): The program to run.
+            env (Environment | None): The environment to use, by default the global one.
+
+        Returns:
+            Any: The result of the program.
+        """
+        if env is None:
+            env = self.global_env
+
+        if self.engine == "bytecode":
+            code = program.compiled.get(self.engine)
+            if code is None:
+                code = program.compiled[self.engine] = self.bytecode_compiler.compile(
+                    program.ast
+                )
+            return self.vm.run(code, env)
+        if self.engine == "python":
+            function = program.compiled.get(self.engine)
+            if function is None:
+                function = program.compiled[self.engine] = self.code_generator.compile(
+                    program.ast
+                )
+            return function(env)
+        if self.engine in ("closure", "slots"):
+            cached = program.compiled.get(self.engine)
+            if cached is None or cached[0] is not env or binds(env, cached[2]):
+                closure = self.compile_closure(program.ast, env)
+                unbound = frozenset(
+                    self.resolver.unbound if self.engine == "slots" else ()
+                )
+                cached = program.compiled[self.engine] = (env, closure, unbound)
+            return cached[1](env)
+        return self.eval(program.ast, env)
+
+    def compile_closure(
+        self, node: Expr, env: Environment
+    ) -> Callable[[Environment], Any]:
+        """
+        Compiles a node with the closure compiler of the "closure" or "slots" engine.
+
+        Args:
+            node (Expr): The AST node to compile.
+            env (Environment): The global environment the closure will run in.
+
+        Returns:
+            Callable[[Environment], Any]: The closure, run against the environment.
+        """
+        if self.engine == "closure":
+            return ClosureCompiler(env).compile(node)
+        compiled = SlotCompiler(env).compile(self.resolver.resolve(node, env))
+        return lambda env: compiled(Frame([], None, env))
+
+    def compile_body(self, node: FuncDef) -> Callable[[Environment], Any]:
+        """
+        Compiles the body of a function definition with the engine, for a `LunaeFunction`.
+
+        The body is not compiled for a global environment, so builtins are
+        not inlined in it.
+
+        Args:
+            node (FuncDef): The function definition.
+
+        Returns:
+            Callable[[Environment], Any]: The body, run in the local scope of
+            a call, which may return a `TailCall`.
+
+        Raises:
+            InterpreterError: If the engine does not run bodies in environments.
+        """
+        if self.engine == "tree":
+            return partial(self.eval_tail, node.body)
+        if self.engine == "closure":
+            return ClosureCompiler().compile_tail(node.body)
+        if self.engine == "bytecode":
+            return partial(self.vm.run, self.bytecode_compiler.compile_function(node))
+        if self.engine == "python":
+            return self.code_generator.compile_body(node)
+        if self.engine == "stack":
+            return partial(self.stack_machine.run, node.body)
+        raise InterpreterError(
+            f"The {self.engine!r} engine does not compile function bodies", None
+        )
 
     def eval(self, node: Expr, env: "Environment | None" = None) -> Any:
         """
@@ -96,6 +321,15 @@ class Interpreter:
         if env is None:
             env = self.global_env
 
+        if self.engine in ("closure", "slots"):
+            return self.compile_closure(node, env)(env)
+        if self.engine == "bytecode":
+            return self.vm.run(self.bytecode_compiler.compile(node), env)
+        if self.engine == "python":
+            return self.code_generator.compile(node)(env)
+        if self.engine == "stack":
+            return self.stack_machine.run(node, env)
+
         method = getattr(self, "eval_" + node.__class__.__name__.lower(), None)
 
         if method is None:
@@ -140,7 +374,10 @@ class Interpreter:
         Returns:
             Any: The value of the variable.
         """
-        return env.get(node.name)
+        cache = node.cache
+        if cache is None:
+            cache = node.cache = LookupCache()
+        return env.get_cached(node.name, cache)
 
     def eval_assign(self, node: Assign, env: Environment):
         """
@@ -154,7 +391,10 @@ class Interpreter:
             Any: The value assigned.
         """
         val = self.eval(node.value, env)
-        env.set(node.name, val)
+        cache = node.cache
+        if cache is None:
+            cache = node.cache = LookupCache()
+        env.set_cached(node.name, val, cache)
         return val
 
     def eval_funccall(self, node: FuncCall, env: Environment):
@@ -168,7 +408,7 @@ class Interpreter:
         Returns:
             Any: The result of the function call.
         """
-        fn = self.eval(node.callee)
+        fn = self.eval(node.callee, env)
         args = [self.eval(a, env) for a in node.args]
         return fn(*args)
 
@@ -215,37 +455,98 @@ class Interpreter:
             env (Environment): The current environment.
 
         Returns:
-            list: The results of evaluating the body for each item in the iterable.
+            list: The results of evaluating the body for each item in the iterable,
+            None if they are discarded, or an iterator over them if lazy.
         """
         lst = self.eval(node.iterable, env)
+        if node.lazy:
+            return self.iterate_forexpr(node, lst, env)
+        cache = LookupCache()
+        if node.discard:
+            for item in lst:
+                env.set_cached(node.var, item, cache)
+                self.eval(node.body, env)
+            return None
         results = []
         for item in lst:
-            env.set(node.var, item)
+            env.set_cached(node.var, item, cache)
             results.append(self.eval(node.body, env))
         return results
 
+    def iterate_forexpr(self, node: ForExpr, lst: Any, env: Environment):
+        """
+        Evaluates the body of a lazy for expression as its results are consumed.
+
+        Args:
+            node (ForExpr): The for expression node.
+            lst (Any): The evaluated iterable.
+            env (Environment): The current environment.
+
+        Yields:
+            Any: The result of evaluating the body for each item in the iterable.
+        """
+        cache = LookupCache()
+        for item in lst:
+            env.set_cached(node.var, item, cache)
+            yield self.eval(node.body, env)
+
     def eval_funcdef(self, node: FuncDef, env: Environment):
         """
         Evaluates a function definition node.
 
+        Calls whose local scope does not escape reuse the scopes of previous
+        calls, from the `FramePool` of the function.
+
         Args:
             node (FuncDef): The function definition node.
             env (Environment): The current environment.
 
         Returns:
-            Callable: The defined function.
+            LunaeFunction: The defined function, memoized if the definition asks for it.
         """
-
-        def function(*args):
-            local = Environment(env)
-            for (name, type), val in zip(node.params, args):
-                local.set(name, val)
-            return self.eval(node.body, local)
-
+        function: Callable[..., Any] = LunaeFunction(
+            node, env, self.compile_body(node), not escapes(node), self.engine
+        )
+        if node.memoized:
+            function = memoize(function, effects(node), env)
         if node.name:
-            env.define(node.name, Binding(function, Type("FUNCTION"), False))
+            env.define_function(node.name, function)
         return function
 
+    def eval_tail(self, node: Expr, env: Environment):
+        """
+        Evaluates a node in tail position of a function body.
+
+        Calls in tail position, that is the last statement of a block or a
+        branch of an if expression in tail position, are returned as pending
+        `TailCall` instead of growing the Python stack.
+
+        Args:
+            node (Expr): The node in tail position.
+            env (Environment): The current environment.
+
+        Returns:
+            Any: The result of the evaluation, or a `TailCall`.
+        """
+        if isinstance(node, Block):
+            if not node.statements:
+                return None
+            for stmt in node.statements[:-1]:
+                self.eval(stmt, env)
+            return self.eval_tail(node.statements[-1], env)
+
+        if isinstance(node, IfExpr):
+            if self.eval(node.cond, env):
+                return self.eval_tail(node.then_branch, env)
+            return self.eval_tail(node.else_branch, env) if node.else_branch else None
+
+        if isinstance(node, FuncCall):
+            fn = self.eval(node.callee, env)
+            args = tuple(self.eval(a, env) for a in node.args)
+            return tail_call(fn, args)
+
+        return self.eval(node, env)
+
     def eval_block(self, node: Block, env: Environment):
         """
         Evaluates a block node.
@@ -278,4 +579,4 @@ def execute(source: str) -> Any:
     return result
 
 
-__all__ = ("Interpreter", "execute", "create_global_env")
+__all__ = ("Interpreter", "Program", "execute", "create_global_env", "ENGINES")
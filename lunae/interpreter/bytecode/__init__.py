@@ -0,0 +1,12 @@
+"""
+The `lunae.interpreter.bytecode` package provides a bytecode compiler, a stack-based
+virtual machine running its output, and a disassembler to inspect it.
+"""
+
+from lunae.interpreter.bytecode.code import CodeObject
+from lunae.interpreter.bytecode.compiler import BytecodeCompiler
+from lunae.interpreter.bytecode.disassembler import disassemble
+from lunae.interpreter.bytecode.opcodes import OpCode
+from lunae.interpreter.bytecode.vm import VirtualMachine
+
+__all__ = ("BytecodeCompiler", "CodeObject", "OpCode", "VirtualMachine", "disassemble")
@@ -0,0 +1,39 @@
+"""
+This module defines the CodeObject class, the unit of compiled bytecode.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from lunae.interpreter.memo import Effects
+from lunae.language.ast.functions.funcdef import FuncDef
+
+
+@dataclass(frozen=True)
+class CodeObject:
+    """
+    Represents a compiled program or function body.
+
+    Attributes:
+        name (Optional[str]): The function name, or None for a program or anonymous function.
+        params (tuple[str, ...]): The parameter names.
+        instructions (tuple[tuple[int, int], ...]): The `(opcode, argument)` pairs.
+        consts (tuple[Any, ...]): The constants referenced by `LOAD_CONST`.
+        names (tuple[str, ...]): The names referenced by name instructions.
+        memo (Optional[Effects]): The effects of a memoized function body, or None.
+        definition (Optional[FuncDef]): The definition of a function body, or None.
+        pooled (bool): Whether the calls of a function body reuse the local
+            scopes of previous calls.
+    """
+
+    name: Optional[str]
+    params: tuple[str, ...]
+    instructions: tuple[tuple[int, int], ...]
+    consts: tuple[Any, ...]
+    names: tuple[str, ...]
+    memo: Optional[Effects] = None
+    definition: Optional[FuncDef] = None
+    pooled: bool = False
+
+    def __str__(self):
+        return f"<code {self.name or '<module>'}>"
@@ -0,0 +1,390 @@
+"""
+This module provides the bytecode compiler, turning AST nodes into code objects.
+"""
+
+from typing import Any, Optional
+
+from lunae.interpreter.bytecode.code import CodeObject
+from lunae.interpreter.bytecode.opcodes import OpCode
+from lunae.interpreter.memo import Effects, effects
+from lunae.interpreter.pool import escapes
+from lunae.language.ast.base.block import Block
+from lunae.language.ast.base.expr import Expr
+from lunae.language.ast.controls.forexpr import ForExpr
+from lunae.language.ast.controls.ifexpr import IfExpr
+from lunae.language.ast.controls.whileexpr import WhileExpr
+from lunae.language.ast.functions.funccall import FuncCall
+from lunae.language.ast.functions.funcdef import FuncDef
+from lunae.language.ast.values.assign import Assign
+from lunae.language.ast.values.number import Number
+from lunae.language.ast.values.string import String
+from lunae.language.ast.values.var import Var
+from lunae.utils.errors import InterpreterError
+
+
+class CodeBuilder:
+    """
+    Accumulates the instructions, constants and names of a code object.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        params: tuple[str, ...] = (),
+        memo: Optional[Effects] = None,
+        definition: Optional[FuncDef] = None,
+    ):
+        """
+        Initializes an empty code builder.
+
+        Args:
+            name (Optional[str]): The name of the code object.
+            params (tuple[str, ...]): The parameter names.
+            memo (Optional[Effects]): The effects of a memoized function body, or None.
+            definition (Optional[FuncDef]): The definition of a function body, or None.
+        """
+        self.name = name
+        self.params = params
+        self.memo = memo
+        self.definition = definition
+        self.instructions: list[tuple[int, int]] = []
+        self.consts: list[Any] = []
+        self.names: list[str] = []
+        self.const_indices: dict[tuple[type, Any], int] = {}
+
+    @property
+    def position(self) -> int:
+        """
+        Gets the index of the next emitted instruction.
+
+        Returns:
+            int: The index of the next instruction.
+        """
+        return len(self.instructions)
+
+    def emit(self, op: OpCode, arg: int = 0) -> int:
+        """
+        Appends an instruction.
+
+        Args:
+            op (OpCode): The operation.
+            arg (int): The argument of the instruction.
+
+        Returns:
+            int: The index of the emitted instruction.
+        """
+        self.instructions.append((int(op), arg))
+        return len(self.instructions) - 1
+
+    def patch(self, index: int, target: int):
+        """
+        Sets the jump target of an already emitted instruction.
+
+        Args:
+            index (int): The index of the instruction to patch.
+            target (int): The instruction index to jump to.
+        """
+        op, _ = self.instructions[index]
+        self.instructions[index] = (op, target)
+
+    def const(self, value: Any) -> int:
+        """
+        Gets the index of a constant, adding it if needed.
+
+        Args:
+            value (Any): The constant value.
+
+        Returns:
+            int: The index of the constant.
+        """
+        if isinstance(value, CodeObject):
+            self.consts.append(value)
+            return len(self.consts) - 1
+
+        key = (type(value), value)
+        if key not in self.const_indices:
+            self.const_indices[key] = len(self.consts)
+            self.consts.append(value)
+        return self.const_indices[key]
+
+    def name_index(self, name: str) -> int:
+        """
+        Gets the index of a name, adding it if needed.
+
+        Args:
+            name (str): The name.
+
+        Returns:
+            int: The index of the name.
+        """
+        if name not in self.names:
+            self.names.append(name)
+        return self.names.index(name)
+
+    def build(self) -> CodeObject:
+        """
+        Freezes the builder into a code object.
+
+        Returns:
+            CodeObject: The built code object.
+        """
+        return CodeObject(
+            self.name,
+            self.params,
+            tuple(self.instructions),
+            tuple(self.consts),
+            tuple(self.names),
+            self.memo,
+            self.definition,
+            self.definition is not None and not escapes(self.definition),
+        )
+
+
+class BytecodeCompiler:
+    """
+    Compiles AST nodes into bytecode for the virtual machine.
+    """
+
+    def compile(self, node: Expr) -> CodeObject:
+        """
+        Compiles a program.
+
+        Args:
+            node (Expr): The root node of the program.
+
+        Returns:
+            CodeObject: The compiled program.
+        """
+        builder = CodeBuilder()
+        self.compile_node(node, builder)
+        builder.emit(OpCode.RETURN_VALUE)
+        return builder.build()
+
+    def compile_function(self, node: FuncDef) -> CodeObject:
+        """
+        Compiles the body of a function definition.
+
+        Calls in tail position of the body return a pending `TailCall`
+        instead of growing the Python stack.
+
+        Args:
+            node (FuncDef): The function definition node.
+
+        Returns:
+            CodeObject: The compiled function body.
+        """
+        builder = CodeBuilder(
+            node.name,
+            tuple(param for param, _type in node.params),
+            effects(node) if node.memoized else None,
+            node,
+        )
+        self.compile_tail(node.body, builder)
+        return builder.build()
+
+    def compile_node(self, node: Expr, builder: CodeBuilder):
+        """
+        Emits the instructions evaluating a node, leaving its value on the stack.
+
+        Args:
+            node (Expr): The AST node to compile.
+            builder (CodeBuilder): The code object being built.
+
+        Raises:
+            InterpreterError: If the node type is unknown.
+        """
+        method = getattr(self, "compile_" + node.__class__.__name__.lower(), None)
+
+        if method is None:
+            raise InterpreterError(f"Unknown node to compile: {node}", None)
+
+        method(node, builder)
+
+    def compile_tail(self, node: Expr, builder: CodeBuilder):
+        """
+        Emits the instructions returning the value of a node in tail position
+        of a function body.
+
+        Calls in tail position, that is the last statement of a block or a
+        branch of an if expression in tail position, are compiled to
+        `TAIL_CALL`.
+
+        Args:
+            node (Expr): The node in tail position.
+            builder (CodeBuilder): The code object being built.
+        """
+        if isinstance(node, Block) and node.statements:
+            *init, last = node.statements
+            for stmt in init:
+                self.compile_node(stmt, builder)
+                builder.emit(OpCode.POP_TOP)
+            self.compile_tail(last, builder)
+        elif isinstance(node, IfExpr):
+            self.compile_node(node.cond, builder)
+            jump_else = builder.emit(OpCode.JUMP_IF_FALSE)
+            self.compile_tail(node.then_branch, builder)
+            builder.patch(jump_else, builder.position)
+            if node.else_branch is None:
+                builder.emit(OpCode.LOAD_CONST, builder.const(None))
+                builder.emit(OpCode.RETURN_VALUE)
+            else:
+                self.compile_tail(node.else_branch, builder)
+        elif isinstance(node, FuncCall):
+            self.compile_node(node.callee, builder)
+            for arg in node.args:
+                self.compile_node(arg, builder)
+            builder.emit(OpCode.TAIL_CALL, len(node.args))
+        else:
+            self.compile_node(node, builder)
+            builder.emit(OpCode.RETURN_VALUE)
+
+    def compile_number(self, node: Number, builder: CodeBuilder):
+        """
+        Compiles a number node.
+
+        Args:
+            node (Number): The number node.
+            builder (CodeBuilder): The code object being built.
+        """
+        builder.emit(OpCode.LOAD_CONST, builder.const(node.value))
+
+    def compile_string(self, node: String, builder: CodeBuilder):
+        """
+        Compiles a string node.
+
+        Args:
+            node (String): The string node.
+            builder (CodeBuilder): The code object being built.
+        """
+        builder.emit(OpCode.LOAD_CONST, builder.const(node.value))
+
+    def compile_var(self, node: Var, builder: CodeBuilder):
+        """
+        Compiles a variable node.
+
+        Args:
+            node (Var): The variable node.
+            builder (CodeBuilder): The code object being built.
+        """
+        builder.emit(OpCode.LOAD_NAME, builder.name_index(node.name))
+
+    def compile_assign(self, node: Assign, builder: CodeBuilder):
+        """
+        Compiles an assignment node.
+
+        Args:
+            node (Assign): The assignment node.
+            builder (CodeBuilder): The code object being built.
+        """
+        self.compile_node(node.value, builder)
+        builder.emit(OpCode.DUP_TOP)
+        builder.emit(OpCode.STORE_NAME, builder.name_index(node.name))
+
+    def compile_funccall(self, node: FuncCall, builder: CodeBuilder):
+        """
+        Compiles a function call node.
+
+        Args:
+            node (FuncCall): The function call node.
+            builder (CodeBuilder): The code object being built.
+        """
+        self.compile_node(node.callee, builder)
+        for arg in node.args:
+            self.compile_node(arg, builder)
+        builder.emit(OpCode.CALL, len(node.args))
+
+    def compile_ifexpr(self, node: IfExpr, builder: CodeBuilder):
+        """
+        Compiles an if expression node.
+
+        Args:
+            node (IfExpr): The if expression node.
+            builder (CodeBuilder): The code object being built.
+        """
+        self.compile_node(node.cond, builder)
+        jump_else = builder.emit(OpCode.JUMP_IF_FALSE)
+        self.compile_node(node.then_branch, builder)
+        jump_end = builder.emit(OpCode.JUMP)
+        builder.patch(jump_else, builder.position)
+        if node.else_branch is None:
+            builder.emit(OpCode.LOAD_CONST, builder.const(None))
+        else:
+            self.compile_node(node.else_branch, builder)
+        builder.patch(jump_end, builder.position)
+
+    def compile_whileexpr(self, node: WhileExpr, builder: CodeBuilder):
+        """
+        Compiles a while expression node.
+
+        The result of the previous iteration stays on the stack under the
+        condition, and is replaced by each new iteration.
+
+        Args:
+            node (WhileExpr): The while expression node.
+            builder (CodeBuilder): The code object being built.
+        """
+        builder.emit(OpCode.LOAD_CONST, builder.const(None))
+        loop = builder.position
+        self.compile_node(node.cond, builder)
+        jump_end = builder.emit(OpCode.JUMP_IF_FALSE)
+        builder.emit(OpCode.POP_TOP)
+        self.compile_node(node.body, builder)
+        builder.emit(OpCode.JUMP, loop)
+        builder.patch(jump_end, builder.position)
+
+    def compile_forexpr(self, node: ForExpr, builder: CodeBuilder):
+        """
+        Compiles a for expression node.
+
+        The virtual machine has no generators, so lazy loops collect their
+        results like the others.
+
+        Args:
+            node (ForExpr): The for expression node.
+            builder (CodeBuilder): The code object being built.
+        """
+        if not node.discard:
+            builder.emit(OpCode.BUILD_LIST)
+        self.compile_node(node.iterable, builder)
+        builder.emit(OpCode.GET_ITER)
+        loop = builder.emit(OpCode.ITER_NEXT)
+        builder.emit(OpCode.STORE_NAME, builder.name_index(node.var))
+        self.compile_node(node.body, builder)
+        if node.discard:
+            builder.emit(OpCode.POP_TOP)
+        else:
+            builder.emit(OpCode.LIST_APPEND, 2)
+        builder.emit(OpCode.JUMP, loop)
+        builder.patch(loop, builder.position)
+        if node.discard:
+            builder.emit(OpCode.LOAD_CONST, builder.const(None))
+
+    def compile_funcdef(self, node: FuncDef, builder: CodeBuilder):
+        """
+        Compiles a function definition node.
+
+        Args:
+            node (FuncDef): The function definition node.
+            builder (CodeBuilder): The code object being built.
+        """
+        builder.emit(OpCode.LOAD_CONST, builder.const(self.compile_function(node)))
+        builder.emit(OpCode.MAKE_FUNCTION)
+        if node.name:
+            builder.emit(OpCode.BIND_FUNCTION, builder.name_index(node.name))
+
+    def compile_block(self, node: Block, builder: CodeBuilder):
+        """
+        Compiles a block node.
+
+        Args:
+            node (Block): The block node.
+            builder (CodeBuilder): The code object being built.
+        """
+        if not node.statements:
+            builder.emit(OpCode.LOAD_CONST, builder.const(None))
+            return
+
+        for i, stmt in enumerate(node.statements):
+            if i:
+                builder.emit(OpCode.POP_TOP)
+            self.compile_node(stmt, builder)
@@ -0,0 +1,56 @@
+"""
+This module provides a disassembler printing code objects in a readable form.
+"""
+
+from lunae.interpreter.bytecode.code import CodeObject
+from lunae.interpreter.bytecode.opcodes import JUMP_OPCODES, OpCode
+from lunae.utils.indent import indent
+
+
+def disassemble_instruction(code: CodeObject, index: int) -> str:
+    """
+    Formats a single instruction.
+
+    Args:
+        code (CodeObject): The code object holding the instruction.
+        index (int): The index of the instruction.
+
+    Returns:
+        str: The formatted instruction.
+    """
+    op, arg = code.instructions[index]
+    opcode = OpCode(op)
+
+    if opcode == OpCode.LOAD_CONST:
+        const = code.consts[arg]
+        detail = f" ({const})" if isinstance(const, CodeObject) else f" ({const!r})"
+    elif opcode in (OpCode.LOAD_NAME, OpCode.STORE_NAME, OpCode.BIND_FUNCTION):
+        detail = f" ({code.names[arg]})"
+    elif opcode in JUMP_OPCODES:
+        detail = f" (to {arg})"
+    else:
+        detail = ""
+
+    return f"{index:>4} {opcode.name:<15} {arg:>3}{detail}"
+
+
+def disassemble(code: CodeObject) -> str:
+    """
+    Formats a code object and the code objects of its nested functions.
+
+    Args:
+        code (CodeObject): The code object to disassemble.
+
+    Returns:
+        str: The disassembly listing.
+    """
+    lines = [f"{code} ({', '.join(code.params)}):"]
+    lines.extend(
+        disassemble_instruction(code, i) for i in range(len(code.instructions))
+    )
+
+    for const in code.consts:
+        if isinstance(const, CodeObject):
+            lines.append(indent(disassemble(const)))
+
+    return "\n".join(lines)
@@ -0,0 +1,56 @@
+"""
+This module defines the instruction set of the Lunae bytecode.
+"""
+
+from enum import IntEnum
+
+
+class OpCode(IntEnum):
+    """
+    Represents the operation of a bytecode instruction.
+
+    Every instruction is a pair `(opcode, argument)`. Instructions that do not
+    need an argument use 0.
+    """
+
+    LOAD_CONST = 0
+    """Push `consts[arg]`."""
+    LOAD_NAME = 1
+    """Push the value bound to `names[arg]`."""
+    STORE_NAME = 2
+    """Pop a value and assign it to `names[arg]`."""
+    POP_TOP = 3
+    """Discard the top of the stack."""
+    DUP_TOP = 4
+    """Push the top of the stack again."""
+    CALL = 5
+    """Pop `arg` arguments and a callee, push the result of the call."""
+    JUMP = 6
+    """Continue at instruction `arg`."""
+    JUMP_IF_FALSE = 7
+    """Pop a value, continue at instruction `arg` if it is falsy."""
+    GET_ITER = 8
+    """Pop a value, push an iterator over it."""
+    ITER_NEXT = 9
+    """Push the next item of the iterator on top, or pop it and jump to `arg`."""
+    BUILD_LIST = 10
+    """Push a new empty list."""
+    LIST_APPEND = 11
+    """Pop a value and append it to the list at `stack[-arg]`."""
+    MAKE_FUNCTION = 12
+    """Pop a code object, push a function closing over the current scope."""
+    BIND_FUNCTION = 13
+    """Bind the function on top of the stack to `names[arg]`."""
+    RETURN_VALUE = 14
+    """Pop a value and return it from the current code object."""
+    TAIL_CALL = 15
+    """Pop `arg` arguments and a callee, return the call as a pending `TailCall`."""
+
+    def __repr__(self):
+        return f"OpCode.{self.name}"
+
+
+JUMP_OPCODES = frozenset({OpCode.JUMP, OpCode.JUMP_IF_FALSE, OpCode.ITER_NEXT})
+"""
+frozenset[OpCode]: The opcodes whose argument is an instruction index.
+"""
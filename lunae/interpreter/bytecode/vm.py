@@ -0,0 +1,137 @@
+"""
+This module provides the virtual machine executing Lunae bytecode.
+"""
+
+from functools import partial
+from typing import Any, Callable
+
+from lunae.interpreter.bytecode.code import CodeObject
+from lunae.interpreter.bytecode.opcodes import OpCode
+from lunae.interpreter.environment import Environment
+from lunae.interpreter.function import LunaeFunction
+from lunae.interpreter.memo import memoize
+from lunae.interpreter.tailcall import tail_call
+from lunae.utils.errors import InterpreterError
+
+LOAD_CONST = int(OpCode.LOAD_CONST)
+LOAD_NAME = int(OpCode.LOAD_NAME)
+STORE_NAME = int(OpCode.STORE_NAME)
+POP_TOP = int(OpCode.POP_TOP)
+DUP_TOP = int(OpCode.DUP_TOP)
+CALL = int(OpCode.CALL)
+JUMP = int(OpCode.JUMP)
+JUMP_IF_FALSE = int(OpCode.JUMP_IF_FALSE)
+GET_ITER = int(OpCode.GET_ITER)
+ITER_NEXT = int(OpCode.ITER_NEXT)
+BUILD_LIST = int(OpCode.BUILD_LIST)
+LIST_APPEND = int(OpCode.LIST_APPEND)
+MAKE_FUNCTION = int(OpCode.MAKE_FUNCTION)
+BIND_FUNCTION = int(OpCode.BIND_FUNCTION)
+RETURN_VALUE = int(OpCode.RETURN_VALUE)
+TAIL_CALL = int(OpCode.TAIL_CALL)
+
+
+class VirtualMachine:
+    """
+    A stack-based virtual machine running code objects in a single dispatch loop.
+    """
+
+    def run(self, code: CodeObject, env: Environment) -> Any:
+        """
+        Runs a code object until it returns.
+
+        Args:
+            code (CodeObject): The code object to run.
+            env (Environment): The environment to run it in.
+
+        Returns:
+            Any: The returned value.
+
+        Raises:
+            InterpreterError: If an unknown opcode is encountered.
+        """
+        instructions = code.instructions
+        consts = code.consts
+        names = code.names
+        stack: list[Any] = []
+        push = stack.append
+        pop = stack.pop
+        pc = 0
+
+        while True:
+            op, arg = instructions[pc]
+            pc += 1
+
+            if op == LOAD_NAME:
+                push(env.get(names[arg]))
+            elif op == LOAD_CONST:
+                push(consts[arg])
+            elif op == CALL:
+                if arg:
+                    args = stack[-arg:]
+                    del stack[-arg:]
+                    push(pop()(*args))
+                else:
+                    push(pop()())
+            elif op == JUMP_IF_FALSE:
+                if not pop():
+                    pc = arg
+            elif op == JUMP:
+                pc = arg
+            elif op == STORE_NAME:
+                env.set(names[arg], pop())
+            elif op == DUP_TOP:
+                push(stack[-1])
+            elif op == POP_TOP:
+                pop()
+            elif op == ITER_NEXT:
+                try:
+                    push(next(stack[-1]))
+                except StopIteration:
+                    pop()
+                    pc = arg
+            elif op == LIST_APPEND:
+                value = pop()
+                stack[-arg].append(value)
+            elif op == GET_ITER:
+                push(iter(pop()))
+            elif op == BUILD_LIST:
+                push([])
+            elif op == MAKE_FUNCTION:
+                push(self.make_function(pop(), env))
+            elif op == BIND_FUNCTION:
+                env.define_function(names[arg], stack[-1])
+            elif op == RETURN_VALUE:
+                return pop()
+            elif op == TAIL_CALL:
+                if arg:
+                    tail_args = tuple(stack[-arg:])
+                    del stack[-arg:]
+                    return tail_call(pop(), tail_args)
+                return tail_call(pop(), ())
+            else:
+                raise InterpreterError(f"Unknown opcode: {op}", None)
+
+    def make_function(self, code: CodeObject, env: Environment) -> Callable:
+        """
+        Creates a function running a code object in its local scope, memoized
+        if the code object asks for it.
+
+        The code object may return a `TailCall`, which the function runs in
+        its trampoline.
+
+        Args:
+            code (CodeObject): The compiled function body.
+            env (Environment): The environment the function closes over.
+
+        Returns:
+            Callable: The function.
+        """
+        assert code.definition is not None, "Code object is not a function body"
+
+        function: Callable = LunaeFunction(
+            code.definition, env, partial(self.run, code), code.pooled, "bytecode"
+        )
+        if code.memo is not None:
+            return memoize(function, code.memo, env)
+        return function
@@ -0,0 +1,635 @@
+"""
+This module provides the closure compiler, an alternative execution engine.
+
+Instead of dispatching on the node class every time a node is evaluated, the
+closure compiler walks the AST once and turns every node into a Python closure
+with its children already bound. Running the compiled closure never looks up a
+handler by name again.
+
+Calls to builtin operators are inlined: the call site invokes the operator
+directly, guarded by an `Assumption` that the name was not rebound since.
+
+The slot compiler is a variant for resolved trees, whose closures run against
+array-backed frames instead of environments. Both compile the rest of the
+tree alike, through a `ScopeCompiler` generic over the type of scope.
+"""
+
+from itertools import repeat
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+from lunae.interpreter.environment import (
+    Assumption,
+    Environment,
+    LookupCache,
+)
+from lunae.interpreter.frame import UNBOUND, Frame
+from lunae.interpreter.function import LunaeFunction, arity_error
+from lunae.interpreter.memo import effects, memoize
+from lunae.interpreter.operators import OPERATORS
+from lunae.interpreter.pool import escapes
+from lunae.interpreter.tailcall import tail_call, trampoline
+from lunae.language.ast.base.block import Block
+from lunae.language.ast.base.expr import Expr
+from lunae.language.ast.controls.forexpr import ForExpr
+from lunae.language.ast.controls.ifexpr import IfExpr
+from lunae.language.ast.controls.whileexpr import WhileExpr
+from lunae.language.ast.functions.funccall import FuncCall
+from lunae.language.ast.functions.funcdef import FuncDef
+from lunae.language.ast.values.assign import Assign
+from lunae.language.ast.values.number import Number
+from lunae.language.ast.values.string import String
+from lunae.language.ast.values.var import Var
+from lunae.utils.errors import InterpreterError
+
+Scope = TypeVar("Scope", Environment, Frame)
+"""
+TypeVar: The type of scope compiled nodes run against, an environment or a frame.
+"""
+
+Compiled = Callable[[Scope], Any]
+"""
+Callable[[Scope], Any]: A compiled node, evaluated against a scope.
+"""
+
+
+class ScopeCompiler(Generic[Scope]):
+    """
+    Compiles AST nodes into pre-bound Python closures, run against scopes of some type.
+
+    Subclasses compile the reads and writes of variables, and the function
+    definitions, for their type of scope.
+    """
+
+    def __init__(self, global_env: Optional[Environment] = None):
+        """
+        Initializes the compiler.
+
+        Args:
+            global_env (Optional[Environment]): The global environment the code
+                will run in, used to inline builtin operators. Nothing is
+                inlined without it.
+        """
+        self.global_env = global_env
+
+    def compile(self, node: Expr) -> Compiled[Scope]:
+        """
+        Compiles a given AST node.
+
+        Args:
+            node (Expr): The AST node to compile.
+
+        Returns:
+            Compiled[Scope]: The closure evaluating the node.
+
+        Raises:
+            InterpreterError: If the node type is unknown.
+        """
+        method = getattr(self, "compile_" + node.__class__.__name__.lower(), None)
+
+        if method is None:
+            raise InterpreterError(f"Unknown node to compile: {node}", None)
+
+        return method(node)
+
+    def compile_tail(self, node: Expr) -> Compiled[Scope]:
+        """
+        Compiles a node in tail position of a function body.
+
+        Calls in tail position, that is the last statement of a block or a
+        branch of an if expression in tail position, return a pending
+        `TailCall` instead of growing the Python stack.
+
+        Args:
+            node (Expr): The node in tail position.
+
+        Returns:
+            Compiled[Scope]: The closure evaluating the node, which may return a `TailCall`.
+        """
+        if isinstance(node, Block) and len(node.statements) > 1:
+            *init, last = node.statements
+            statements = tuple(self.compile(stmt) for stmt in init)
+            tail = self.compile_tail(last)
+
+            def block(env: Scope):
+                for stmt in statements:
+                    stmt(env)
+                return tail(env)
+
+            return block
+
+        if isinstance(node, Block) and node.statements:
+            return self.compile_tail(node.statements[0])
+
+        if isinstance(node, IfExpr):
+            cond = self.compile(node.cond)
+            then_branch = self.compile_tail(node.then_branch)
+            if node.else_branch is None:
+                return lambda env: then_branch(env) if cond(env) else None
+            else_branch = self.compile_tail(node.else_branch)
+            return lambda env: then_branch(env) if cond(env) else else_branch(env)
+
+        if isinstance(node, FuncCall) and self.builtin(node.callee) is None:
+            callee = self.compile(node.callee)
+            args = [self.compile(a) for a in node.args]
+            return lambda env: tail_call(callee(env), tuple(a(env) for a in args))
+
+        return self.compile(node)
+
+    def compile_number(self, node: Number) -> Compiled[Scope]:
+        """
+        Compiles a number node.
+
+        Args:
+            node (Number): The number node.
+
+        Returns:
+            Compiled[Scope]: A closure returning the value of the number.
+        """
+        value = node.value
+        return lambda _env: value
+
+    def compile_string(self, node: String) -> Compiled[Scope]:
+        """
+        Compiles a string node.
+
+        Args:
+            node (String): The string node.
+
+        Returns:
+            Compiled[Scope]: A closure returning the value of the string.
+        """
+        value = node.value
+        return lambda _env: value
+
+    def compile_load(
+        self, name: str, address: Optional[tuple[int, int]]
+    ) -> Compiled[Scope]:
+        """
+        Compiles a read of a variable, as the scopes of the compiler store it.
+
+        Args:
+            name (str): The variable name.
+            address (Optional[tuple[int, int]]): The resolved address, if any.
+
+        Returns:
+            Compiled[Scope]: A closure returning the value of the variable.
+        """
+        raise NotImplementedError
+
+    def compile_store(
+        self, name: str, address: Optional[tuple[int, int]]
+    ) -> Callable[[Scope, Any], None]:
+        """
+        Compiles a write of a variable, as the scopes of the compiler store it.
+
+        Args:
+            name (str): The variable name.
+            address (Optional[tuple[int, int]]): The resolved address, if any.
+
+        Returns:
+            Callable[[Scope, Any], None]: A closure storing a value in the variable.
+        """
+        raise NotImplementedError
+
+    def compile_var(self, node: Var) -> Compiled[Scope]:
+        """
+        Compiles a variable node.
+
+        Args:
+            node (Var): The variable node.
+
+        Returns:
+            Compiled[Scope]: A closure returning the value of the variable.
+        """
+        return self.compile_load(node.name, node.address)
+
+    def compile_assign(self, node: Assign) -> Compiled[Scope]:
+        """
+        Compiles an assignment node.
+
+        Args:
+            node (Assign): The assignment node.
+
+        Returns:
+            Compiled[Scope]: A closure assigning and returning the value.
+        """
+        store = self.compile_store(node.name, node.address)
+        value = self.compile(node.value)
+
+        def assign(env: Scope):
+            val = value(env)
+            store(env, val)
+            return val
+
+        return assign
+
+    def compile_funccall(self, node: FuncCall) -> Compiled[Scope]:
+        """
+        Compiles a function call node.
+
+        Calls with up to two arguments are specialised so that no argument
+        list has to be built at runtime, and calls to builtin operators are
+        inlined.
+
+        Args:
+            node (FuncCall): The function call node.
+
+        Returns:
+            Compiled[Scope]: A closure returning the result of the function call.
+        """
+        callee = self.compile(node.callee)
+        args = [self.compile(a) for a in node.args]
+
+        builtin = self.builtin(node.callee)
+        if builtin is not None and len(args) in (1, 2):
+            return self.compile_inline(callee, args, *builtin)
+
+        if not args:
+            return lambda env: callee(env)()
+        if len(args) == 1:
+            (a,) = args
+            return lambda env: callee(env)(a(env))
+        if len(args) == 2:
+            a, b = args
+            return lambda env: callee(env)(a(env), b(env))
+        return lambda env: callee(env)(*[a(env) for a in args])
+
+    def builtin(
+        self, callee: Expr
+    ) -> Optional[tuple[Callable[..., Any], Optional[Assumption]]]:
+        """
+        Finds the builtin operator a callee refers to.
+
+        Args:
+            callee (Expr): The callee of a function call.
+
+        Returns:
+            Optional[tuple[Callable[..., Any], Optional[Assumption]]]: The operator
+            and the assumption guarding it, or None if the callee is not a builtin.
+        """
+        if (
+            self.global_env is None
+            or not isinstance(callee, Var)
+            or callee.name not in OPERATORS
+        ):
+            return None
+
+        try:
+            value = self.global_env.get(callee.name)
+        except NameError:
+            return None
+
+        if value is not OPERATORS[callee.name]:
+            return None
+        return value, self.global_env.assume(callee.name)
+
+    def compile_inline(
+        self,
+        callee: Compiled[Scope],
+        args: list[Compiled[Scope]],
+        operator: Callable[..., Any],
+        assumption: Optional[Assumption],
+    ) -> Compiled[Scope]:
+        """
+        Compiles a call to a builtin operator, with one or two arguments.
+
+        While the assumption holds, the operator is called directly. Once the
+        name is rebound, the call site falls back to the generic call.
+
+        Args:
+            callee (Compiled[Scope]): The compiled callee, for the generic call.
+            args (list[Compiled[Scope]]): The compiled arguments.
+            operator (Callable[..., Any]): The builtin operator.
+            assumption (Optional[Assumption]): The guard, or None if the binding cannot change.
+
+        Returns:
+            Compiled[Scope]: A closure returning the result of the call.
+        """
+        if len(args) == 1:
+            (a,) = args
+            if assumption is None:
+                return lambda env: operator(a(env))
+            return lambda env: (
+                operator(a(env)) if assumption.valid else callee(env)(a(env))
+            )
+
+        a, b = args
+        if assumption is None:
+            return lambda env: operator(a(env), b(env))
+        return lambda env: (
+            operator(a(env), b(env))
+            if assumption.valid
+            else callee(env)(a(env), b(env))
+        )
+
+    def compile_ifexpr(self, node: IfExpr) -> Compiled[Scope]:
+        """
+        Compiles an if expression node.
+
+        Args:
+            node (IfExpr): The if expression node.
+
+        Returns:
+            Compiled[Scope]: A closure returning the result of the taken branch.
+        """
+        cond = self.compile(node.cond)
+        then_branch = self.compile(node.then_branch)
+
+        if node.else_branch is None:
+            return lambda env: then_branch(env) if cond(env) else None
+
+        else_branch = self.compile(node.else_branch)
+        return lambda env: then_branch(env) if cond(env) else else_branch(env)
+
+    def compile_whileexpr(self, node: WhileExpr) -> Compiled[Scope]:
+        """
+        Compiles a while expression node.
+
+        Args:
+            node (WhileExpr): The while expression node.
+
+        Returns:
+            Compiled[Scope]: A closure returning the result of the last iteration.
+        """
+        cond = self.compile(node.cond)
+        body = self.compile(node.body)
+
+        def whileexpr(env: Scope):
+            result = None
+            while cond(env):
+                result = body(env)
+            return result
+
+        return whileexpr
+
+    def compile_forexpr(self, node: ForExpr) -> Compiled[Scope]:
+        """
+        Compiles a for expression node.
+
+        A discarded loop collects no results, and a lazy loop returns an
+        iterator evaluating the body as items are consumed.
+
+        Args:
+            node (ForExpr): The for expression node.
+
+        Returns:
+            Compiled[Scope]: A closure returning the results of every iteration.
+        """
+        store = self.compile_store(node.var, node.address)
+        iterable = self.compile(node.iterable)
+        body = self.compile(node.body)
+
+        if node.lazy:
+
+            def iterate(env: Scope, items: Any):
+                for item in items:
+                    store(env, item)
+                    yield body(env)
+
+            return lambda env: iterate(env, iterable(env))
+
+        if node.discard:
+
+            def discarded(env: Scope):
+                for item in iterable(env):
+                    store(env, item)
+                    body(env)
+
+            return discarded
+
+        def forexpr(env: Scope):
+            results = []
+            for item in iterable(env):
+                store(env, item)
+                results.append(body(env))
+            return results
+
+        return forexpr
+
+    def compile_block(self, node: Block) -> Compiled[Scope]:
+        """
+        Compiles a block node.
+
+        Args:
+            node (Block): The block node.
+
+        Returns:
+            Compiled[Scope]: A closure returning the result of the last statement.
+        """
+        statements = tuple(self.compile(stmt) for stmt in node.statements)
+
+        if not statements:
+            return lambda _env: None
+        if len(statements) == 1:
+            return statements[0]
+
+        def block(env: Scope):
+            res = None
+            for stmt in statements:
+                res = stmt(env)
+            return res
+
+        return block
+
+
+class ClosureCompiler(ScopeCompiler[Environment]):
+    """
+    Compiles AST nodes into pre-bound Python closures running against environments.
+    """
+
+    def compile_load(
+        self, name: str, _address: Optional[tuple[int, int]]
+    ) -> Compiled[Environment]:
+        """
+        Compiles a read of a variable.
+
+        Args:
+            name (str): The variable name.
+            _address (Optional[tuple[int, int]]): The resolved address, unused here.
+
+        Returns:
+            Compiled[Environment]: A closure returning the value of the variable.
+        """
+        cache = LookupCache()
+        return lambda env: env.get_cached(name, cache)
+
+    def compile_store(
+        self, name: str, _address: Optional[tuple[int, int]]
+    ) -> Callable[[Environment, Any], None]:
+        """
+        Compiles a write of a variable.
+
+        Args:
+            name (str): The variable name.
+            _address (Optional[tuple[int, int]]): The resolved address, unused here.
+
+        Returns:
+            Callable[[Environment, Any], None]: A closure storing a value in the variable.
+        """
+        cache = LookupCache()
+        return lambda env, value: env.set_cached(name, value, cache)
+
+    def compile_funcdef(self, node: FuncDef) -> Compiled[Environment]:
+        """
+        Compiles a function definition node.
+
+        The body is compiled once, and shared by every function created when
+        the definition is evaluated. Calls in tail position of the body do
+        not grow the Python stack, and calls whose local scope does not
+        escape reuse pooled scopes.
+
+        Args:
+            node (FuncDef): The function definition node.
+
+        Returns:
+            Compiled[Environment]: A closure creating (and binding, if named) the function.
+        """
+        name = node.name
+        body = self.compile_tail(node.body)
+        memo = effects(node) if node.memoized else None
+        pooled = not escapes(node)
+
+        def funcdef(env: Environment):
+            function: Callable[..., Any] = LunaeFunction(
+                node, env, body, pooled, "closure"
+            )
+            if memo is not None:
+                function = memoize(function, memo, env)
+            if name:
+                env.define_function(name, function)
+            return function
+
+        return funcdef
+
+
+class SlotCompiler(ScopeCompiler[Frame]):
+    """
+    Compiles resolved AST nodes into closures running against frames.
+
+    The tree must have been annotated by the `Resolver` first. Function locals
+    are read and written by index in their frame, globals by name in the
+    global environment.
+    """
+
+    def builtin(
+        self, callee: Expr
+    ) -> Optional[tuple[Callable[..., Any], Optional[Assumption]]]:
+        """
+        Finds the builtin operator a resolved callee refers to.
+
+        Locals can never shadow a resolved global, so an immutable global
+        binding needs no guard.
+
+        Args:
+            callee (Expr): The callee of a function call.
+
+        Returns:
+            Optional[tuple[Callable[..., Any], Optional[Assumption]]]: The operator
+            and the assumption guarding it, or None if the callee is not a builtin.
+        """
+        if isinstance(callee, Var) and callee.address is not None:
+            return None
+
+        builtin = super().builtin(callee)
+        if builtin is None:
+            return None
+
+        assert self.global_env is not None and isinstance(callee, Var)
+        if not self.global_env.declaration(callee.name).mutable:
+            return builtin[0], None
+        return builtin
+
+    def compile_load(
+        self, name: str, address: Optional[tuple[int, int]]
+    ) -> Compiled[Frame]:
+        """
+        Compiles a read of a resolved variable.
+
+        Args:
+            name (str): The variable name.
+            address (Optional[tuple[int, int]]): The resolved address.
+
+        Returns:
+            Compiled[Frame]: A closure returning the value of the variable.
+        """
+        if address is None:
+            return lambda frame: frame.globals.get(name)
+
+        depth, slot = address
+
+        def load(frame: Frame):
+            value = frame.lookup(depth).slots[slot] if depth else frame.slots[slot]
+            if value is UNBOUND:
+                raise NameError(f"Name '{name}' is not defined")
+            return value
+
+        return load
+
+    def compile_store(
+        self, name: str, address: Optional[tuple[int, int]]
+    ) -> Callable[[Frame, Any], None]:
+        """
+        Compiles a write of a resolved variable.
+
+        Args:
+            name (str): The variable name.
+            address (Optional[tuple[int, int]]): The resolved address.
+
+        Returns:
+            Callable[[Frame, Any], None]: A closure storing a value in the variable.
+        """
+        if address is None:
+            return lambda frame, value: frame.globals.set(name, value)
+
+        depth, slot = address
+
+        def store(frame: Frame, value: Any):
+            (frame.lookup(depth) if depth else frame).slots[slot] = value
+
+        return store
+
+    def compile_funcdef(self, node: FuncDef) -> Compiled[Frame]:
+        """
+        Compiles a resolved function definition node.
+
+        Arguments are bound positionally to the first slots of a new frame,
+        once their number is checked as a `LunaeFunction` does.
+
+        Args:
+            node (FuncDef): The function definition node.
+
+        Returns:
+            Compiled[Frame]: A closure creating (and binding, if named) the function.
+        """
+        assert node.layout is not None, "Function definition was not resolved"
+
+        name = node.name
+        function_name = name or "<lambda>"
+        arity = len(node.params)
+        size = len(node.layout)
+        body = self.compile_tail(node.body)
+        store = (
+            self.compile_store(name, node.address)
+            if name and node.address is not None
+            else None
+        )
+        memo = effects(node) if node.memoized else None
+
+        def funcdef(frame: Frame):
+            def entry(args: tuple):
+                if len(args) != arity:
+                    raise arity_error(function_name, arity, args)
+                slots = list(args)
+                slots.extend(repeat(UNBOUND, size - len(slots)))
+                return body(Frame(slots, frame, frame.globals))
+
+            function = trampoline(entry)
+            if memo is not None:
+                function = memoize(function, memo, frame.globals)
+            if store is not None:
+                store(frame, function)
+            elif name:
+                frame.globals.define_function(name, function)
+            return function
+
+        return funcdef
@@ -0,0 +1,795 @@
+"""
+This module provides the Python code generation backend.
+
+The generator turns an AST into a Python `ast.Module`, which is compiled with
+`compile()` and run natively: Lunae `if`, `while` and `for` become Python
+control flow, and calls become direct Python calls, except those in tail
+position of a function body, run by the trampoline of the function. Names are
+still read and written through the `Environment`.
+
+Calls to builtin operators become Python operators, guarded by an `Assumption`
+that the name was not rebound, taken when the program starts running: the
+generated code does not depend on the environment, so rebinding a builtin
+such as `add`, before or during a run, falls back to calling the new binding.
+
+Lunae control flow is made of expressions, while Python's is made of
+statements. Every node is therefore generated as a list of statements to run
+first, and a Python expression holding its value afterwards.
+"""
+
+import ast
+import sys
+from typing import Any, Callable, Optional
+
+from lunae.interpreter.environment import Assumption, Environment
+from lunae.interpreter.function import LunaeFunction
+from lunae.interpreter.memo import Effects, effects, memoize
+from lunae.interpreter.operators import OPERATORS
+from lunae.interpreter.pool import escapes
+from lunae.interpreter.tailcall import tail_call
+from lunae.language.ast.base.block import Block
+from lunae.language.ast.base.expr import Expr
+from lunae.language.ast.controls.forexpr import ForExpr
+from lunae.language.ast.controls.ifexpr import IfExpr
+from lunae.language.ast.controls.whileexpr import WhileExpr
+from lunae.language.ast.functions.funccall import FuncCall
+from lunae.language.ast.functions.funcdef import FuncDef
+from lunae.language.ast.values.assign import Assign
+from lunae.language.ast.values.number import Number
+from lunae.language.ast.values.string import String
+from lunae.language.ast.values.var import Var
+from lunae.utils.errors import InterpreterError
+
+Generated = tuple[list[ast.stmt], ast.expr]
+"""
+tuple[list[ast.stmt], ast.expr]: The statements to run, then the expression holding the value.
+"""
+
+ENTRY_POINT = "_lunae_main"
+"""
+str: The name of the generated function running the program.
+"""
+
+PYTHON_OPERATORS: dict[str, ast.AST] = {
+    "add": ast.Add(),
+    "sub": ast.Sub(),
+    "mul": ast.Mult(),
+    "div": ast.Div(),
+    "mod": ast.Mod(),
+    "is": ast.Eq(),
+    "less": ast.Lt(),
+    "more": ast.Gt(),
+    "neg": ast.USub(),
+    "not": ast.Not(),
+}
+"""
+dict[str, ast.AST]: The Python operator generated for each builtin operator.
+"""
+
+REBOUND = Assumption()
+REBOUND.valid = False
+"""
+Assumption: The guard of the builtin operators already rebound when a program starts.
+"""
+
+
+def guard(env: Environment, name: str) -> Assumption:
+    """
+    Gets the guard of the calls to a builtin operator in a generated program.
+
+    Args:
+        env (Environment): The environment the program runs in.
+        name (str): The name of the builtin operator.
+
+    Returns:
+        Assumption: The assumption that the name keeps its binding, or an
+        invalid one if the name is not bound to the builtin anymore.
+    """
+    try:
+        value = env.get(name)
+    except NameError:
+        return REBOUND
+
+    if value is not OPERATORS[name]:
+        return REBOUND
+    return env.assume(name)
+
+
+def arity(operator: str) -> int:
+    """
+    Gets the number of arguments a builtin operator takes.
+    """
+    return 1 if isinstance(PYTHON_OPERATORS[operator], ast.unaryop) else 2
+
+
+def operator_call(node: FuncCall) -> Optional[str]:
+    """
+    Finds the builtin operator a call may be generated as.
+
+    Args:
+        node (FuncCall): The function call node.
+
+    Returns:
+        Optional[str]: The name of the operator, or None if the callee is not
+        one or the call does not have the number of arguments it takes.
+    """
+    callee = node.callee
+    if not isinstance(callee, Var) or callee.name not in PYTHON_OPERATORS:
+        return None
+    return callee.name if arity(callee.name) == len(node.args) else None
+
+
+def python_operator(operator: str, args: list[ast.expr]) -> ast.expr:
+    """
+    Builds the Python operation of a call to a builtin operator.
+
+    Args:
+        operator (str): The name of the builtin operator.
+        args (list[ast.expr]): The arguments of the call, as many as the operator takes.
+
+    Returns:
+        ast.expr: The operation.
+    """
+    op = PYTHON_OPERATORS[operator]
+    if isinstance(op, ast.unaryop):
+        return ast.UnaryOp(op, args[0])
+    if isinstance(op, ast.cmpop):
+        return ast.Compare(args[0], [op], [args[1]])
+    assert isinstance(op, ast.operator)
+    return ast.BinOp(args[0], op, args[1])
+
+
+def cheap(expr: ast.expr) -> bool:
+    """
+    Checks whether an expression can be generated twice, for both sides of a guard.
+
+    Args:
+        expr (ast.expr): The expression.
+
+    Returns:
+        bool: True for constants, names and variable reads.
+    """
+    if isinstance(expr, (ast.Constant, ast.Name)):
+        return True
+    return (
+        isinstance(expr, ast.Call)
+        and isinstance(expr.func, ast.Name)
+        and all(isinstance(arg, ast.Constant) for arg in expr.args)
+    )
+
+
+class Scope:
+    """
+    The Python names through which generated code reaches a Lunae scope.
+
+    Attributes:
+        env (str): The variable holding the `Environment`.
+        get (str): The variable holding its bound `get` method.
+        set (str): The variable holding its bound `set` method.
+    """
+
+    def __init__(self, depth: int):
+        self.env = f"_env{depth}"
+        self.get = f"_get{depth}"
+        self.set = f"_set{depth}"
+        self.depth = depth
+
+    def prologue(self) -> list[ast.stmt]:
+        """
+        Generates the statements binding the scope accessors.
+
+        Returns:
+            list[ast.stmt]: The statements.
+        """
+        return [
+            assign(self.get, attribute(self.env, "get")),
+            assign(self.set, attribute(self.env, "set")),
+        ]
+
+
+def name(identifier: str) -> ast.Name:
+    """
+    Builds a Python name load.
+    """
+    return ast.Name(identifier, ast.Load())
+
+
+def attribute(identifier: str, attr: str) -> ast.Attribute:
+    """
+    Builds a Python attribute load on a name.
+    """
+    return ast.Attribute(name(identifier), attr, ast.Load())
+
+
+def call(func: ast.expr, *args: ast.expr) -> ast.Call:
+    """
+    Builds a Python call expression.
+    """
+    return ast.Call(func, list(args), [])
+
+
+def assign(target: str, value: ast.expr) -> ast.Assign:
+    """
+    Builds a Python assignment to a name.
+    """
+    return ast.Assign([ast.Name(target, ast.Store())], value)
+
+
+def function_def(
+    identifier: str, arguments: ast.arguments, body: list[ast.stmt]
+) -> ast.FunctionDef:
+    """
+    Builds a Python function definition, with no decorator.
+
+    Type parameters only exist in the tree of Python 3.12 and later.
+    """
+    if sys.version_info >= (3, 12):
+        return ast.FunctionDef(
+            name=identifier,
+            args=arguments,
+            body=body,
+            decorator_list=[],
+            type_params=[],
+        )
+    return ast.FunctionDef(
+        name=identifier, args=arguments, body=body, decorator_list=[]
+    )
+
+
+def guard_name(operator: str) -> str:
+    """
+    Gets the variable holding the guard of a builtin operator.
+    """
+    return f"_guard_{operator}"
+
+
+class PythonCodeGenerator:
+    """
+    Generates, compiles and runs Python code from Lunae AST nodes.
+    """
+
+    def __init__(self):
+        """
+        Initializes the generator.
+        """
+        self.counter = 0
+        self.guarded: set[str] = set()
+        self.definitions: list[FuncDef] = []
+        self.operations = True
+
+    def temp(self, hint: str = "t") -> str:
+        """
+        Creates a fresh Python identifier.
+
+        Args:
+            hint (str): A readable part of the identifier.
+
+        Returns:
+            str: The identifier.
+        """
+        self.counter += 1
+        return f"_{hint}{self.counter}"
+
+    def generate(self, node: Expr) -> ast.Module:
+        """
+        Generates a Python module defining the entry point function.
+
+        Args:
+            node (Expr): The root node of the program.
+
+        Returns:
+            ast.Module: The generated module.
+        """
+        scope = Scope(0)
+        self.guarded = set()
+        self.definitions = []
+        self.operations = True
+        stmts, expr = self.gen(node, scope)
+        guards = [
+            assign(
+                guard_name(operator),
+                call(name("guard"), name(scope.env), ast.Constant(operator)),
+            )
+            for operator in sorted(self.guarded)
+        ]
+        main = function_def(
+            ENTRY_POINT,
+            ast.arguments(
+                posonlyargs=[],
+                args=[ast.arg(scope.env)],
+                kwonlyargs=[],
+                kw_defaults=[],
+                defaults=[],
+            ),
+            [*scope.prologue(), *guards, *stmts, ast.Return(expr)],
+        )
+        return ast.fix_missing_locations(ast.Module([main], []))
+
+    def generate_body(self, node: FuncDef) -> ast.Module:
+        """
+        Generates a Python module defining the body of a function as entry point.
+
+        The body is not generated for a global environment, so calls to
+        builtin operators are not generated as operations.
+
+        Args:
+            node (FuncDef): The function definition.
+
+        Returns:
+            ast.Module: The generated module.
+        """
+        scope = Scope(1)
+        self.guarded = set()
+        self.definitions = []
+        self.operations = False
+        body = function_def(
+            ENTRY_POINT,
+            ast.arguments(
+                posonlyargs=[],
+                args=[ast.arg(scope.env)],
+                kwonlyargs=[],
+                kw_defaults=[],
+                defaults=[],
+            ),
+            [*scope.prologue(), *self.gen_tail(node.body, scope)],
+        )
+        return ast.fix_missing_locations(ast.Module([body], []))
+
+    def source(self, node: Expr) -> str:
+        """
+        Generates the Python source of a program.
+
+        Args:
+            node (Expr): The root node of the program.
+
+        Returns:
+            str: The Python source.
+        """
+        return ast.unparse(self.generate(node))
+
+    def compile(self, node: Expr) -> Callable[[Environment], Any]:
+        """
+        Compiles a program into a Python function.
+
+        Args:
+            node (Expr): The root node of the program.
+
+        Returns:
+            Callable[[Environment], Any]: The function running the program in an environment.
+        """
+        return self.load(self.generate(node))
+
+    def compile_body(self, node: FuncDef) -> Callable[[Environment], Any]:
+        """
+        Compiles the body of a function definition, for a `LunaeFunction`.
+
+        Args:
+            node (FuncDef): The function definition.
+
+        Returns:
+            Callable[[Environment], Any]: The body, run in the local scope of
+            a call, which may return a `TailCall`.
+        """
+        return self.load(self.generate_body(node))
+
+    def load(self, module: ast.Module) -> Callable[[Environment], Any]:
+        """
+        Compiles and runs a generated module.
+
+        Args:
+            module (ast.Module): The module, generated last.
+
+        Returns:
+            Callable[[Environment], Any]: The entry point it defines.
+        """
+        code = compile(module, "<lunae>", "exec")
+        namespace: dict[str, Any] = {
+            "LunaeFunction": LunaeFunction,
+            "Effects": Effects,
+            "memoize": memoize,
+            "guard": guard,
+            "tail_call": tail_call,
+            "definitions": tuple(self.definitions),
+        }
+        exec(code, namespace)  # pylint: disable=exec-used
+        return namespace[ENTRY_POINT]
+
+    def operator(self, node: FuncCall) -> Optional[str]:
+        """
+        Finds the builtin operator a call is generated as.
+
+        Args:
+            node (FuncCall): The function call node.
+
+        Returns:
+            Optional[str]: The name of the operator, or None for a Python call.
+        """
+        return operator_call(node) if self.operations else None
+
+    def gen(self, node: Expr, scope: Scope) -> Generated:
+        """
+        Generates the Python code of a node.
+
+        Args:
+            node (Expr): The AST node.
+            scope (Scope): The scope the node runs in.
+
+        Returns:
+            Generated: The statements to run, then the expression holding the value.
+
+        Raises:
+            InterpreterError: If the node type is unknown.
+        """
+        method = getattr(self, "gen_" + node.__class__.__name__.lower(), None)
+
+        if method is None:
+            raise InterpreterError(f"Unknown node to generate: {node}", None)
+
+        return method(node, scope)
+
+    def gen_sequence(
+        self, nodes: list[Expr], scope: Scope
+    ) -> tuple[list[ast.stmt], list[ast.expr]]:
+        """
+        Generates nodes evaluated left to right.
+
+        Values computed before a node needing statements are saved in
+        temporaries, so that those statements cannot reorder evaluation.
+
+        Args:
+            nodes (list[Expr]): The nodes.
+            scope (Scope): The scope the nodes run in.
+
+        Returns:
+            tuple[list[ast.stmt], list[ast.expr]]: The statements, then one expression per node.
+        """
+        parts = [self.gen(n, scope) for n in nodes]
+        last_with_stmts = max((i for i, (s, _) in enumerate(parts) if s), default=-1)
+
+        stmts: list[ast.stmt] = []
+        exprs: list[ast.expr] = []
+        for i, (s, e) in enumerate(parts):
+            stmts.extend(s)
+            if i < last_with_stmts and not isinstance(e, (ast.Constant, ast.Name)):
+                tmp = self.temp()
+                stmts.append(assign(tmp, e))
+                e = name(tmp)
+            exprs.append(e)
+        return stmts, exprs
+
+    def gen_tail(self, node: Expr, scope: Scope) -> list[ast.stmt]:
+        """
+        Generates the statements returning the value of a node in tail
+        position of a function body.
+
+        Calls in tail position, that is the last statement of a block or a
+        branch of an if expression in tail position, return a pending
+        `TailCall` instead of growing the Python stack. Calls to builtin
+        operators are generated as operations.
+
+        Args:
+            node (Expr): The node in tail position.
+            scope (Scope): The scope the node runs in.
+
+        Returns:
+            list[ast.stmt]: The statements.
+        """
+        if isinstance(node, Block) and node.statements:
+            *init, last = node.statements
+            stmts: list[ast.stmt] = []
+            for stmt in init:
+                stmt_stmts, expr = self.gen(stmt, scope)
+                stmts.extend(stmt_stmts)
+                if not isinstance(expr, (ast.Constant, ast.Name)):
+                    stmts.append(ast.Expr(expr))
+            return [*stmts, *self.gen_tail(last, scope)]
+
+        if isinstance(node, IfExpr):
+            stmts, cond = self.gen(node.cond, scope)
+            else_branch: list[ast.stmt] = (
+                [ast.Return(ast.Constant(None))]
+                if node.else_branch is None
+                else self.gen_tail(node.else_branch, scope)
+            )
+            stmts.append(
+                ast.If(cond, self.gen_tail(node.then_branch, scope), else_branch)
+            )
+            return stmts
+
+        if isinstance(node, FuncCall) and self.operator(node) is None:
+            stmts, (callee, *args) = self.gen_sequence([node.callee, *node.args], scope)
+            stmts.append(
+                ast.Return(call(name("tail_call"), callee, ast.Tuple(args, ast.Load())))
+            )
+            return stmts
+
+        stmts, expr = self.gen(node, scope)
+        return [*stmts, ast.Return(expr)]
+
+    def gen_number(self, node: Number, _scope: Scope) -> Generated:
+        """
+        Generates a number node.
+        """
+        return [], ast.Constant(node.value)
+
+    def gen_string(self, node: String, _scope: Scope) -> Generated:
+        """
+        Generates a string node.
+        """
+        return [], ast.Constant(node.value)
+
+    def gen_var(self, node: Var, scope: Scope) -> Generated:
+        """
+        Generates a variable node.
+        """
+        return [], call(name(scope.get), ast.Constant(node.name))
+
+    def gen_assign(self, node: Assign, scope: Scope) -> Generated:
+        """
+        Generates an assignment node.
+        """
+        stmts, expr = self.gen(node.value, scope)
+        tmp = self.temp()
+        stmts.append(assign(tmp, expr))
+        stmts.append(
+            ast.Expr(call(name(scope.set), ast.Constant(node.name), name(tmp)))
+        )
+        return stmts, name(tmp)
+
+    def gen_funccall(self, node: FuncCall, scope: Scope) -> Generated:
+        """
+        Generates a function call node.
+        """
+        operator = self.operator(node)
+        if operator is not None:
+            return self.gen_operator(operator, node.args, scope)
+
+        stmts, (callee, *args) = self.gen_sequence([node.callee, *node.args], scope)
+        return stmts, call(callee, *args)
+
+    def gen_operator(self, operator: str, nodes: list[Expr], scope: Scope) -> Generated:
+        """
+        Generates a call to a builtin operator as a guarded Python operation.
+
+        The arguments are generated on both sides of the guard when they are
+        cheap, and saved in temporaries otherwise, after the callee, which
+        is looked up first as in any call.
+
+        Args:
+            operator (str): The name of the builtin operator.
+            nodes (list[Expr]): The arguments.
+            scope (Scope): The scope the call runs in.
+
+        Returns:
+            Generated: The statements to run, then the expression holding the value.
+        """
+        stmts, args = self.gen_sequence(nodes, scope)
+        self.guarded.add(operator)
+        valid: ast.expr = attribute(guard_name(operator), "valid")
+        callee: ast.expr = call(name(scope.get), ast.Constant(operator))
+
+        if stmts or not all(cheap(arg) for arg in args):
+            tmp = self.temp("callee")
+            stmts.insert(0, assign(tmp, ast.IfExp(valid, ast.Constant(None), callee)))
+            for i, arg in enumerate(args):
+                if not cheap(arg):
+                    saved = self.temp()
+                    stmts.append(assign(saved, arg))
+                    args[i] = name(saved)
+            valid = ast.Compare(name(tmp), [ast.Is()], [ast.Constant(None)])
+            callee = name(tmp)
+
+        return stmts, ast.IfExp(
+            valid, python_operator(operator, args), call(callee, *args)
+        )
+
+    def gen_ifexpr(self, node: IfExpr, scope: Scope) -> Generated:
+        """
+        Generates an if expression node.
+
+        Branches without statements become a Python conditional expression.
+        """
+        stmts, cond = self.gen(node.cond, scope)
+        then_stmts, then_expr = self.gen(node.then_branch, scope)
+        else_stmts: list[ast.stmt]
+        else_expr: ast.expr
+        if node.else_branch is None:
+            else_stmts, else_expr = [], ast.Constant(None)
+        else:
+            else_stmts, else_expr = self.gen(node.else_branch, scope)
+
+        if not then_stmts and not else_stmts:
+            return stmts, ast.IfExp(cond, then_expr, else_expr)
+
+        tmp = self.temp()
+        stmts.append(
+            ast.If(
+                cond,
+                [*then_stmts, assign(tmp, then_expr)],
+                [*else_stmts, assign(tmp, else_expr)],
+            )
+        )
+        return stmts, name(tmp)
+
+    def gen_whileexpr(self, node: WhileExpr, scope: Scope) -> Generated:
+        """
+        Generates a while expression node.
+        """
+        cond_stmts, cond = self.gen(node.cond, scope)
+        body_stmts, body = self.gen(node.body, scope)
+        tmp = self.temp()
+        loop_body = [*body_stmts, assign(tmp, body)]
+
+        if cond_stmts:
+            loop = ast.While(
+                ast.Constant(True),
+                [
+                    *cond_stmts,
+                    ast.If(ast.UnaryOp(ast.Not(), cond), [ast.Break()], []),
+                    *loop_body,
+                ],
+                [],
+            )
+        else:
+            loop = ast.While(cond, loop_body, [])
+
+        return [assign(tmp, ast.Constant(None)), loop], name(tmp)
+
+    def gen_forexpr(self, node: ForExpr, scope: Scope) -> Generated:
+        """
+        Generates a for expression node.
+
+        Discarded loops collect nothing, and lazy loops become a Python
+        generator yielding the result of each iteration.
+        """
+        stmts, iterable = self.gen(node.iterable, scope)
+        body_stmts, body = self.gen(node.body, scope)
+        item = self.temp("item")
+        store = ast.Expr(call(name(scope.set), ast.Constant(node.var), name(item)))
+
+        if node.discard:
+            if not isinstance(body, (ast.Constant, ast.Name)):
+                body_stmts.append(ast.Expr(body))
+            loop = ast.For(
+                ast.Name(item, ast.Store()), iterable, [store, *body_stmts], []
+            )
+            return [*stmts, loop], ast.Constant(None)
+
+        if node.lazy:
+            items = self.temp("items")
+            generator = self.temp("iterate")
+            stmts.append(assign(items, iterable))
+            stmts.append(
+                function_def(
+                    generator,
+                    ast.arguments(
+                        posonlyargs=[],
+                        args=[],
+                        kwonlyargs=[],
+                        kw_defaults=[],
+                        defaults=[],
+                    ),
+                    [
+                        ast.For(
+                            ast.Name(item, ast.Store()),
+                            name(items),
+                            [store, *body_stmts, ast.Expr(ast.Yield(body))],
+                            [],
+                        )
+                    ],
+                )
+            )
+            return stmts, call(name(generator))
+
+        results = self.temp("results")
+        stmts.append(assign(results, ast.List([], ast.Load())))
+        stmts.append(
+            ast.For(
+                ast.Name(item, ast.Store()),
+                iterable,
+                [
+                    store,
+                    *body_stmts,
+                    ast.Expr(call(attribute(results, "append"), body)),
+                ],
+                [],
+            )
+        )
+        return stmts, name(results)
+
+    def gen_funcdef(self, node: FuncDef, scope: Scope) -> Generated:
+        """
+        Generates a function definition node as a nested Python function.
+
+        The nested function is the body of a `LunaeFunction`, run in the
+        local scope of a call, whose trampoline runs the tail calls of the
+        body in a loop. Memoized functions are wrapped before being bound.
+        """
+        inner = Scope(scope.depth + 1)
+        body_stmts = self.gen_tail(node.body, inner)
+        function = self.temp(f"{node.name}_" if node.name else "lambda")
+        self.definitions.append(node)
+
+        definition = function_def(
+            function,
+            ast.arguments(
+                posonlyargs=[],
+                args=[ast.arg(inner.env)],
+                kwonlyargs=[],
+                kw_defaults=[],
+                defaults=[],
+            ),
+            [*inner.prologue(), *body_stmts],
+        )
+
+        stmts: list[ast.stmt] = [
+            definition,
+            assign(
+                function,
+                call(
+                    name("LunaeFunction"),
+                    ast.Subscript(
+                        name("definitions"),
+                        ast.Constant(len(self.definitions) - 1),
+                        ast.Load(),
+                    ),
+                    name(scope.env),
+                    name(function),
+                    ast.Constant(not escapes(node)),
+                    ast.Constant("python"),
+                ),
+            ),
+        ]
+        if node.memoized:
+            stmts.append(
+                assign(
+                    function,
+                    call(
+                        name("memoize"),
+                        name(function),
+                        self.gen_effects(effects(node)),
+                        name(scope.env),
+                    ),
+                )
+            )
+        if node.name:
+            stmts.append(
+                ast.Expr(
+                    call(
+                        attribute(scope.env, "define_function"),
+                        ast.Constant(node.name),
+                        name(function),
+                    )
+                )
+            )
+        return stmts, name(function)
+
+    def gen_effects(self, effects_: Effects) -> ast.expr:
+        """
+        Generates the expression rebuilding the effects of a memoized function.
+        """
+        return call(
+            name("Effects"),
+            ast.Constant(effects_.name),
+            *(
+                call(
+                    name("frozenset"),
+                    ast.Tuple([ast.Constant(n) for n in sorted(names)], ast.Load()),
+                )
+                for names in (effects_.reads, effects_.calls, effects_.writes)
+            ),
+            ast.Constant(effects_.impurity),
+        )
+
+    def gen_block(self, node: Block, scope: Scope) -> Generated:
+        """
+        Generates a block node.
+        """
+        stmts: list[ast.stmt] = []
+        expr: ast.expr = ast.Constant(None)
+        for i, stmt in enumerate(node.statements):
+            if i and not isinstance(expr, (ast.Constant, ast.Name)):
+                stmts.append(ast.Expr(expr))
+            stmt_stmts, expr = self.gen(stmt, scope)
+            stmts.extend(stmt_stmts)
+        return stmts, expr
@@ -5,49 +5,307 @@ This module defines the Environment class used for managing variable scopes and
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
-from lunae.language.typesystem import Type
+from lunae.language.typesystem import ANY, FUNCTION, Type
 from lunae.utils.errors import InterpreterError
 
 
 @dataclass(frozen=True)
-class Cell:
-    value: Any
+class Declaration:
+    """
+    The declared type and mutability of a name, only checked on writes.
+    """
+
     type: Type
+    mutable: bool = True
 
 
-@dataclass
-class Binding:
-    cell: Cell
-    mutable: bool = True
+DEFAULT_DECLARATION = Declaration(ANY)
+"""
+Declaration: The declaration of the names with none recorded, mutable of any type.
+"""
+
+
+class Assumption:
+    """
+    A fact compiled code relies on: a name keeps resolving to the same binding.
+
+    Any `define` or `set` of the name, in any scope of the environment tree,
+    invalidates it.
+    """
+
+    __slots__ = ("valid",)
+
+    def __init__(self):
+        self.valid = True
+
+
+class LookupCache:
+    """
+    The inline cache of a lookup site: the scope a name last resolved to.
+
+    Names are only removed from a scope when a call releases it to a pool,
+    which changes its version, so the scope stays the right one while the
+    scope the lookup started from and the scopes walked past without finding
+    the name keep their versions.
+    """
+
+    __slots__ = ("env", "version", "scope", "guards")
+
+    def __init__(self):
+        self.env: Optional[Environment] = None
+        self.version = 0
+        self.scope: Optional[Environment] = None
+        self.guards: tuple[tuple[Environment, int], ...] = ()
+
+    def valid(self) -> bool:
+        """Check that the scopes walked past still have the same version."""
+        for env, version in self.guards:
+            if env.version != version:
+                return False
+        return True
 
 
 class Environment:
+    """
+    A scope, holding the values of its names in a plain dictionary.
+
+    The declarations of the names which are immutable or typed are kept in a
+    side table, created for the first of them, and only checked on writes,
+    so reading a name is a single dictionary load and writing one allocates
+    nothing.
+    """
+
     def __init__(self, parent: Optional["Environment"] = None):
         self.parent = parent
-        self.bindings: Dict[str, Binding] = {}
+        self.values: Dict[str, Any] = {}
+        self.declarations: Optional[Dict[str, Declaration]] = None
+        self.version = 0
+        self.frozen = False
+        self.assumptions: Dict[str, Assumption] = parent.assumptions if parent else {}
+        self.closures: tuple[str, ...] = ()
+
+    def snapshot(self) -> "Environment":
+        """
+        Copy this scope into a frozen environment, which forks share.
+
+        A scope forked from a snapshot is copied with its snapshot, as one
+        scope. The Lunae functions bound in the scope which close over it are
+        rebound to the snapshot, their bodies compiled again for no
+        environment in particular, and their names kept in `closures`. The
+        functions of the "slots" engine run against frames and cannot be
+        rebound: they keep running in the scope they were defined in.
+        """
+        # pylint: disable=import-outside-toplevel,cyclic-import
+        from lunae.interpreter.function import rebind
+
+        parent = self.parent
+        scopes = [self]
+        snapshot = Environment()
+        declarations: Dict[str, Declaration] = {}
+        if parent is not None and parent.frozen:
+            snapshot.values.update(parent.values)
+            declarations.update(parent.declarations or {})
+            scopes.append(parent)
+            parent = parent.parent
+        snapshot.values.update(self.values)
+        declarations.update(self.declarations or {})
+        snapshot.declarations = declarations or None
+        snapshot.parent = parent
+        snapshot.assumptions = parent.assumptions if parent else {}
+        snapshot.frozen = True
+
+        closures = []
+        for name, value in snapshot.values.items():
+            function = rebind(value, scopes, snapshot, False)
+            if function is not value:
+                snapshot.values[name] = function
+                closures.append(name)
+        snapshot.closures = tuple(closures)
+        return snapshot
 
-    def define(self, name: str, binding: Binding) -> None:
+    def fork(self) -> "Environment":
+        """
+        Create a scope over a snapshot of this one, in constant time once it
+        is frozen, but for the functions of the snapshot.
+
+        The fork reads the names of the snapshot as its own, and copies a
+        value on its first write, so its writes stay private to it. The
+        functions closing over the snapshot are rebound to the fork, sharing
+        their compiled bodies, so that the names they read and write are
+        those of the fork.
+        """
+        # pylint: disable=import-outside-toplevel,cyclic-import
+        from lunae.interpreter.function import rebind
+
+        snapshot = self if self.frozen else self.snapshot()
+        fork = Environment(snapshot)
+        fork.assumptions = {}
+        closures = snapshot.closures
+        if closures:
+            scopes, values = (snapshot,), snapshot.values
+            for name in closures:
+                fork.values[name] = rebind(values[name], scopes, fork, True)
+            declarations = snapshot.declarations or {}
+            fork.declarations = {
+                name: declarations[name] for name in closures if name in declarations
+            } or None
+        return fork
+
+    def owns(self, name: str) -> bool:
+        """Check if a name is bound in this scope, including the snapshot it was forked from."""
+        if name in self.values:
+            return True
+        parent = self.parent
+        return parent is not None and parent.frozen and name in parent.values
+
+    def assume(self, name: str) -> Assumption:
+        """Get the assumption that a name keeps its binding, shared by the whole tree."""
+        assumption = self.assumptions.get(name)
+        if assumption is None:
+            assumption = self.assumptions[name] = Assumption()
+        return assumption
+
+    def invalidate(self, name: str) -> None:
+        """Invalidate the assumption on a name, if any."""
+        assumption = self.assumptions.pop(name, None)
+        if assumption is not None:
+            assumption.valid = False
+
+    def define(
+        self, name: str, value: Any, value_type: Type = ANY, mutable: bool = True
+    ) -> None:
         """Introduce a new name in this scope."""
-        if name in self.bindings:
+        if self.frozen:
+            raise TypeError(f"Cannot define '{name}' in a snapshot")
+        if name in self.assumptions:
+            self.invalidate(name)
+        if self.owns(name):
             raise NameError(f"Name '{name}' already defined in this scope")
-        self.bindings[name] = binding
+        self.values[name] = value
+        if value_type is not ANY or not mutable:
+            self.declare(name, Declaration(value_type, mutable))
+        self.version += 1
 
-    def resolve(self, name: str) -> Binding:
-        """Retrieve a binding from it's name, walking up scopes."""
+    def declare(self, name: str, declaration: Declaration) -> None:
+        """Record the declaration of a name of this scope in the side table."""
+        if self.declarations is None:
+            self.declarations = {}
+        self.declarations[name] = declaration
+
+    def define_function(self, name: str, function: Any) -> None:
+        """
+        Bind a named function in this scope, replacing the binding of the name here, if any.
+
+        A function definition is a new declaration, so it replaces immutable
+        bindings, such as a previous definition of the function, and shadows
+        the snapshot this scope was forked from.
+        """
+        if self.frozen:
+            raise TypeError(f"Cannot define '{name}' in a snapshot")
+        if name in self.assumptions:
+            self.invalidate(name)
+        self.values[name] = function
+        self.declare(name, Declaration(FUNCTION, False))
+        self.version += 1
+
+    def scope(self, name: str) -> "Environment":
+        """Find the scope binding a name, walking up scopes."""
         env: Optional[Environment] = self
         while env:
-            if name in env.bindings:
-                return env.bindings[name]
+            if name in env.values:
+                return env
             env = env.parent
         raise NameError(f"Name '{name}' is not defined")
 
-    def set(self, name: str, cell: Cell) -> None:
-        """Assign to an existing binding, walking up scopes."""
-        binding = self.resolve(name)
-        if not binding.mutable:
-            raise TypeError(f"Cannot assign to immutable '{name}'")
-        binding.cell = cell
+    def declaration(self, name: str) -> Declaration:
+        """Retrieve the declaration of a name, walking up scopes."""
+        declarations = self.scope(name).declarations
+        if declarations is None:
+            return DEFAULT_DECLARATION
+        return declarations.get(name, DEFAULT_DECLARATION)
+
+    def lookup(self, name: str, cache: LookupCache) -> Optional["Environment"]:
+        """Find the scope binding a name through the cache of a lookup site, filling it on a miss."""
+        if (
+            cache.env is self
+            and cache.version == self.version
+            and (not cache.guards or cache.valid())
+        ):
+            return cache.scope
+        guards: list[tuple[Environment, int]] = []
+        env: Optional[Environment] = self
+        while env:
+            if name in env.values:
+                cache.env, cache.version = self, self.version
+                cache.scope, cache.guards = env, tuple(guards)
+                return env
+            guards.append((env, env.version))
+            env = env.parent
+        return None
+
+    def get_cached(self, name: str, cache: LookupCache) -> Any:
+        """Retrieve a value through the cache of a lookup site."""
+        if (
+            cache.env is self
+            and cache.version == self.version
+            and (not cache.guards or cache.valid())
+        ):
+            return cache.scope.values[name]  # type: ignore[union-attr]
+        scope = self.lookup(name, cache)
+        if scope is None:
+            raise NameError(f"Name '{name}' is not defined")
+        return scope.values[name]
 
-    def get(self, name: str) -> Cell:
-        """Retrieve a binding’s cell, walking up scopes."""
-        return self.resolve(name).cell
+    def set_cached(self, name: str, value: Any, cache: LookupCache) -> None:
+        """Assign through the cache of a lookup site, like `set`."""
+        if name in self.assumptions:
+            self.invalidate(name)
+        scope = self.lookup(name, cache)
+        if scope is None or scope.frozen:
+            self.set(name, value)
+            return
+        declarations = scope.declarations
+        if declarations is not None and name in declarations:
+            if not declarations[name].mutable:
+                raise TypeError(f"Cannot assign to immutable '{name}'")
+        scope.values[name] = value
+
+    def set(self, name: str, value: Any) -> None:
+        """Assign to an existing binding, walking up scopes, or define it here."""
+        if name in self.assumptions:
+            self.invalidate(name)
+        child: Optional[Environment] = None
+        env: Optional[Environment] = self
+        while env:
+            if name in env.values:
+                declarations = env.declarations
+                declaration = DEFAULT_DECLARATION
+                if declarations is not None:
+                    declaration = declarations.get(name, DEFAULT_DECLARATION)
+                if not declaration.mutable:
+                    raise TypeError(f"Cannot assign to immutable '{name}'")
+                if not env.frozen:
+                    env.values[name] = value
+                elif child is not None:  # Copy on write, in the fork
+                    child.values[name] = value
+                    if declaration is not DEFAULT_DECLARATION:
+                        child.declare(name, declaration)
+                    child.version += 1
+                else:
+                    raise TypeError(f"Cannot assign to '{name}' in a snapshot")
+                return
+            child, env = env, env.parent
+        if self.frozen:
+            raise TypeError(f"Cannot define '{name}' in a snapshot")
+        self.values[name] = value
+        self.version += 1
+
+    def get(self, name: str) -> Any:
+        """Retrieve a value, walking up scopes."""
+        env: Optional[Environment] = self
+        while env:
+            values = env.values
+            if name in values:
+                return values[name]
+            env = env.parent
+        raise NameError(f"Name '{name}' is not defined")
@@ -0,0 +1,62 @@
+"""
+This module defines the Frame class, an array-backed scope for resolved code.
+"""
+
+from typing import Any, Optional
+
+from lunae.interpreter.environment import Environment
+
+
+class Unbound:
+    """
+    The marker held by a slot that has not been assigned yet.
+    """
+
+    def __repr__(self):
+        return "UNBOUND"
+
+
+UNBOUND = Unbound()
+"""
+Unbound: The value of an unassigned slot.
+"""
+
+
+class Frame:
+    """
+    Represents the local scope of a function call, with variables stored in slots.
+
+    The resolver gives every local variable a (depth, slot) address: `depth`
+    is the number of `parent` links to follow, `slot` the index in `slots`.
+    Globals are not stored in frames, but in the dict-backed `globals`.
+
+    Attributes:
+        slots (list[Any]): The values of the local variables.
+        parent (Optional[Frame]): The frame of the enclosing function.
+        globals (Environment): The global environment.
+    """
+
+    __slots__ = ("slots", "parent", "globals")
+
+    def __init__(
+        self, slots: list[Any], parent: Optional["Frame"], global_env: Environment
+    ):
+        self.slots = slots
+        self.parent = parent
+        self.globals = global_env
+
+    def lookup(self, depth: int) -> "Frame":
+        """
+        Gets the frame `depth` levels up.
+
+        Args:
+            depth (int): The number of parent links to follow.
+
+        Returns:
+            Frame: The frame.
+        """
+        frame = self
+        for _ in range(depth):
+            assert frame.parent, "Resolved depth exceeds the frame chain"
+            frame = frame.parent
+        return frame
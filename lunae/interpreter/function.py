@@ -0,0 +1,328 @@
+"""
+This module provides `LunaeFunction`, the callable type of functions defined in Lunae.
+
+A function holds its definition, the environment it closes over and its
+body, compiled by the engine which defined it. Its entry, run by calls and by
+the trampolines of tail calls, checks the number of arguments before binding
+them to the parameters in the local scope, with a specialised path for each
+arity up to three.
+
+A function pickles as its definition, environment and engine. Its body is
+compiled again, by the same engine, when it is unpickled, and memoized
+functions cannot be pickled.
+
+A function can be rebound to another environment, which is how the functions
+of an environment snapshot close over the forks of the snapshot.
+"""
+
+from inspect import Parameter, Signature
+from typing import Any, Callable, Collection
+
+from lunae.interpreter.environment import Environment
+from lunae.interpreter.memo import effects, memoize
+from lunae.interpreter.pool import MAX_POOLED_FRAMES, FramePool, escapes
+from lunae.interpreter.tailcall import Entry, TailCall
+from lunae.language.ast.functions.funcdef import FuncDef
+
+Body = Callable[[Environment], Any]
+"""
+Callable[[Environment], Any]: A compiled function body, run in the local scope of a call.
+"""
+
+
+def arity_error(name: str, arity: int, args: tuple) -> TypeError:
+    """
+    Creates the error of a call with the wrong number of arguments.
+
+    Args:
+        name (str): The name of the called function.
+        arity (int): The number of parameters.
+        args (tuple): The arguments of the call.
+
+    Returns:
+        TypeError: The error to raise.
+    """
+    arguments = "argument" if arity == 1 else "arguments"
+    return TypeError(f"{name}() takes {arity} {arguments} but {len(args)} were given")
+
+
+def compile_body(definition: FuncDef, engine: str) -> Body:
+    """
+    Compiles the body of a function definition with an engine, for no environment in particular.
+
+    Args:
+        definition (FuncDef): The function definition.
+        engine (str): The engine, one of `ENGINES`.
+
+    Returns:
+        Body: The compiled body.
+    """
+    # pylint: disable=import-outside-toplevel,cyclic-import
+    from lunae.interpreter import Interpreter
+
+    return Interpreter(engine=engine).compile_body(definition)
+
+
+def rebind(
+    value: Any, scopes: Collection[Environment], env: Environment, shared: bool
+) -> Any:
+    """
+    Rebinds a value to an environment if it is a function closing over some scopes.
+
+    Args:
+        value (Any): The value, a `LunaeFunction`, memoized or not, to rebind.
+        scopes (Collection[Environment]): The scopes whose functions are rebound.
+        env (Environment): The environment the rebound function closes over.
+        shared (bool): Whether the rebound function shares the compiled body,
+            as in `LunaeFunction.rebind`.
+
+    Returns:
+        Any: The rebound function, or the value itself if it is not rebound.
+    """
+    function = getattr(value, "__wrapped__", value)
+    # pylint: disable-next=unidiomatic-typecheck
+    if type(function) is not LunaeFunction or function.env not in scopes:
+        return value
+
+    rebound = function.rebind(env, shared)
+    if function is not value:
+        return memoize(rebound, effects(function.definition), env)
+    return rebound
+
+
+class LunaeFunction:
+    """
+    A function defined in Lunae, called like a Python function.
+
+    Attributes:
+        definition (FuncDef): The function definition.
+        env (Environment): The environment the function closes over.
+        body (Body): The compiled body, which may return a `TailCall`.
+        engine (str): The engine which compiled the body.
+        params (tuple[str, ...]): The parameter names.
+        types (tuple[str, ...]): The declared parameter types.
+        pool (FramePool): The local scopes of the calls.
+        tail_entry (Entry): Runs the body on arguments, for the trampolines.
+    """
+
+    __slots__ = (
+        "__name__",
+        "__qualname__",
+        "definition",
+        "env",
+        "body",
+        "engine",
+        "params",
+        "types",
+        "pool",
+        "tail_entry",
+    )
+
+    def __init__(
+        self,
+        definition: FuncDef,
+        env: Environment,
+        body: Body,
+        pooled: bool,
+        engine: str,
+    ):
+        """
+        Initializes a function.
+
+        Args:
+            definition (FuncDef): The function definition.
+            env (Environment): The environment the function closes over.
+            body (Body): The compiled body.
+            pooled (bool): Whether the calls reuse the local scopes of previous
+                calls, which is only sound if the local scope does not escape.
+            engine (str): The engine which compiled the body, one of `ENGINES`.
+        """
+        self.__name__ = definition.name or "<lambda>"
+        self.__qualname__ = self.__name__
+        self.definition = definition
+        self.env = env
+        self.body = body
+        self.engine = engine
+        self.params = tuple([param for param, _type in definition.params])
+        self.types = tuple([param_type for _param, param_type in definition.params])
+        self.pool = FramePool(env, self.params, MAX_POOLED_FRAMES if pooled else 0)
+        self.tail_entry = make_entry(self)
+
+    @property
+    def arity(self) -> int:
+        """
+        Gets the number of parameters.
+
+        Returns:
+            int: The number of arguments a call takes.
+        """
+        return len(self.params)
+
+    @property
+    def __signature__(self) -> Signature:
+        """
+        Gets the signature of the function, for `inspect`.
+
+        Returns:
+            Signature: The parameters, all positional only.
+        """
+        return Signature(
+            [Parameter(param, Parameter.POSITIONAL_ONLY) for param in self.params]
+        )
+
+    def arity_error(self, args: tuple) -> TypeError:
+        """
+        Creates the error of a call with the wrong number of arguments.
+
+        Args:
+            args (tuple): The arguments of the call.
+
+        Returns:
+            TypeError: The error to raise.
+        """
+        return arity_error(self.__name__, self.arity, args)
+
+    def bind(self, args: tuple) -> Environment:
+        """
+        Binds the arguments of a call whose body the caller runs itself.
+
+        The local scope is taken from the pool, and the caller gives it back
+        with `pool.release` once the body has run.
+
+        Args:
+            args (tuple): The arguments of the call.
+
+        Returns:
+            Environment: The local scope, with the parameters bound.
+
+        Raises:
+            TypeError: If the number of arguments is not the number of parameters.
+        """
+        if len(args) != len(self.params):
+            raise self.arity_error(args)
+        local = self.pool.acquire()
+        local.values.update(zip(self.params, args))
+        return local
+
+    def rebind(self, env: Environment, shared: bool) -> "LunaeFunction":
+        """
+        Creates the same function, closing over another environment.
+
+        Args:
+            env (Environment): The environment the new function closes over.
+            shared (bool): Whether the new function shares the compiled body,
+                which is only sound if the body was compiled for no
+                environment in particular, as by `compile_body`. The body is
+                compiled again otherwise.
+
+        Returns:
+            LunaeFunction: The new function.
+        """
+        definition = self.definition
+        body = self.body if shared else compile_body(definition, self.engine)
+        return LunaeFunction(definition, env, body, self.pool.size > 0, self.engine)
+
+    def __call__(self, *args):
+        result = self.tail_entry(args)
+        while type(result) is TailCall:  # pylint: disable=unidiomatic-typecheck
+            result = result.entry(result.args)
+        return result
+
+    def __repr__(self) -> str:
+        return f"<function {self.__qualname__}({', '.join(self.params)})>"
+
+    def __getstate__(self) -> tuple[FuncDef, Environment, str]:
+        return self.definition, self.env, self.engine
+
+    def __setstate__(self, state: tuple[FuncDef, Environment, str]):
+        definition, env, engine = state
+        # The environment may not be restored yet, so it is not compiled for
+        body = compile_body(definition, engine)
+        LunaeFunction.__init__(
+            self, definition, env, body, not escapes(definition), engine
+        )
+
+
+def make_entry(function: LunaeFunction) -> Entry:
+    """
+    Creates the entry of a function, specialised on its number of parameters.
+
+    Args:
+        function (LunaeFunction): The function.
+
+    Returns:
+        Entry: Checks the number of arguments, binds them in a local scope
+        and runs the body there.
+    """
+    body = function.body
+    params = function.params
+    acquire = function.pool.acquire
+    release = function.pool.release
+    arity_error = function.arity_error
+
+    if not params:
+
+        def entry(args: tuple):
+            if args:
+                raise arity_error(args)
+            local = acquire()
+            try:
+                return body(local)
+            finally:
+                release(local)
+
+    elif len(params) == 1:
+        (first,) = params
+
+        def entry(args: tuple):
+            if len(args) != 1:
+                raise arity_error(args)
+            local = acquire()
+            local.values[first] = args[0]
+            try:
+                return body(local)
+            finally:
+                release(local)
+
+    elif len(params) == 2:
+        first, second = params
+
+        def entry(args: tuple):
+            if len(args) != 2:
+                raise arity_error(args)
+            local = acquire()
+            values = local.values
+            values[first], values[second] = args
+            try:
+                return body(local)
+            finally:
+                release(local)
+
+    elif len(params) == 3:
+        first, second, third = params
+
+        def entry(args: tuple):
+            if len(args) != 3:
+                raise arity_error(args)
+            local = acquire()
+            values = local.values
+            values[first], values[second], values[third] = args
+            try:
+                return body(local)
+            finally:
+                release(local)
+
+    else:
+        arity = len(params)
+
+        def entry(args: tuple):
+            if len(args) != arity:
+                raise arity_error(args)
+            local = acquire()
+            local.values.update(zip(params, args))
+            try:
+                return body(local)
+            finally:
+                release(local)
+
+    return entry
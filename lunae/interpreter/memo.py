@@ -0,0 +1,386 @@
+"""
+This module provides memoization of pure Lunae functions.
+
+A function defined with `memo func` keeps the results of its calls in a
+bounded cache, keyed on its arguments. Caching is only correct for pure
+functions, so the body is checked first: it must not assign to names outside
+the function, and may only call builtin operators and other functions marked
+pure.
+
+The names the body reads are guarded by `Assumption`s: rebinding any of them
+clears the cache, and the function is checked again on its next call.
+"""
+
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import update_wrapper
+from typing import Any, Callable, Optional
+
+from lunae.interpreter.environment import Assumption, Environment
+from lunae.interpreter.operators import OPERATORS
+from lunae.interpreter.resolver import assigned_names
+from lunae.language.ast.functions.funccall import FuncCall
+from lunae.language.ast.functions.funcdef import FuncDef
+from lunae.language.ast.values.assign import Assign
+from lunae.language.ast.values.var import Var
+from lunae.utils.errors import InterpreterError
+
+DEFAULT_MAXSIZE = 1024
+"""
+int: The default number of results kept by a memoized function.
+"""
+
+MISSING = object()
+"""
+object: Marks a cache miss.
+"""
+
+
+def pure(function: Callable) -> Callable:
+    """
+    Marks a host function as pure, so memoized Lunae functions may call it.
+
+    Args:
+        function (Callable): A function whose result only depends on its arguments.
+
+    Returns:
+        Callable: The same function.
+    """
+    function.pure = True  # type: ignore[attr-defined]
+    return function
+
+
+def is_pure(value: Any) -> bool:
+    """
+    Checks whether a called value is known to be pure.
+
+    Args:
+        value (Any): The called value.
+
+    Returns:
+        bool: True for builtin operators and functions marked pure.
+    """
+    return getattr(value, "pure", False) or any(
+        value is operator for operator in OPERATORS.values()
+    )
+
+
+@dataclass(frozen=True)
+class Effects:
+    """
+    Summarizes what the body of a function depends on and changes.
+
+    Attributes:
+        name (Optional[str]): The function name.
+        reads (frozenset[str]): The free names read as values.
+        calls (frozenset[str]): The free names called.
+        writes (frozenset[str]): The names assigned, other than parameters.
+        impurity (Optional[str]): Why the function is impure in any environment, if it is.
+    """
+
+    name: Optional[str]
+    reads: frozenset[str]
+    calls: frozenset[str]
+    writes: frozenset[str]
+    impurity: Optional[str] = None
+
+
+def effects(node: FuncDef) -> Effects:
+    """
+    Analyzes the body of a function definition.
+
+    Args:
+        node (FuncDef): The function definition.
+
+    Returns:
+        Effects: The effects of the body.
+    """
+    params = {param for param, _type in node.params}
+    assigned, _functions = assigned_names(node.body)
+    writes = frozenset(assigned - params)
+    local = params | writes
+
+    reads: set[str] = set()
+    calls: set[str] = set()
+    reason: Optional[str] = None
+    stack = [node.body]
+    while stack and reason is None:
+        current = stack.pop()
+        if isinstance(current, FuncDef):
+            reason = "defines a nested function"
+        elif isinstance(current, (Var, Assign)) and current.address:
+            if current.address[0] > 0:
+                reason = f"uses {current.name!r} from an enclosing function"
+        if isinstance(current, FuncCall):
+            if not isinstance(current.callee, Var):
+                reason = "calls a computed function"
+            elif current.callee.name in local:
+                reason = f"calls its local {current.callee.name!r}"
+            else:
+                calls.add(current.callee.name)
+            stack.extend(current.args)
+            continue
+        if isinstance(current, Var) and current.name not in local:
+            reads.add(current.name)
+        stack.extend(current.children())
+
+    return Effects(node.name, frozenset(reads), frozenset(calls), writes, reason)
+
+
+def impurity(effects_: Effects, env: Environment) -> Optional[str]:
+    """
+    Checks the effects of a function in the environment it closes over.
+
+    Args:
+        effects_ (Effects): The effects of the function body.
+        env (Environment): The environment the function closes over.
+
+    Returns:
+        Optional[str]: Why the function is impure, or None if it is pure.
+    """
+    if effects_.impurity is not None:
+        return effects_.impurity
+
+    for name in sorted(effects_.calls):
+        try:
+            callee = env.get(name)
+        except NameError:
+            return f"calls undefined function {name!r}"
+        if not is_pure(callee):
+            return f"calls impure function {name!r}"
+
+    return assigns_outer(effects_, env)
+
+
+def assigns_outer(effects_: Effects, env: Environment) -> Optional[str]:
+    """
+    Checks whether assignments of a function would reach an enclosing scope.
+
+    Args:
+        effects_ (Effects): The effects of the function body.
+        env (Environment): The environment the function closes over.
+
+    Returns:
+        Optional[str]: Why the function is impure, or None if all assignments are local.
+    """
+    for name in sorted(effects_.writes):
+        try:
+            env.scope(name)
+        except NameError:
+            continue
+        return f"assigns to outer variable {name!r}"
+    return None
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    """
+    A snapshot of the statistics of a memoization cache.
+
+    Attributes:
+        hits (int): The calls answered from the cache.
+        misses (int): The calls which ran the function.
+        evictions (int): The results dropped to respect the limits.
+        size (int): The number of cached results.
+        memory (int): The estimated size of the cached keys and results, in bytes.
+        maxsize (Optional[int]): The maximum number of results, or None.
+        max_memory (Optional[int]): The maximum estimated size in bytes, or None.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    memory: int
+    maxsize: Optional[int]
+    max_memory: Optional[int]
+
+
+class MemoCache:
+    """
+    A least recently used cache of function results.
+
+    Attributes:
+        maxsize (Optional[int]): The maximum number of results, or None for no limit.
+        max_memory (Optional[int]): The maximum estimated size in bytes, or None for no limit.
+        hits (int): The calls answered from the cache.
+        misses (int): The calls which ran the function.
+        evictions (int): The results dropped to respect the limits.
+        memory (int): The estimated size of the cached keys and results, in bytes.
+    """
+
+    def __init__(
+        self, maxsize: Optional[int] = DEFAULT_MAXSIZE, max_memory: Optional[int] = None
+    ):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (Optional[int]): The maximum number of results, or None for no limit.
+            max_memory (Optional[int]): The maximum estimated size in bytes, or None for no limit.
+        """
+        self.maxsize = maxsize
+        self.max_memory = max_memory
+        self.entries: OrderedDict[tuple, tuple[Any, int]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.memory = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(self, key: tuple) -> Any:
+        """
+        Gets a cached result, marking it as the most recently used.
+
+        Args:
+            key (tuple): The arguments of the call.
+
+        Returns:
+            Any: The result, or `MISSING`.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def store(self, key: tuple, value: Any, size: Optional[int] = None):
+        """
+        Caches a result, evicting the least recently used ones beyond the limits.
+
+        Args:
+            key (tuple): The arguments of the call.
+            value (Any): The result.
+            size (Optional[int]): The estimated size of the entry in bytes, by
+                default the shallow size of the key and the result.
+        """
+        if size is None:
+            size = sys.getsizeof(key) + sys.getsizeof(value)
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.memory -= previous[1]
+        self.entries[key] = (value, size)
+        self.memory += size
+        self.evict()
+
+    def evict(self):
+        """
+        Drops the least recently used results until the limits are respected.
+        """
+        while self.entries and (
+            (self.maxsize is not None and len(self.entries) > self.maxsize)
+            or (self.max_memory is not None and self.memory > self.max_memory)
+        ):
+            _key, (_value, size) = self.entries.popitem(last=False)
+            self.memory -= size
+            self.evictions += 1
+
+    def resize(self, maxsize: Optional[int], max_memory: Optional[int] = None):
+        """
+        Changes the limits of the cache.
+
+        Args:
+            maxsize (Optional[int]): The maximum number of results, or None for no limit.
+            max_memory (Optional[int]): The maximum estimated size in bytes, or None for no limit.
+        """
+        self.maxsize = maxsize
+        self.max_memory = max_memory
+        self.evict()
+
+    def clear(self):
+        """
+        Drops every cached result, keeping the statistics.
+        """
+        self.entries.clear()
+        self.memory = 0
+
+    def info(self) -> CacheInfo:
+        """
+        Gets the statistics of the cache.
+
+        Returns:
+            CacheInfo: The statistics.
+        """
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.evictions,
+            len(self.entries),
+            self.memory,
+            self.maxsize,
+            self.max_memory,
+        )
+
+
+def memoize(
+    function: Callable,
+    effects_: Effects,
+    env: Environment,
+    maxsize: Optional[int] = DEFAULT_MAXSIZE,
+    max_memory: Optional[int] = None,
+) -> Callable:
+    """
+    Wraps a Lunae function so that its results are cached.
+
+    The function is checked on its first call rather than here, so that it
+    may call pure functions defined after it. Calls with unhashable arguments
+    are not cached.
+
+    Args:
+        function (Callable): The function.
+        effects_ (Effects): The effects of its body.
+        env (Environment): The environment it closes over.
+        maxsize (Optional[int]): The maximum number of results, or None for no limit.
+        max_memory (Optional[int]): The maximum estimated size in bytes, or None for no limit.
+
+    Returns:
+        Callable: The memoized function, with the name of the function, exposing
+        its `MemoCache` as `cache`.
+
+    Raises:
+        InterpreterError: When called, if the function is not pure.
+    """
+    cache = MemoCache(maxsize, max_memory)
+    guards: list[Assumption] = []
+    verified = False
+
+    def verify():
+        nonlocal verified
+        reason = impurity(effects_, env)
+        if reason is not None:
+            raise InterpreterError(
+                f"Memoized function {effects_.name!r} is not pure: it {reason}", None
+            )
+        cache.clear()
+        guards[:] = [env.assume(name) for name in effects_.reads | effects_.calls]
+        verified = True
+
+    def memoized(*args):
+        if not verified or not all(guard.valid for guard in guards):
+            verify()
+
+        try:
+            result = cache.lookup(args)
+        except TypeError:
+            return function(*args)
+        if result is not MISSING:
+            return result
+
+        reason = assigns_outer(effects_, env)
+        if reason is not None:
+            raise InterpreterError(
+                f"Memoized function {effects_.name!r} is not pure: it {reason}", None
+            )
+        result = function(*args)
+        cache.store(args, result)
+        return result
+
+    update_wrapper(memoized, function, updated=())
+    memoized.cache = cache  # type: ignore[attr-defined]
+    memoized.pure = True  # type: ignore[attr-defined]
+    return memoized
@@ -0,0 +1,26 @@
+"""
+This module defines the builtin operators bound in the global environment.
+
+The parser turns operators into calls to these names (`1 + 2` calls `add`).
+They are the C implementations from the `operator` module, so that compiled
+call sites can invoke them without any Python frame.
+"""
+
+import operator
+from typing import Any, Callable
+
+OPERATORS: dict[str, Callable[..., Any]] = {
+    "add": operator.add,
+    "sub": operator.sub,
+    "mul": operator.mul,
+    "div": operator.truediv,
+    "mod": operator.mod,
+    "is": operator.eq,
+    "less": operator.lt,
+    "more": operator.gt,
+    "neg": operator.neg,
+    "not": operator.not_,
+}
+"""
+dict[str, Callable[..., Any]]: The builtin operators, by function name.
+"""
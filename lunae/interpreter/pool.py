@@ -0,0 +1,133 @@
+"""
+This module provides pooled local scopes for the calls of Lunae functions.
+
+A call runs the body of a function in a new local scope. When nothing in the
+body can keep a reference to that scope once the call returns, the scope is
+said not to escape, and its calls reuse the scopes of previous calls instead
+of allocating one each.
+
+The scope of a call escapes through a nested function definition, which
+closes over it, or through a lazy for expression, whose iterator keeps
+evaluating the body in it after the call has returned.
+"""
+
+from typing import Any, Callable
+
+from lunae.interpreter.environment import Environment
+from lunae.language.ast.base.expr import Expr
+from lunae.language.ast.controls.forexpr import ForExpr
+from lunae.language.ast.functions.funcdef import FuncDef
+
+MAX_POOLED_FRAMES = 16
+"""
+int: The number of free scopes a pool keeps, for recursive calls.
+"""
+
+
+def escapes(node: FuncDef) -> bool:
+    """
+    Checks whether the local scope of a call of a function may outlive it.
+
+    Args:
+        node (FuncDef): The function definition.
+
+    Returns:
+        bool: True if the body defines a nested function or has a lazy for
+        expression, False if its scope can be reused once a call returns.
+    """
+    stack: list[Expr] = [node.body]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, FuncDef):
+            return True
+        if isinstance(current, ForExpr) and current.lazy:
+            return True
+        stack.extend(current.children())
+    return False
+
+
+class FramePool:
+    """
+    The free local scopes of a function whose scope does not escape.
+
+    A scope is taken for a call with the arguments bound to the parameters
+    positionally, and given back, emptied, when the call returns. Its version
+    increases on each call, so the lookup caches of the previous call are not
+    reused. A pool of size 0 allocates a scope per call and never reuses it,
+    for functions whose scope escapes.
+
+    Attributes:
+        parent (Environment): The scope the function closes over.
+        params (tuple[str, ...]): The parameter names.
+        size (int): The number of free scopes kept.
+        free (list[Environment]): The scopes not used by a running call.
+    """
+
+    __slots__ = ("parent", "params", "size", "free")
+
+    def __init__(
+        self,
+        parent: Environment,
+        params: tuple[str, ...],
+        size: int = MAX_POOLED_FRAMES,
+    ):
+        """
+        Initializes an empty pool.
+
+        Args:
+            parent (Environment): The scope the function closes over.
+            params (tuple[str, ...]): The parameter names.
+            size (int): The number of free scopes kept, 0 to never reuse a scope.
+        """
+        self.parent = parent
+        self.params = params
+        self.size = size
+        self.free: list[Environment] = []
+
+    def acquire(self) -> Environment:
+        """
+        Takes an empty local scope for a call, whose parameters the caller binds.
+
+        Returns:
+            Environment: The local scope.
+        """
+        free = self.free
+        local = free.pop() if free else Environment(self.parent)
+        local.version += 1
+        assumptions = local.assumptions
+        if assumptions:
+            for name in self.params:
+                if name in assumptions:
+                    local.invalidate(name)
+        return local
+
+    def release(self, local: Environment) -> None:
+        """
+        Gives back the local scope of a returned call, emptied, if the pool has room.
+
+        Args:
+            local (Environment): The local scope.
+        """
+        free = self.free
+        if len(free) < self.size:
+            local.values.clear()
+            local.declarations = None
+            free.append(local)
+
+    def call(self, body: Callable[[Environment], Any], args: tuple) -> Any:
+        """
+        Runs the body of a call in a pooled local scope.
+
+        Args:
+            body (Callable[[Environment], Any]): The body, run in the local scope.
+            args (tuple): The arguments of the call.
+
+        Returns:
+            Any: The result of the body.
+        """
+        local = self.acquire()
+        local.values.update(zip(self.params, args))
+        try:
+            return body(local)
+        finally:
+            self.release(local)
@@ -0,0 +1,50 @@
+"""
+This module defines the Program class, a parsed source which can be run many times.
+"""
+
+import sys
+from dataclasses import dataclass, field
+from typing import Any
+
+from lunae.language.ast.base.expr import Expr
+
+
+def tree_size(root: Expr) -> int:
+    """
+    Estimates the memory used by an AST.
+
+    Args:
+        root (Expr): The root of the AST.
+
+    Returns:
+        int: The size of the nodes, which hold their attributes in slots, in bytes.
+    """
+    size = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        size += sys.getsizeof(node)
+        stack.extend(node.children())
+    return size
+
+
+@dataclass(frozen=True)
+class Program:
+    """
+    Represents a source parsed once, to be run by an `Interpreter` in any environment.
+
+    Attributes:
+        source (str): The source code.
+        ast (Expr): The parsed, and possibly optimized, tree.
+        optimized (bool): Whether the tree was optimized.
+        nbytes (int): The estimated size of the source and the tree, in bytes.
+        compiled (dict[str, Any]): The code compiled from the tree, by engine.
+            The code of the engines which depend on the environment is kept
+            with the environment it was compiled for.
+    """
+
+    source: str
+    ast: Expr
+    optimized: bool = False
+    nbytes: int = field(default=0, compare=False)
+    compiled: dict[str, Any] = field(default_factory=dict, compare=False, repr=False)
@@ -0,0 +1,156 @@
+"""
+This module provides the resolver, a static scope resolution pass.
+
+The resolver gives every variable access an address: a (depth, slot) pair for
+function locals, or None for globals, which stay name-based so hosts can keep
+injecting bindings into the global environment.
+
+Assignments follow the runtime rules of `Environment.set`: a name assigned in
+a function is local unless an enclosing function or the global scope already
+has it. A name is considered global when it is bound in the global
+environment at resolution time, or assigned at the top level of the program.
+"""
+
+from typing import Optional
+
+from lunae.interpreter.environment import Environment
+from lunae.language.ast.base.expr import Expr
+from lunae.language.ast.controls.forexpr import ForExpr
+from lunae.language.ast.functions.funcdef import FuncDef
+from lunae.language.ast.values.assign import Assign
+from lunae.language.ast.values.var import Var
+
+
+def assigned_names(node: Expr) -> tuple[set[str], set[str]]:
+    """
+    Collects the names bound by a scope, without entering nested functions.
+
+    Args:
+        node (Expr): The body of the scope.
+
+    Returns:
+        tuple[set[str], set[str]]: The assigned names, and the named function definitions.
+    """
+    assigned: set[str] = set()
+    functions: set[str] = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, Assign):
+            assigned.add(current.name)
+        elif isinstance(current, ForExpr):
+            assigned.add(current.var)
+        elif isinstance(current, FuncDef):
+            if current.name:
+                functions.add(current.name)
+            continue
+        stack.extend(current.children())
+    return assigned, functions
+
+
+class Resolver:
+    """
+    Annotates `Var`, `Assign`, `ForExpr` and `FuncDef` nodes with their addresses.
+
+    Attributes:
+        globals (set[str]): The global names of the program being resolved.
+        scopes (list[list[str]]): The layouts of the enclosing functions.
+        unbound (set[str]): The names assigned by functions which were laid out
+            as locals because no global binds them, so that the resolution is
+            stale once a global binds one.
+    """
+
+    def __init__(self):
+        """
+        Initializes the resolver.
+        """
+        self.globals: set[str] = set()
+        self.scopes: list[list[str]] = []
+        self.unbound: set[str] = set()
+
+    def resolve(self, node: Expr, global_env: Environment) -> Expr:
+        """
+        Resolves a program.
+
+        Args:
+            node (Expr): The root node of the program.
+            global_env (Environment): The global environment it will run in.
+
+        Returns:
+            Expr: The annotated node.
+        """
+        env: Optional[Environment] = global_env
+        self.globals = set()
+        while env:
+            self.globals.update(env.values)
+            env = env.parent
+        assigned, functions = assigned_names(node)
+        self.globals |= assigned | functions
+        self.scopes = []
+        self.unbound = set()
+
+        self.visit(node)
+        return node
+
+    def address(self, name: str) -> Optional[tuple[int, int]]:
+        """
+        Finds the address of a name from the innermost scope.
+
+        Args:
+            name (str): The name.
+
+        Returns:
+            Optional[tuple[int, int]]: The (depth, slot) address, or None for a global.
+        """
+        for depth, scope in enumerate(reversed(self.scopes)):
+            if name in scope:
+                return depth, scope.index(name)
+        return None
+
+    def visit(self, node: Expr):
+        """
+        Resolves a node and its sub-expressions.
+
+        Args:
+            node (Expr): The node.
+        """
+        if isinstance(node, Var):
+            node.address = self.address(node.name)
+        elif isinstance(node, Assign):
+            node.address = self.address(node.name)
+        elif isinstance(node, ForExpr):
+            node.address = self.address(node.var)
+        elif isinstance(node, FuncDef):
+            node.address = self.address(node.name) if node.name else None
+            self.visit_function(node)
+            return
+
+        for child in node.children():
+            self.visit(child)
+
+    def visit_function(self, node: FuncDef):
+        """
+        Lays out the local slots of a function and resolves its body.
+
+        Args:
+            node (FuncDef): The function definition.
+        """
+        layout = [param for param, _type in node.params]
+        assigned, functions = assigned_names(node.body)
+
+        for name in sorted(functions):
+            if name not in layout:
+                layout.append(name)
+        for name in sorted(assigned):
+            if (
+                name not in layout
+                and self.address(name) is None
+                and name not in self.globals
+            ):
+                layout.append(name)
+                self.unbound.add(name)
+
+        node.layout = tuple(layout)
+        self.scopes.append(layout)
+        self.visit(node.body)
+        self.scopes.pop()
@@ -0,0 +1,279 @@
+"""
+This module provides the stack machine, a non-recursive evaluator.
+
+The tree walker recurses in Python for every child node and every Lunae call,
+so deep programs are limited by `sys.getrecursionlimit()`. The stack machine
+keeps the work left to do on an explicit stack of continuations, and
+intermediate results on a value stack, both on the heap. Calls between Lunae
+functions it created push their body on those stacks too, so recursion depth
+is only limited by memory.
+"""
+
+from functools import partial
+from typing import Any, Callable
+
+from lunae.interpreter.environment import Environment, LookupCache
+from lunae.interpreter.function import LunaeFunction
+from lunae.interpreter.memo import effects, memoize
+from lunae.interpreter.pool import FramePool, escapes
+from lunae.language.ast.base.block import Block
+from lunae.language.ast.base.expr import Expr
+from lunae.language.ast.controls.forexpr import ForExpr
+from lunae.language.ast.controls.ifexpr import IfExpr
+from lunae.language.ast.controls.whileexpr import WhileExpr
+from lunae.language.ast.functions.funccall import FuncCall
+from lunae.language.ast.functions.funcdef import FuncDef
+from lunae.language.ast.values.assign import Assign
+from lunae.language.ast.values.number import Number
+from lunae.language.ast.values.string import String
+from lunae.language.ast.values.var import Var
+from lunae.utils.errors import InterpreterError
+
+Task = tuple[Callable[[Any, Any], None], Any, Any]
+"""
+tuple[Callable, Any, Any]: A continuation, called with its two arguments.
+"""
+
+
+class StackMachine:
+    """
+    Evaluates AST nodes with explicit continuation and value stacks.
+
+    Attributes:
+        tasks (list[Task]): The continuations left to run, last first.
+        values (list[Any]): The intermediate results.
+    """
+
+    def __init__(self):
+        """
+        Initializes the stack machine.
+        """
+        self.tasks: list[Task] = []
+        self.values: list[Any] = []
+        self.handlers: dict[type, Callable[[Any, Environment], None]] = {
+            Number: self.eval_literal,
+            String: self.eval_literal,
+            Var: self.eval_var,
+            Assign: self.eval_assign,
+            FuncCall: self.eval_funccall,
+            IfExpr: self.eval_ifexpr,
+            WhileExpr: self.eval_whileexpr,
+            ForExpr: self.eval_forexpr,
+            FuncDef: self.eval_funcdef,
+            Block: self.eval_block,
+        }
+
+    def run(self, node: Expr, env: Environment) -> Any:
+        """
+        Evaluates a node until no work is left.
+
+        Args:
+            node (Expr): The node to evaluate.
+            env (Environment): The environment to use for evaluation.
+
+        Returns:
+            Any: The result of the evaluation.
+        """
+        saved = self.tasks, self.values
+        self.tasks, self.values = [(self.eval, node, env)], []
+        try:
+            tasks = self.tasks
+            while tasks:
+                handler, a, b = tasks.pop()
+                handler(a, b)
+            return self.values.pop()
+        finally:
+            self.tasks, self.values = saved
+
+    def eval(self, node: Expr, env: Environment):
+        """
+        Schedules the evaluation of a node.
+
+        Args:
+            node (Expr): The node to evaluate.
+            env (Environment): The current environment.
+
+        Raises:
+            InterpreterError: If the node type is unknown.
+        """
+        handler = self.handlers.get(type(node))
+
+        if handler is None:
+            raise InterpreterError(f"Unknown node to eval: {node}", None)
+
+        handler(node, env)
+
+    def discard(self, _node: None, _env: None):
+        """
+        Drops the last result.
+        """
+        self.values.pop()
+
+    def eval_literal(self, node: Number | String, _env: Environment):
+        """
+        Evaluates a number or string node.
+        """
+        self.values.append(node.value)
+
+    def eval_var(self, node: Var, env: Environment):
+        """
+        Evaluates a variable node.
+        """
+        cache = node.cache
+        if cache is None:
+            cache = node.cache = LookupCache()
+        self.values.append(env.get_cached(node.name, cache))
+
+    def eval_assign(self, node: Assign, env: Environment):
+        """
+        Evaluates an assignment node.
+        """
+        self.tasks.append((self.store, node, env))
+        self.tasks.append((self.eval, node.value, env))
+
+    def store(self, node: Assign, env: Environment):
+        """
+        Assigns the last result, leaving it as the result of the assignment.
+        """
+        cache = node.cache
+        if cache is None:
+            cache = node.cache = LookupCache()
+        env.set_cached(node.name, self.values[-1], cache)
+
+    def eval_funccall(self, node: FuncCall, env: Environment):
+        """
+        Evaluates a function call node: the callee, then the arguments, then the call.
+        """
+        self.tasks.append((self.call, node, env))
+        for arg in reversed(node.args):
+            self.tasks.append((self.eval, arg, env))
+        self.tasks.append((self.eval, node.callee, env))
+
+    def call(self, node: FuncCall, _env: Environment):
+        """
+        Calls the evaluated callee with the evaluated arguments.
+
+        A Lunae function does not recurse in Python: its body is scheduled
+        in its local scope instead, and the scope is given back to the pool
+        of the function once the result of the body is on the value stack.
+        """
+        count = len(node.args)
+        args = tuple(self.values[len(self.values) - count :])
+        del self.values[len(self.values) - count :]
+        fn = self.values.pop()
+
+        if type(fn) is not LunaeFunction:  # pylint: disable=unidiomatic-typecheck
+            self.values.append(fn(*args))
+            return
+
+        local = fn.bind(args)
+        if fn.pool.size:
+            self.tasks.append((FramePool.release, fn.pool, local))
+        self.tasks.append((self.eval, fn.definition.body, local))
+
+    def eval_ifexpr(self, node: IfExpr, env: Environment):
+        """
+        Evaluates an if expression node: the condition, then a branch.
+        """
+        self.tasks.append((self.branch, node, env))
+        self.tasks.append((self.eval, node.cond, env))
+
+    def branch(self, node: IfExpr, env: Environment):
+        """
+        Schedules the branch selected by the evaluated condition.
+        """
+        if self.values.pop():
+            self.tasks.append((self.eval, node.then_branch, env))
+        elif node.else_branch is not None:
+            self.tasks.append((self.eval, node.else_branch, env))
+        else:
+            self.values.append(None)
+
+    def eval_whileexpr(self, node: WhileExpr, env: Environment):
+        """
+        Evaluates a while expression node.
+        """
+        self.values.append(None)
+        self.tasks.append((self.loop, node, env))
+        self.tasks.append((self.eval, node.cond, env))
+
+    def loop(self, node: WhileExpr, env: Environment):
+        """
+        Runs another iteration if the evaluated condition holds.
+
+        The result of the previous iteration is replaced by the new one.
+        """
+        if self.values.pop():
+            self.values.pop()
+            self.tasks.append((self.loop, node, env))
+            self.tasks.append((self.eval, node.cond, env))
+            self.tasks.append((self.eval, node.body, env))
+
+    def eval_forexpr(self, node: ForExpr, env: Environment):
+        """
+        Evaluates a for expression node.
+
+        Results are collected in a list, even for lazy loops: the machine
+        cannot suspend a body evaluation.
+        """
+        self.tasks.append((self.start_iteration, node, env))
+        self.tasks.append((self.eval, node.iterable, env))
+
+    def start_iteration(self, node: ForExpr, env: Environment):
+        """
+        Replaces the evaluated iterable by the result list, and starts iterating.
+        """
+        iterator = iter(self.values.pop())
+        self.values.append(None if node.discard else [])
+        self.iterate(node, (env, iterator))
+
+    def iterate(self, node: ForExpr, state: tuple[Environment, Any]):
+        """
+        Schedules the body on the next item, if any.
+        """
+        env, iterator = state
+        for item in iterator:
+            env.set(node.var, item)
+            self.tasks.append((self.collect, node, state))
+            self.tasks.append((self.eval, node.body, env))
+            return
+
+    def collect(self, node: ForExpr, state: tuple[Environment, Any]):
+        """
+        Appends the result of an iteration to the result list, and continues.
+        """
+        value = self.values.pop()
+        if not node.discard:
+            self.values[-1].append(value)
+        self.iterate(node, state)
+
+    def eval_funcdef(self, node: FuncDef, env: Environment):
+        """
+        Evaluates a function definition node.
+
+        The created function can be called by hosts, which runs its body in
+        a nested run of the machine. Memoized functions are always called
+        that way, so that every call goes through their cache.
+        """
+        function: Callable = LunaeFunction(
+            node, env, partial(self.run, node.body), not escapes(node), "stack"
+        )
+        if node.memoized:
+            function = memoize(function, effects(node), env)
+
+        if node.name:
+            env.define_function(node.name, function)
+        self.values.append(function)
+
+    def eval_block(self, node: Block, env: Environment):
+        """
+        Evaluates a block node, keeping only the result of the last statement.
+        """
+        if not node.statements:
+            self.values.append(None)
+            return
+
+        for i, stmt in enumerate(reversed(node.statements)):
+            if i:
+                self.tasks.append((self.discard, None, None))
+            self.tasks.append((self.eval, stmt, env))
@@ -0,0 +1,66 @@
+"""
+This module provides tail call elimination for Lunae functions.
+
+A call in tail position does not call the function: it returns a `TailCall`
+describing the call. The trampoline of the function being run then performs
+it in a loop, so a chain of tail calls runs in constant Python stack space.
+"""
+
+from typing import Any, Callable
+
+Entry = Callable[[tuple], Any]
+"""
+Callable[[tuple], Any]: Runs a function body on arguments, may return a `TailCall`.
+"""
+
+
+class TailCall:
+    """
+    Represents a pending call in tail position.
+
+    Attributes:
+        entry (Entry): The body of the called function.
+        args (tuple): The arguments of the call.
+    """
+
+    __slots__ = ("entry", "args")
+
+    def __init__(self, entry: Entry, args: tuple):
+        self.entry = entry
+        self.args = args
+
+
+def tail_call(fn: Callable, args: tuple) -> Any:
+    """
+    Performs a call in tail position.
+
+    Args:
+        fn (Callable): The called function.
+        args (tuple): The arguments.
+
+    Returns:
+        Any: A `TailCall` if `fn` is a trampolined function, the result of the call otherwise.
+    """
+    entry = getattr(fn, "tail_entry", None)
+    return fn(*args) if entry is None else TailCall(entry, args)
+
+
+def trampoline(entry: Entry) -> Callable:
+    """
+    Wraps a function body into a callable running its tail calls in a loop.
+
+    Args:
+        entry (Entry): The body of the function.
+
+    Returns:
+        Callable: The function, exposing its body as `tail_entry`.
+    """
+
+    def function(*args):
+        result = entry(args)
+        while type(result) is TailCall:  # pylint: disable=unidiomatic-typecheck
+            result = result.entry(result.args)
+        return result
+
+    function.tail_entry = entry  # type: ignore[attr-defined]
+    return function
@@ -0,0 +1,336 @@
+"""
+Provides a flat representation of the AST, with its nodes stored in arrays.
+
+An `Arena` holds the nodes of a tree in postorder, so that the children of a
+node always come before it. Each node is a type code, the range of its
+children indices, and the index of its other fields in a pool of literals,
+where equal field values are stored once. Walking the arena is a scan of a
+few arrays of integers, and it holds no object per node.
+
+A `NodeView` reads a node of an arena with the fields of the node type, so
+tools can walk an arena as they would walk the tree.
+"""
+
+from array import array
+from dataclasses import dataclass, fields
+from typing import Any, Iterator, Optional, get_args, get_origin
+
+from lunae.language.ast.base.block import Block
+from lunae.language.ast.base.expr import Expr
+from lunae.language.ast.controls.forexpr import ForExpr
+from lunae.language.ast.controls.ifexpr import IfExpr
+from lunae.language.ast.controls.whileexpr import WhileExpr
+from lunae.language.ast.functions.funccall import FuncCall
+from lunae.language.ast.functions.funcdef import FuncDef
+from lunae.language.ast.values.assign import Assign
+from lunae.language.ast.values.number import Number
+from lunae.language.ast.values.string import String
+from lunae.language.ast.values.var import Var
+
+NODE_TYPES: tuple[type[Expr], ...] = (
+    Block,
+    ForExpr,
+    IfExpr,
+    WhileExpr,
+    FuncCall,
+    FuncDef,
+    Assign,
+    Number,
+    String,
+    Var,
+)
+"""
+tuple[type[Expr], ...]: The node types of the AST, by type code.
+"""
+
+NODE, NODES, OPTIONAL, VALUE = range(4)
+"""
+int: The kinds of fields: a node, a list of nodes, an optional node, or another value.
+"""
+
+
+def field_kind(annotation: Any) -> int:
+    """
+    Gets the kind of a field from its type annotation.
+
+    Args:
+        annotation (Any): The type annotation of the field.
+
+    Returns:
+        int: `NODE`, `NODES`, `OPTIONAL` or `VALUE`.
+    """
+    if isinstance(annotation, type) and issubclass(annotation, Expr):
+        return NODE
+    args = get_args(annotation)
+    if args and field_kind(args[0]) == NODE:
+        return NODES if get_origin(annotation) is list else OPTIONAL
+    return VALUE
+
+
+NODE_FIELDS = {
+    node_type: tuple(
+        (field.name, field_kind(field.type))
+        for field in fields(node_type)
+        if field.compare
+    )
+    for node_type in NODE_TYPES
+}
+"""
+dict[type[Expr], tuple[tuple[str, int], ...]]: The stored fields of each node
+type with their kinds, leaving out the annotations added by the interpreter.
+"""
+
+NODE_CODES = {node_type: code for code, node_type in enumerate(NODE_TYPES)}
+"""
+dict[type[Expr], int]: The type code of each node type.
+"""
+
+
+class Arena:
+    """
+    The nodes of an AST, stored in postorder in parallel arrays.
+
+    Attributes:
+        kinds (array): The type code of each node.
+        ends (array): The end of the children of each node in `links`, where
+            they start at the end of the previous node.
+        links (array): The indices of the children of the nodes, in the
+            order of the fields.
+        data (array): The index in `pool` of the other fields of each node.
+        pool (list[tuple]): The distinct values of the other fields of the
+            nodes, with the lengths of their lists and optional nodes.
+        pool_index (dict[tuple, int]): The index of each hashable entry of
+            `pool`, by node type code, value types and values.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty arena.
+        """
+        self.kinds = array("B")
+        self.ends = array("I")
+        self.links = array("I")
+        self.data = array("I")
+        self.pool: list[tuple] = []
+        self.pool_index: dict[tuple, int] = {}
+
+    @classmethod
+    def from_tree(cls, root: Expr) -> "Arena":
+        """
+        Stores an AST in a new arena, without recursion.
+
+        Args:
+            root (Expr): The root of the AST.
+
+        Returns:
+            Arena: The arena, whose last node is the root.
+        """
+        arena = cls()
+        indices: list[int] = []
+        stack: list[tuple[Expr, bool]] = [(root, False)]
+        while stack:
+            node, visited = stack.pop()
+            node_fields = NODE_FIELDS[type(node)]
+            if not visited:
+                stack.append((node, True))
+                stack.extend(
+                    (child, False) for child in reversed(_children(node, node_fields))
+                )
+                continue
+
+            values: list[Any] = []
+            count = 0
+            for name, kind in node_fields:
+                value = getattr(node, name)
+                if kind == NODE:
+                    count += 1
+                elif kind == NODES:
+                    count += len(value)
+                    values.append(len(value))
+                elif kind == OPTIONAL:
+                    count += value is not None
+                    values.append(int(value is not None))
+                else:
+                    values.append(value)
+            arena.links.extend(indices[len(indices) - count :])
+            del indices[len(indices) - count :]
+            indices.append(arena.add(NODE_CODES[type(node)], tuple(values)))
+        return arena
+
+    def add(self, code: int, values: tuple) -> int:
+        """
+        Appends a node, whose children were appended last to `links`.
+
+        Values are shared in the pool with the nodes of the same type and
+        equal values of the same types, so `1` and `1.0` are kept apart.
+
+        Args:
+            code (int): The type code of the node.
+            values (tuple): The values of its other fields, with the lengths
+                of its lists and optional nodes.
+
+        Returns:
+            int: The index of the node.
+        """
+        key: Optional[tuple]
+        key = (code, tuple(map(type, values)), values)
+        try:
+            data = self.pool_index.get(key)
+        except TypeError:  # Unhashable values, such as parameter lists
+            key, data = None, None
+        if data is None:
+            data = len(self.pool)
+            self.pool.append(values)
+            if key is not None:
+                self.pool_index[key] = data
+        self.kinds.append(code)
+        self.ends.append(len(self.links))
+        self.data.append(data)
+        return len(self.kinds) - 1
+
+    def children(self, index: int) -> array:
+        """
+        Gets the children indices of a node.
+
+        Args:
+            index (int): The index of the node.
+
+        Returns:
+            array: The indices of its children, in the order of the fields.
+        """
+        start = self.ends[index - 1] if index else 0
+        return self.links[start : self.ends[index]]
+
+    @property
+    def root(self) -> "NodeView":
+        """
+        Gets the root of the tree, the last node.
+
+        Returns:
+            NodeView: The root node.
+        """
+        return NodeView(self, len(self.kinds) - 1)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Gets the size of the node arrays, in bytes, leaving out the pool.
+
+        Returns:
+            int: The size of `kinds`, `ends`, `links` and `data`.
+        """
+        return sum(
+            len(values) * values.itemsize
+            for values in (self.kinds, self.ends, self.links, self.data)
+        )
+
+    def to_tree(self) -> Expr:
+        """
+        Rebuilds the AST stored in the arena, without recursion.
+
+        Returns:
+            Expr: The root of the AST.
+        """
+        nodes: list[Expr] = []
+        for index, code in enumerate(self.kinds):
+            node_type = NODE_TYPES[code]
+            children = iter([nodes[child] for child in self.children(index)])
+            values = iter(self.pool[self.data[index]])
+            attributes: dict[str, Any] = {}
+            for name, kind in NODE_FIELDS[node_type]:
+                if kind == NODE:
+                    attributes[name] = next(children)
+                elif kind == NODES:
+                    attributes[name] = [next(children) for _ in range(next(values))]
+                elif kind == OPTIONAL:
+                    attributes[name] = next(children) if next(values) else None
+                else:
+                    attributes[name] = next(values)
+            nodes.append(node_type(**attributes))
+        return nodes[-1]
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __iter__(self) -> Iterator["NodeView"]:
+        """
+        Iterates over the nodes in postorder, children first.
+
+        Returns:
+            Iterator[NodeView]: The views of the nodes.
+        """
+        return (NodeView(self, index) for index in range(len(self.kinds)))
+
+
+def _children(node: Expr, node_fields: tuple[tuple[str, int], ...]) -> list[Expr]:
+    """
+    Gets the children of a node, in the order of its fields.
+    """
+    children: list[Expr] = []
+    for name, kind in node_fields:
+        value = getattr(node, name)
+        if kind == NODE or kind == OPTIONAL and value is not None:
+            children.append(value)
+        elif kind == NODES:
+            children.extend(value)
+    return children
+
+
+@dataclass(frozen=True, slots=True)
+class NodeView:
+    """
+    A node of an arena, read with the fields of its node type.
+
+    Node fields read as views, lists of nodes as lists of views, and the
+    other fields as their values.
+
+    Attributes:
+        arena (Arena): The arena of the node.
+        index (int): The index of the node in the arena.
+    """
+
+    arena: Arena
+    index: int
+
+    @property
+    def type(self) -> type[Expr]:
+        """
+        Gets the node type.
+
+        Returns:
+            type[Expr]: The class of the node in the tree.
+        """
+        return NODE_TYPES[self.arena.kinds[self.index]]
+
+    def children(self) -> Iterator["NodeView"]:
+        """
+        Iterates over the direct sub-expressions, in the order of the fields.
+
+        Returns:
+            Iterator[NodeView]: The views of the sub-expressions.
+        """
+        arena = self.arena
+        return (NodeView(arena, child) for child in arena.children(self.index))
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Reads a field of the node.
+
+        Raises:
+            AttributeError: If the node type has no such stored field.
+        """
+        arena = self.arena
+        children = iter(arena.children(self.index))
+        values = iter(arena.pool[arena.data[self.index]])
+        for field_name, kind in NODE_FIELDS[self.type]:
+            if kind == NODE:
+                value: Any = NodeView(arena, next(children))
+            elif kind == NODES:
+                value = [NodeView(arena, next(children)) for _ in range(next(values))]
+            elif kind == OPTIONAL:
+                value = NodeView(arena, next(children)) if next(values) else None
+            else:
+                value = next(values)
+            if field_name == name:
+                return value
+        raise AttributeError(name)
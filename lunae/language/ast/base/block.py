@@ -3,12 +3,13 @@ This module defines the Block class.
 """
 
 from dataclasses import dataclass
+from typing import Iterator
 
 from lunae.language.ast.base.expr import Expr
 from lunae.utils.indent import indent
 
 
-@dataclass
+@dataclass(slots=True)
 class Block(Expr):
     """
     Represents a block of statements.
@@ -19,5 +20,14 @@ class Block(Expr):
 
     statements: list[Expr]
 
+    def children(self) -> Iterator[Expr]:
+        """
+        Iterates over the direct sub-expressions, in evaluation order.
+
+        Returns:
+            Iterator[Expr]: The sub-expressions.
+        """
+        yield from self.statements
+
     def __str__(self):
         return f"BLOCK\n{'\n'.join(indent(s) for s in self.statements)}"
@@ -3,13 +3,23 @@ This module defines the Expr class.
 """
 
 from dataclasses import dataclass
+from typing import Iterator
 
 
-@dataclass
+@dataclass(slots=True)
 class Expr:
     """
     Base class for all expressions.
     """
 
+    def children(self) -> Iterator["Expr"]:
+        """
+        Iterates over the direct sub-expressions, in evaluation order.
+
+        Returns:
+            Iterator[Expr]: The sub-expressions.
+        """
+        return iter(())
+
     def __str__(self):
         return "EXPR"
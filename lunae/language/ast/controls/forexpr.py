@@ -2,13 +2,14 @@
 This module defines the ForExpr class, which represents a for-expression in the AST.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
 
 from lunae.language.ast.base.expr import Expr
 from lunae.utils.indent import indent
 
 
-@dataclass
+@dataclass(slots=True)
 class ForExpr(Expr):
     """
     Represents a for-expression.
@@ -17,11 +18,29 @@ class ForExpr(Expr):
         var (str): The loop variable.
         iterable (Expr): The iterable expression.
         body (Expr): The body of the loop.
+        address (Optional[tuple[int, int]]): The (depth, slot) of the loop variable, set by
+            the resolver. None when it is a global.
+        discard (bool): Whether the results are never used, so none is collected.
+        lazy (bool): Whether the results are consumed once, in order, so they
+            are produced by an iterator instead of a list.
     """
 
     var: str
     iterable: Expr
     body: Expr
+    address: Optional[tuple[int, int]] = field(default=None, compare=False, repr=False)
+    discard: bool = False
+    lazy: bool = False
+
+    def children(self) -> Iterator[Expr]:
+        """
+        Iterates over the direct sub-expressions, in evaluation order.
+
+        Returns:
+            Iterator[Expr]: The sub-expressions.
+        """
+        yield self.iterable
+        yield self.body
 
     def __str__(self) -> str:
         """
@@ -3,13 +3,13 @@ This module defines the IfExpr class, which represents an if-expression in the A
 """
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterator, Optional
 
 from lunae.language.ast.base.expr import Expr
 from lunae.utils.indent import indent
 
 
-@dataclass
+@dataclass(slots=True)
 class IfExpr(Expr):
     """
     Represents an if-expression.
@@ -24,6 +24,18 @@ class IfExpr(Expr):
     then_branch: Expr
     else_branch: Optional[Expr]
 
+    def children(self) -> Iterator[Expr]:
+        """
+        Iterates over the direct sub-expressions, in evaluation order.
+
+        Returns:
+            Iterator[Expr]: The sub-expressions.
+        """
+        yield self.cond
+        yield self.then_branch
+        if self.else_branch is not None:
+            yield self.else_branch
+
     def __str__(self) -> str:
         """
         Returns a string representation of the if-expression.
@@ -3,12 +3,13 @@ This module defines the WhileExpr class, which represents a while-expression in
 """
 
 from dataclasses import dataclass
+from typing import Iterator
 
 from lunae.language.ast.base.expr import Expr
 from lunae.utils.indent import indent
 
 
-@dataclass
+@dataclass(slots=True)
 class WhileExpr(Expr):
     """
     Represents a while-expression.
@@ -21,5 +22,15 @@ class WhileExpr(Expr):
     cond: Expr
     body: Expr
 
+    def children(self) -> Iterator[Expr]:
+        """
+        Iterates over the direct sub-expressions, in evaluation order.
+
+        Returns:
+            Iterator[Expr]: The sub-expressions.
+        """
+        yield self.cond
+        yield self.body
+
     def __str__(self):
         return f"WHILE\n{indent(self.cond)}\n{indent(self.body)}"
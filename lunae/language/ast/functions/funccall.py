@@ -3,12 +3,13 @@ This module defines the FuncCall class, which represents a function call in the
 """
 
 from dataclasses import dataclass
+from typing import Iterator
 
 from lunae.language.ast.base.expr import Expr
 from lunae.utils.indent import indent
 
 
-@dataclass
+@dataclass(slots=True)
 class FuncCall(Expr):
     """
     Represents a function call.
@@ -21,6 +22,16 @@ class FuncCall(Expr):
     callee: Expr
     args: list[Expr]
 
+    def children(self) -> Iterator[Expr]:
+        """
+        Iterates over the direct sub-expressions, in evaluation order.
+
+        Returns:
+            Iterator[Expr]: The sub-expressions.
+        """
+        yield self.callee
+        yield from self.args
+
     def __str__(self) -> str:
         """
         Returns a string representation of the function call.
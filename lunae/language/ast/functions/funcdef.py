@@ -2,14 +2,14 @@
 This module defines the FuncDef class, which represents a function definition in the AST.
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
 
 from lunae.language.ast.base.expr import Expr
 from lunae.utils.indent import indent
 
 
-@dataclass
+@dataclass(slots=True)
 class FuncDef(Expr):
     """
     Represents a function definition.
@@ -18,11 +18,28 @@ class FuncDef(Expr):
         name (str): The function name.
         params (list[tuple[str, str]]): The list of parameter names.
         body (Expr): The body of the function.
+        memoized (bool): Whether the results of the function are cached.
+        address (Optional[tuple[int, int]]): The (depth, slot) of the function name, set by
+            the resolver. None when it is a global.
+        layout (Optional[tuple[str, ...]]): The names of the local slots, parameters
+            first, set by the resolver.
     """
 
     name: Optional[str]
     params: list[tuple[str, str]]
     body: Expr
+    memoized: bool = False
+    address: Optional[tuple[int, int]] = field(default=None, compare=False, repr=False)
+    layout: Optional[tuple[str, ...]] = field(default=None, compare=False, repr=False)
+
+    def children(self) -> Iterator[Expr]:
+        """
+        Iterates over the direct sub-expressions, in evaluation order.
+
+        Returns:
+            Iterator[Expr]: The sub-expressions.
+        """
+        yield self.body
 
     def __str__(self) -> str:
         """
@@ -31,4 +48,5 @@ class FuncDef(Expr):
         Returns:
             str: The string representation of the function definition.
         """
-        return f"FUNC {self.name!r} {self.params!r}:\n{indent(self.body)}"
+        memo = "MEMO " if self.memoized else ""
+        return f"{memo}FUNC {self.name!r} {self.params!r}:\n{indent(self.body)}"
@@ -2,13 +2,14 @@
 This module defines the Assign class, which represents an assignment expr in the AST.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
 
 from lunae.language.ast.base.expr import Expr
 from lunae.utils.indent import indent
 
 
-@dataclass
+@dataclass(slots=True)
 class Assign(Expr):
     """
     Represents an assignment expr.
@@ -16,10 +17,25 @@ class Assign(Expr):
     Attributes:
         name (str): The variable name.
         value (Expr): The value to assign.
+        address (Optional[tuple[int, int]]): The (depth, slot) of the variable, set by
+            the resolver. None when it is a global.
+        cache (Optional[Any]): The `LookupCache` of the binding of the name, set
+            by the interpreter.
     """
 
     name: str
     value: Expr
+    address: Optional[tuple[int, int]] = field(default=None, compare=False, repr=False)
+    cache: Optional[Any] = field(default=None, init=False, compare=False, repr=False)
+
+    def children(self) -> Iterator[Expr]:
+        """
+        Iterates over the direct sub-expressions, in evaluation order.
+
+        Returns:
+            Iterator[Expr]: The sub-expressions.
+        """
+        yield self.value
 
     def __str__(self):
         return f"ASSIGN {self.name!r}\n{indent(self.value)}"
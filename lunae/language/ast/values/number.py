@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from lunae.language.ast.base.expr import Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Number(Expr):
     """
     Represents a numeric literal.
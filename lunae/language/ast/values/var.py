@@ -1,18 +1,25 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any, Optional
 
-from lunae.parser.parsers.base.expr import Expr
+from lunae.language.ast.base.expr import Expr
 
 
-@dataclass
+@dataclass(slots=True)
 class Var(Expr):
     """
     Represents a variable.
 
     Attributes:
         name (str): The name of the variable.
+        address (Optional[tuple[int, int]]): The (depth, slot) of the variable, set by
+            the resolver. None when it is a global.
+        cache (Optional[Any]): The `LookupCache` of the binding of the name, set
+            by the interpreter.
     """
 
     name: str
+    address: Optional[tuple[int, int]] = field(default=None, compare=False, repr=False)
+    cache: Optional[Any] = field(default=None, init=False, compare=False, repr=False)
 
     def __str__(self):
         return f"VAR {self.name!r}"
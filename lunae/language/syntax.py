@@ -26,7 +26,7 @@ class Operator:
         return {op[0]: Operator(*op) for op in operators}
 
 
-KEYWORDS = {"if", "else", "for", "in", "while", "func"}
+KEYWORDS = {"if", "else", "for", "in", "while", "func", "memo"}
 """
 set[str]: The reserved keywords in the language.
 """
@@ -0,0 +1,33 @@
+"""
+The `lunae.optimizer` package provides optimization passes over the abstract syntax tree (AST).
+"""
+
+from typing import Optional
+
+from lunae.interpreter import create_global_env
+from lunae.interpreter.environment import Environment
+from lunae.language.ast.base.expr import Expr
+from lunae.optimizer.folding import ConstantFolder
+from lunae.optimizer.usage import UsageAnalyzer
+
+
+def optimize(node: Expr, global_env: Optional[Environment] = None) -> Expr:
+    """
+    Optimizes an abstract syntax tree (AST).
+
+    Constants are folded first, then the `for` loops whose results are not
+    collected are marked.
+
+    Args:
+        node (Expr): The root node of the program.
+        global_env (Optional[Environment]): The global environment the program
+            will run in. Defaults to a new global environment.
+
+    Returns:
+        Expr: The optimized program.
+    """
+    folded = ConstantFolder(global_env or create_global_env()).fold(node)
+    return UsageAnalyzer().analyze(folded)
+
+
+__all__ = ("optimize",)
@@ -0,0 +1,227 @@
+"""
+This module provides the constant folding pass.
+
+Operators are parsed into calls to builtin functions such as `add`. When every
+argument is a literal and the operator name still refers to the builtin from
+`create_global_env`, the call is computed once, at optimization time. Folded
+conditions then let `if` and `while` drop the branches that can never run.
+"""
+
+from dataclasses import replace
+from typing import Any, Callable, Optional
+
+from lunae.interpreter.environment import Environment
+from lunae.interpreter.operators import OPERATORS
+from lunae.language.ast.base.block import Block
+from lunae.language.ast.base.expr import Expr
+from lunae.language.ast.controls.forexpr import ForExpr
+from lunae.language.ast.controls.ifexpr import IfExpr
+from lunae.language.ast.controls.whileexpr import WhileExpr
+from lunae.language.ast.functions.funccall import FuncCall
+from lunae.language.ast.functions.funcdef import FuncDef
+from lunae.language.ast.values.assign import Assign
+from lunae.language.ast.values.number import Number
+from lunae.language.ast.values.string import String
+from lunae.language.ast.values.var import Var
+
+Constant = Number | String
+
+
+def bound_names(node: Expr) -> set[str]:
+    """
+    Collects every name a program may bind, in any scope.
+
+    Args:
+        node (Expr): The root node of the program.
+
+    Returns:
+        set[str]: The assigned names, loop variables, function names and parameters.
+    """
+    names: set[str] = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, Assign):
+            names.add(current.name)
+        elif isinstance(current, ForExpr):
+            names.add(current.var)
+        elif isinstance(current, FuncDef):
+            if current.name:
+                names.add(current.name)
+            names.update(param for param, _type in current.params)
+        stack.extend(current.children())
+    return names
+
+
+def literal(value: Any) -> Optional[Constant]:
+    """
+    Builds the literal node of a folded value.
+
+    Args:
+        value (Any): The value.
+
+    Returns:
+        Optional[Constant]: The literal node, or None if the value has no literal.
+    """
+    if isinstance(value, (bool, int, float)):
+        return Number(value)
+    if isinstance(value, str):
+        return String(value)
+    return None
+
+
+class ConstantFolder:
+    """
+    Folds constant subexpressions and removes dead branches.
+    """
+
+    def __init__(self, global_env: Environment):
+        """
+        Initializes the folder.
+
+        Args:
+            global_env (Environment): The global environment the program will run in.
+        """
+        self.global_env = global_env
+        self.foldable: dict[str, Callable[..., Any]] = {}
+
+    def is_builtin(self, name: str) -> bool:
+        """
+        Checks whether a name is still bound to its builtin operator.
+
+        Args:
+            name (str): The operator name.
+
+        Returns:
+            bool: True if the global binding is the builtin.
+        """
+        try:
+            return self.global_env.get(name) is OPERATORS[name]
+        except NameError:
+            return False
+
+    def fold(self, node: Expr) -> Expr:
+        """
+        Folds a program.
+
+        Operators the program itself may rebind are never folded.
+
+        Args:
+            node (Expr): The root node of the program.
+
+        Returns:
+            Expr: The folded program.
+        """
+        bound = bound_names(node)
+        self.foldable = {
+            name: fn
+            for name, fn in OPERATORS.items()
+            if name not in bound and self.is_builtin(name)
+        }
+        return self.visit(node)
+
+    def visit(self, node: Expr) -> Expr:
+        """
+        Folds a node.
+
+        Args:
+            node (Expr): The node.
+
+        Returns:
+            Expr: The folded node.
+        """
+        method = getattr(self, "visit_" + node.__class__.__name__.lower(), None)
+        return node if method is None else method(node)
+
+    def visit_assign(self, node: Assign) -> Expr:
+        """
+        Folds an assignment node.
+        """
+        return replace(node, value=self.visit(node.value))
+
+    def visit_funccall(self, node: FuncCall) -> Expr:
+        """
+        Folds a function call node, computing builtin operators on literals.
+        """
+        callee = self.visit(node.callee)
+        args = [self.visit(a) for a in node.args]
+
+        constants = [a for a in args if isinstance(a, Constant)]
+        if (
+            isinstance(callee, Var)
+            and callee.name in self.foldable
+            and len(constants) == len(args)
+        ):
+            try:
+                value = self.foldable[callee.name](*(c.value for c in constants))
+            except Exception:  # pylint: disable=broad-exception-caught
+                value = None  # Let the error happen at runtime
+            folded = literal(value)
+            if folded is not None:
+                return folded
+
+        return replace(node, callee=callee, args=args)
+
+    def visit_ifexpr(self, node: IfExpr) -> Expr:
+        """
+        Folds an if expression node, keeping only the taken branch of a constant condition.
+        """
+        cond = self.visit(node.cond)
+
+        if isinstance(cond, Constant):
+            branch = node.then_branch if cond.value else node.else_branch
+            return Block([]) if branch is None else self.visit(branch)
+
+        return replace(
+            node,
+            cond=cond,
+            then_branch=self.visit(node.then_branch),
+            else_branch=(
+                None if node.else_branch is None else self.visit(node.else_branch)
+            ),
+        )
+
+    def visit_whileexpr(self, node: WhileExpr) -> Expr:
+        """
+        Folds a while expression node, removing loops that never run.
+        """
+        cond = self.visit(node.cond)
+
+        if isinstance(cond, Constant) and not cond.value:
+            return Block([])
+
+        return replace(node, cond=cond, body=self.visit(node.body))
+
+    def visit_forexpr(self, node: ForExpr) -> Expr:
+        """
+        Folds a for expression node.
+        """
+        return replace(
+            node, iterable=self.visit(node.iterable), body=self.visit(node.body)
+        )
+
+    def visit_funcdef(self, node: FuncDef) -> Expr:
+        """
+        Folds a function definition node.
+        """
+        return replace(node, body=self.visit(node.body))
+
+    def visit_block(self, node: Block) -> Expr:
+        """
+        Folds a block node.
+
+        Nested blocks are flattened, and literals whose value is discarded are dropped.
+        """
+        statements: list[Expr] = []
+        last = len(node.statements) - 1
+
+        for i, stmt in enumerate(node.statements):
+            folded = self.visit(stmt)
+            if i == last:
+                statements.append(folded)
+            elif isinstance(folded, Block):
+                statements.extend(folded.statements)
+            elif not isinstance(folded, Constant):
+                statements.append(folded)
+
+        return replace(node, statements=statements)
@@ -0,0 +1,222 @@
+"""
+This module provides the result usage analysis.
+
+Every Lunae construct is an expression, so a `for` loop collects the result of
+each iteration in a list even when it is used as a statement and that list is
+thrown away. This pass finds which results are actually used, and marks:
+
+- `for` loops whose value is never used as `discard`, so nothing is collected;
+- `for` loops only iterated by another `for` as `lazy`, so their results are
+  produced one at a time instead of being materialized.
+
+A lazy loop runs its body interleaved with the body of the loop iterating
+it, so a loop is only made lazy when the two bodies cannot observe each
+other: the outer body reads no name the inner loop assigns, neither body
+reads or assigns a name the outer body assigns, and the outer body calls no
+function but the builtin operators, which could reach the names of either.
+Builtin operators are only trusted when the program runs where they cannot
+have been rebound, as after constant folding.
+"""
+
+from dataclasses import replace
+from typing import Collection
+
+from lunae.interpreter.operators import OPERATORS
+from lunae.language.ast.base.block import Block
+from lunae.language.ast.base.expr import Expr
+from lunae.language.ast.controls.forexpr import ForExpr
+from lunae.language.ast.controls.ifexpr import IfExpr
+from lunae.language.ast.controls.whileexpr import WhileExpr
+from lunae.language.ast.functions.funccall import FuncCall
+from lunae.language.ast.functions.funcdef import FuncDef
+from lunae.language.ast.values.assign import Assign
+from lunae.language.ast.values.var import Var
+
+
+def body_names(
+    node: Expr, operators: frozenset[str]
+) -> tuple[set[str], set[str], bool]:
+    """
+    Collects the names a loop body reads and assigns, without entering nested functions.
+
+    Args:
+        node (Expr): The loop body.
+        operators (frozenset[str]): The names of the builtin operators not rebound.
+
+    Returns:
+        tuple[set[str], set[str], bool]: The names read, the names assigned, and
+        whether the body calls a function other than a builtin operator.
+    """
+    reads: set[str] = set()
+    assigns: set[str] = set()
+    calls = False
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, Var):
+            reads.add(current.name)
+        elif isinstance(current, Assign):
+            assigns.add(current.name)
+        elif isinstance(current, ForExpr):
+            assigns.add(current.var)
+        elif isinstance(current, FuncDef):
+            if current.name:
+                assigns.add(current.name)
+            continue
+        elif isinstance(current, FuncCall):
+            callee = current.callee
+            calls = calls or not (isinstance(callee, Var) and callee.name in operators)
+        stack.extend(current.children())
+    return reads, assigns, calls
+
+
+class UsageAnalyzer:
+    """
+    Marks the `for` loops whose results are discarded or only iterated once.
+
+    Attributes:
+        trusted (frozenset[str]): The builtin operators bound where the program runs.
+        operators (frozenset[str]): The names of the builtin operators the
+            program does not rebind, whose calls cannot reach other names.
+    """
+
+    def __init__(self, operators: Collection[str] = tuple(OPERATORS)):
+        """
+        Initializes the analyzer.
+
+        Args:
+            operators (Collection[str]): The builtin operators bound where the
+                program runs, none if they may have been rebound.
+        """
+        self.trusted = frozenset(operators)
+        self.operators = self.trusted
+
+    def analyze(self, node: Expr) -> Expr:
+        """
+        Analyzes a program, whose own result is used.
+
+        Args:
+            node (Expr): The root node of the program.
+
+        Returns:
+            Expr: The annotated program.
+        """
+        rebound: set[str] = set()
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, (Assign, FuncDef)) and current.name:
+                rebound.add(current.name)
+            elif isinstance(current, ForExpr):
+                rebound.add(current.var)
+            stack.extend(current.children())
+        self.operators = self.trusted.difference(rebound)
+        return self.visit(node, True)
+
+    def visit(self, node: Expr, used: bool) -> Expr:
+        """
+        Analyzes a node.
+
+        Args:
+            node (Expr): The node.
+            used (bool): Whether the value of the node is used.
+
+        Returns:
+            Expr: The annotated node.
+        """
+        method = getattr(self, "visit_" + node.__class__.__name__.lower(), None)
+        return node if method is None else method(node, used)
+
+    def visit_assign(self, node: Assign, _used: bool) -> Expr:
+        """
+        Analyzes an assignment node.
+        """
+        return replace(node, value=self.visit(node.value, True))
+
+    def visit_funccall(self, node: FuncCall, _used: bool) -> Expr:
+        """
+        Analyzes a function call node.
+        """
+        return replace(
+            node,
+            callee=self.visit(node.callee, True),
+            args=[self.visit(a, True) for a in node.args],
+        )
+
+    def visit_ifexpr(self, node: IfExpr, used: bool) -> Expr:
+        """
+        Analyzes an if expression node, whose branches are used as it is.
+        """
+        return replace(
+            node,
+            cond=self.visit(node.cond, True),
+            then_branch=self.visit(node.then_branch, used),
+            else_branch=(
+                None if node.else_branch is None else self.visit(node.else_branch, used)
+            ),
+        )
+
+    def visit_whileexpr(self, node: WhileExpr, used: bool) -> Expr:
+        """
+        Analyzes a while expression node, whose body is used as it is.
+        """
+        return replace(
+            node, cond=self.visit(node.cond, True), body=self.visit(node.body, used)
+        )
+
+    def visit_forexpr(self, node: ForExpr, used: bool) -> Expr:
+        """
+        Analyzes a for expression node.
+
+        An iterable which is itself a `for` loop is only consumed once, in
+        order, by this loop, so it can be lazy if the bodies are independent.
+        """
+        iterable = self.visit(node.iterable, True)
+        if isinstance(iterable, ForExpr) and self.independent(iterable, node.body):
+            iterable = replace(iterable, lazy=True)
+
+        return replace(
+            node,
+            iterable=iterable,
+            body=self.visit(node.body, used),
+            discard=not used,
+        )
+
+    def independent(self, inner: ForExpr, outer_body: Expr) -> bool:
+        """
+        Checks whether a loop can run interleaved with the body of the loop iterating it.
+
+        Args:
+            inner (ForExpr): The iterated loop.
+            outer_body (Expr): The body of the iterating loop.
+
+        Returns:
+            bool: True if neither body can observe the other.
+        """
+        outer_reads, outer_assigns, outer_calls = body_names(outer_body, self.operators)
+        inner_reads, inner_assigns, inner_calls = body_names(inner.body, self.operators)
+        inner_assigns.add(inner.var)
+        if outer_calls or inner_calls and outer_assigns:
+            return False
+        if not outer_reads.isdisjoint(inner_assigns):
+            return False
+        return outer_assigns.isdisjoint(inner_reads | inner_assigns)
+
+    def visit_funcdef(self, node: FuncDef, _used: bool) -> Expr:
+        """
+        Analyzes a function definition node, whose body is returned.
+        """
+        return replace(node, body=self.visit(node.body, True))
+
+    def visit_block(self, node: Block, used: bool) -> Expr:
+        """
+        Analyzes a block node, where only the last statement may be used.
+        """
+        last = len(node.statements) - 1
+        return replace(
+            node,
+            statements=[
+                self.visit(stmt, used and i == last)
+                for i, stmt in enumerate(node.statements)
+            ],
+        )
@@ -2,25 +2,63 @@
 The `lunae.parser` package provides tools for parsing token into an abstract syntax tree (AST).
 """
 
+from typing import Iterable, Iterator
+
 from lunae.language.ast.base.block import Block
-from lunae.parser.parsers.base.block import parse_reader
-from lunae.parser.reader import ParserReader
-from lunae.tokenizer import Token
+from lunae.language.ast.base.expr import Expr
+from lunae.parser.parallel import parse_parallel
+from lunae.parser.parsers.base.block import iter_statements, parse_reader
+from lunae.parser.reader import BufferReader, ParserReader
+from lunae.tokenizer import Token, TokenBuffer
 
 
-def parse(tokens: list[Token]) -> Block:
+def parse(tokens: Iterable[Token]) -> Block:
     """
-    Parses a list of tokens into an abstract syntax tree (AST).
+    Parses tokens into an abstract syntax tree (AST).
+
+    The tokens are consumed as parsing goes, so they may be produced lazily,
+    for example by `lunae.tokenizer.stream.tokenize_stream`.
 
     Args:
-        tokens (list[Token]): The list of tokens to parse.
+        tokens (Iterable[Token]): The tokens to parse.
 
     Returns:
         Block: The root block of the parsed AST.
     """
-    reader = ParserReader(tokens)
-    ast = parse_reader(reader)
+    ast = parse_reader(create_reader(tokens))
     return ast
 
 
-__all__ = ("parse",)
+def parse_iter(tokens: Iterable[Token]) -> Iterator[Expr]:
+    """
+    Parses tokens into top-level statements, yielded one at a time.
+
+    Only the tokens of the statement being parsed are read, so with tokens
+    produced lazily, the memory used scales with the largest statement
+    rather than with the whole source.
+
+    Args:
+        tokens (Iterable[Token]): The tokens to parse.
+
+    Returns:
+        Iterator[Expr]: The top-level statements, in order.
+    """
+    return iter_statements(create_reader(tokens))
+
+
+def create_reader(tokens: Iterable[Token]) -> ParserReader:
+    """
+    Creates the parser reader suited to the given tokens.
+
+    Args:
+        tokens (Iterable[Token]): The tokens to read.
+
+    Returns:
+        ParserReader: A `BufferReader` for a `TokenBuffer`, a `ParserReader` otherwise.
+    """
+    if isinstance(tokens, TokenBuffer):
+        return BufferReader(tokens)
+    return ParserReader(tokens)
+
+
+__all__ = ("parse", "parse_iter", "parse_parallel")
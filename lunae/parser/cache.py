@@ -0,0 +1,467 @@
+"""
+Provides a persistent cache of parsed sources, the `__pycache__` of Lunae.
+
+A parsed AST is stored in a compact form: its nodes in postorder, each as a
+tuple of a node type code and its fields, serialized with `marshal`. Nested
+nodes are replaced by `...` and rebuilt from a stack, so that no recursion
+is needed to store or load deep trees, and loading only creates AST nodes.
+
+Entries are keyed by a hash of the source, the lunae version and a
+fingerprint of the grammar and the parser, so an edited source or an
+updated parser never reads a stale entry. They are written to a temporary
+file renamed into place, so that a reader never sees a partial entry, and
+the least recently used ones are evicted beyond a total size or number of
+entries. The directory is only listed when the entries stored since it was
+last listed may have crossed a limit.
+"""
+
+import gc
+import hashlib
+import marshal
+import os
+import tempfile
+import time
+from functools import cache
+from typing import Any, Optional
+
+from lunae.language.ast.arena import (
+    NODE,
+    NODE_CODES,
+    NODE_FIELDS,
+    NODE_TYPES,
+    NODES,
+    OPTIONAL,
+    VALUE,
+)
+from lunae.language.ast.base.block import Block
+from lunae.language.ast.base.expr import Expr
+from lunae.language.syntax import BINARY_OPERATORS, KEYWORDS, UNARY_OPERATORS
+from lunae.parser.parsers.base.block import parse_reader
+from lunae.parser.reader import BufferReader
+from lunae.tokenizer.grammar import COMPILED_TOKEN_REGEX
+from lunae.tokenizer.scanner import scan
+from lunae.utils.version import get_version
+
+CACHE_DIR_ENV = "LUNAE_CACHE_DIR"
+"""
+str: The environment variable setting the cache directory.
+"""
+
+CACHE_DIR_NAME = "__lunaecache__"
+"""
+str: The name of the cache directory created next to the sources.
+"""
+
+CACHE_SUFFIX = ".lnc"
+"""
+str: The extension of the cache entries.
+"""
+
+MAGIC = b"LNC1"
+"""
+bytes: The first bytes of a cache entry, changed with the entry format.
+"""
+
+DEFAULT_MAX_SIZE = 1 << 26
+"""
+int: The default total size of the entries of a cache directory, in bytes.
+"""
+
+DEFAULT_MAX_ENTRIES = 4096
+"""
+int: The default number of entries of a cache directory.
+"""
+
+TEMP_SUFFIX = ".tmp"
+"""
+str: The extension of the temporary files entries are written to.
+"""
+
+STALE_TEMP_AGE = 3600.0
+"""
+float: The age, in seconds, after which a temporary file was left by a
+crashed writer rather than being written, and is removed.
+"""
+
+FINGERPRINT_PACKAGES = ("language", "parser", "tokenizer")
+"""
+tuple[str, ...]: The packages of lunae whose sources make the fingerprint.
+"""
+
+
+@cache
+def fingerprint() -> str:
+    """
+    Computes the fingerprint of the grammar and the parser.
+
+    The fingerprint covers the token patterns, keywords and operators, the
+    stored fields of the node types, and the sources of the language, the
+    tokenizer and the parser, which includes the scanner, the readers and
+    the interning of names, so that a change in any of them invalidates the
+    cache.
+
+    Returns:
+        str: The fingerprint, as a hexadecimal digest.
+    """
+    digest = hashlib.sha256()
+    digest.update(COMPILED_TOKEN_REGEX.pattern.encode())
+    digest.update(repr(sorted(KEYWORDS)).encode())
+    for operators in (BINARY_OPERATORS, UNARY_OPERATORS):
+        digest.update(repr(sorted(map(repr, operators.values()))).encode())
+    for node_type in NODE_TYPES:
+        digest.update(repr((node_type.__name__, NODE_FIELDS[node_type])).encode())
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for package in FINGERPRINT_PACKAGES:
+        for directory, dirnames, filenames in os.walk(os.path.join(root, package)):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith(".py"):
+                    path = os.path.join(directory, filename)
+                    digest.update(os.path.relpath(path, root).encode())
+                    with open(path, "rb") as f:
+                        digest.update(f.read())
+    return digest.hexdigest()
+
+
+@cache
+def key_prefix() -> bytes:
+    """
+    Computes the part of the cache keys shared by every source.
+
+    Looking the version up reads the package metadata, so it is done once.
+
+    Returns:
+        bytes: The version and the fingerprint, hashed before each source.
+    """
+    return f"{get_version()}\0{fingerprint()}\0".encode()
+
+
+def encode(root: Expr) -> list[tuple]:
+    """
+    Encodes an AST into a list of records, which `marshal` can serialize.
+
+    Each record holds the type code of a node and its number of children,
+    then its fields: a list of nodes is replaced by its length, an optional
+    node by 0 or 1, and a node is left out. The children themselves come
+    before, in the order of the fields.
+
+    Args:
+        root (Expr): The root of the AST.
+
+    Returns:
+        list[tuple]: The records of the nodes, in postorder.
+    """
+    records: list[tuple] = []
+    stack: list[tuple[Expr, bool]] = [(root, False)]
+    while stack:
+        node, visited = stack.pop()
+        node_type = type(node)
+        if visited:
+            record: list[Any] = [NODE_CODES[node_type], 0]
+            for name, kind in NODE_FIELDS[node_type]:
+                value = getattr(node, name)
+                if kind == NODE:
+                    record[1] += 1
+                    continue
+                if kind == NODES:
+                    value = len(value)
+                elif kind == OPTIONAL:
+                    value = int(value is not None)
+                if kind != VALUE:
+                    record[1] += value
+                record.append(value)
+            records.append(tuple(record))
+            continue
+
+        stack.append((node, True))
+        children: list[Expr] = []
+        for name, kind in NODE_FIELDS[node_type]:
+            value = getattr(node, name)
+            if kind == NODE or kind == OPTIONAL and value is not None:
+                children.append(value)
+            elif kind == NODES:
+                children.extend(value)
+        stack.extend((child, False) for child in reversed(children))
+    return records
+
+
+def decode(records: list[tuple]) -> Expr:
+    """
+    Rebuilds an AST from the records made by `encode`.
+
+    Args:
+        records (list[tuple]): The records of the nodes, in postorder.
+
+    Returns:
+        Expr: The root of the AST.
+
+    Raises:
+        ValueError: If the records do not describe a single AST.
+    """
+    specs = [(node_type, NODE_FIELDS[node_type]) for node_type in NODE_TYPES]
+    # The nodes form no cycles, but creating so many would trigger collections
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        stack: list[Expr] = []
+        for record in records:
+            node_type, node_fields = specs[record[0]]
+            count = record[1]
+            position = len(stack) - count
+            if position < 0:
+                raise ValueError("Record of a node with missing children")
+            attributes = {}
+            values = iter(record[2:])
+            for name, kind in node_fields:
+                if kind == NODE:
+                    attributes[name] = stack[position]
+                    position += 1
+                elif kind == VALUE:
+                    attributes[name] = next(values)
+                else:
+                    length = next(values)
+                    if kind == NODES:
+                        attributes[name] = stack[position : position + length]
+                    else:
+                        attributes[name] = stack[position] if length else None
+                    position += length
+            del stack[len(stack) - count :]
+
+            stack.append(node_type(**attributes))
+    finally:
+        if enabled:
+            gc.enable()
+
+    if len(stack) != 1:
+        raise ValueError("Records do not describe a single AST")
+    return stack[0]
+
+
+class ASTCache:
+    """
+    A directory of parsed sources, kept across runs.
+
+    Attributes:
+        directory (str): The directory of the entries.
+        max_size (int): The total size of the entries kept, in bytes.
+        max_entries (int): The number of entries kept.
+        size (Optional[int]): The total size of the entries, as of the last
+            listing plus the entries stored since, or None before any listing.
+        entries (Optional[int]): The number of entries, counted the same way.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: int = DEFAULT_MAX_SIZE,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        Initializes a cache in a directory, created when an entry is stored.
+
+        Args:
+            directory (str): The directory of the entries.
+            max_size (int): The total size of the entries kept, in bytes.
+            max_entries (int): The number of entries kept.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self.size: Optional[int] = None
+        self.entries: Optional[int] = None
+
+    @classmethod
+    def for_file(cls, filename: Optional[str] = None) -> Optional["ASTCache"]:
+        """
+        Gets the cache of a source file.
+
+        The cache directory is the one set by the `LUNAE_CACHE_DIR`
+        environment variable, or a `__lunaecache__` directory next to the file.
+
+        Args:
+            filename (Optional[str]): The path of the source file, if any.
+
+        Returns:
+            Optional[ASTCache]: The cache, or None for a source with no file
+                when no directory is set.
+        """
+        directory = os.environ.get(CACHE_DIR_ENV)
+        if directory:
+            return cls(directory)
+        if filename is None:
+            return None
+        return cls(
+            os.path.join(os.path.dirname(os.path.abspath(filename)), CACHE_DIR_NAME)
+        )
+
+    def key(self, source: str) -> str:
+        """
+        Computes the key of a source.
+
+        Args:
+            source (str): The source code.
+
+        Returns:
+            str: The hexadecimal hash of the source, the version and the fingerprint.
+        """
+        digest = hashlib.sha256()
+        digest.update(key_prefix())
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        """
+        Gets the path of an entry.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            str: The path of the entry file.
+        """
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def load(self, source: str) -> Optional[Block]:
+        """
+        Loads the AST of a source, if it is cached.
+
+        An entry which cannot be read or decoded is removed.
+
+        Args:
+            source (str): The source code.
+
+        Returns:
+            Optional[Block]: The AST, or None on a miss.
+        """
+        key = self.key(source)
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        try:
+            if not data.startswith(MAGIC):
+                raise ValueError("Not a cache entry")
+            entry_key, records = marshal.loads(data[len(MAGIC) :])
+            if entry_key != key:
+                raise ValueError("Cache entry of another source")
+            ast = decode(records)
+            if not isinstance(ast, Block):
+                raise ValueError("Cache entry of a node")
+        except (ValueError, TypeError, EOFError, IndexError, KeyError, StopIteration):
+            self.remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return ast
+
+    def store(self, source: str, ast: Block):
+        """
+        Stores the AST of a source, then evicts entries beyond the limits.
+
+        The entry is written to a temporary file, then renamed. Failures to
+        write, for example in a read-only directory, are ignored. Entries
+        are only evicted when the estimated size or number of entries is
+        beyond its limit, or was never measured.
+
+        Args:
+            source (str): The source code.
+            ast (Block): Its AST, as parsed.
+        """
+        key = self.key(source)
+        data = MAGIC + marshal.dumps((key, encode(ast)))
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp = tempfile.mkstemp(suffix=TEMP_SUFFIX, dir=self.directory)
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp, self.path(key))
+        except OSError:
+            self.remove(temp)
+            return
+
+        if self.size is None or self.entries is None:
+            self.evict()
+            return
+        # Replacing an entry is counted as adding one, which only evicts sooner
+        self.size += len(data)
+        self.entries += 1
+        if self.size > self.max_size or self.entries > self.max_entries:
+            self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used entries until they are within the
+        limits, and the temporary files left by crashed writers.
+        """
+        entries: list[tuple[float, int, str]] = []
+        stale = time.time() - STALE_TEMP_AGE
+        try:
+            with os.scandir(self.directory) as scanned:
+                for entry in scanned:
+                    if entry.name.endswith(CACHE_SUFFIX):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    elif entry.name.endswith(TEMP_SUFFIX):
+                        try:
+                            if entry.stat().st_mtime < stale:
+                                self.remove(entry.path)
+                        except OSError:
+                            continue
+        except OSError:
+            return
+
+        size = sum(entry_size for _mtime, entry_size, _path in entries)
+        count = len(entries)
+        entries.sort()
+        for _mtime, entry_size, path in entries:
+            if size <= self.max_size and count <= self.max_entries:
+                break
+            self.remove(path)
+            size -= entry_size
+            count -= 1
+        self.size, self.entries = size, count
+
+    def remove(self, path: str):
+        """
+        Removes a file, which another process may have removed already.
+
+        Args:
+            path (str): The path of the file.
+        """
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def parse(self, source: str) -> Block:
+        """
+        Parses a source, through the cache.
+
+        Args:
+            source (str): The source code.
+
+        Returns:
+            Block: The root block of the parsed AST.
+
+        Raises:
+            TokenizerError: If a character starts no token.
+            ParserError: If the tokens do not form valid statements.
+        """
+        ast = self.load(source)
+        if ast is None:
+            ast = parse_reader(BufferReader(scan(source)))
+            self.store(source, ast)
+        return ast
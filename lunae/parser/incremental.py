@@ -0,0 +1,432 @@
+"""
+Provides incremental tokenizing and parsing of edited sources.
+
+A `Document` splits its source into segments, each starting with a top-level
+statement at the beginning of a line. At such a boundary no block is open
+and no string is pending, so each segment is tokenized and parsed as if it
+were a source of its own, with offsets relative to its start.
+
+When the source is edited, only the segments around the edit are tokenized
+and parsed again: from the segment before the edit, which a new `else` line
+may continue, to the first boundary after the edit where parsing falls back
+in step with the old segments. The other segments, with their tokens and
+statements, are reused as they are.
+
+The segments are grouped in chunks which know their length and number of
+lines, so the offset and line of a segment are found from the chunks, and
+an edit only rebuilds the chunks it touches: its cost depends on the edited
+region and on the number of chunks, not on the length of the source.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import accumulate, chain
+
+from lunae.language.ast.base.block import Block
+from lunae.language.ast.base.expr import Expr
+from lunae.parser.parsers.base.statement import parse_statement
+from lunae.parser.reader import BufferReader
+from lunae.tokenizer.buffer import TokenBuffer
+from lunae.tokenizer.grammar import TokenKind
+from lunae.tokenizer.scanner import scan
+from lunae.utils.errors import SourceError
+from lunae.utils.sourceposition import LineIndex
+
+
+@dataclass(frozen=True)
+class TextEdit:
+    """
+    Represents the replacement of a range of a source.
+
+    Attributes:
+        start (int): The offset of the first replaced character.
+        end (int): The offset just after the last replaced character.
+        text (str): The text replacing the range.
+    """
+
+    start: int
+    end: int
+    text: str = ""
+
+
+@dataclass(frozen=True)
+class Segment:
+    """
+    Represents top-level statements, with the blank lines and comments following them.
+
+    Attributes:
+        source (str): The source code of the segment.
+        tokens (TokenBuffer): The tokens of the segment, positioned relative to its start.
+        statements (tuple[Expr, ...]): The parsed statements.
+        lines (int): The number of line breaks in the source.
+    """
+
+    source: str
+    tokens: TokenBuffer
+    statements: tuple[Expr, ...]
+    lines: int
+
+
+def split_segments(source: str, line: int = 0) -> tuple[list[Segment], list[int]]:
+    """
+    Tokenizes and parses a source into segments.
+
+    Args:
+        source (str): The source code, starting at the beginning of a line.
+        line (int): The line number of the source, for error positions.
+
+    Returns:
+        tuple[list[Segment], list[int]]: The segments, and their offsets in the source.
+
+    Raises:
+        TokenizerError: If a character starts no token.
+        ParserError: If the tokens do not form valid statements.
+    """
+    tokens = scan(source, line)
+    reader = BufferReader(tokens)
+    offsets = [0]
+    firsts = [0]
+    groups: list[list[Expr]] = [[]]
+    while reader.peek():
+        if reader.match(TokenKind.NEWLINE):
+            continue
+        offset = tokens.starts[reader.pos]
+        if offset and source[offset - 1] == "\n":
+            offsets.append(offset)
+            firsts.append(reader.pos)
+            groups.append([])
+        groups[-1].append(parse_statement(reader))
+
+    offsets.append(len(source))
+    firsts.append(len(tokens))
+    segments = [
+        _segment(tokens, firsts[i], firsts[i + 1], offsets[i], offsets[i + 1], group)
+        for i, group in enumerate(groups)
+    ]
+    return segments, offsets[:-1]
+
+
+def _segment(
+    tokens: TokenBuffer, first: int, last: int, start: int, end: int, group: list[Expr]
+) -> Segment:
+    """
+    Copies a range of tokens into a segment of its own.
+    """
+    source = tokens.source[start:end]
+    buffer = TokenBuffer(source, LineIndex(source))
+    buffer.kinds = tokens.kinds[first:last]
+    buffer.starts = array("I", [offset - start for offset in tokens.starts[first:last]])
+    buffer.ends = array("I", [offset - start for offset in tokens.ends[first:last]])
+    return Segment(source, buffer, tuple(group), source.count("\n"))
+
+
+CHUNK_SIZE = 64
+"""
+int: The number of segments grouped in a chunk.
+"""
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """
+    Represents consecutive segments of a document.
+
+    Attributes:
+        segments (tuple[Segment, ...]): The segments, in order.
+        length (int): The number of characters of the segments.
+        lines (int): The number of line breaks in the segments.
+    """
+
+    segments: tuple[Segment, ...]
+    length: int
+    lines: int
+
+
+def make_chunks(segments: list[Segment]) -> list[Chunk]:
+    """
+    Groups segments in chunks of `CHUNK_SIZE`.
+
+    Args:
+        segments (list[Segment]): The segments, in order.
+
+    Returns:
+        list[Chunk]: The chunks.
+    """
+    chunks = []
+    for i in range(0, len(segments), CHUNK_SIZE):
+        group = tuple(segments[i : i + CHUNK_SIZE])
+        chunks.append(
+            Chunk(
+                group,
+                sum(len(segment.source) for segment in group),
+                sum(segment.lines for segment in group),
+            )
+        )
+    return chunks
+
+
+@dataclass(frozen=True)
+class Document:
+    """
+    Represents a parsed source, which can be edited incrementally.
+
+    Attributes:
+        chunks (tuple[Chunk, ...]): The segments of the source, in order, in chunks.
+    """
+
+    chunks: tuple[Chunk, ...]
+
+    @classmethod
+    def parse(cls, source: str) -> "Document":
+        """
+        Tokenizes and parses a whole source.
+
+        Args:
+            source (str): The source code.
+
+        Returns:
+            Document: The parsed document.
+
+        Raises:
+            TokenizerError: If a character starts no token.
+            ParserError: If the tokens do not form valid statements.
+        """
+        segments, _offsets = split_segments(source)
+        return cls(tuple(make_chunks(segments)))
+
+    @cached_property
+    def starts(self) -> list[int]:
+        """
+        Gets the offset of each chunk in the source.
+
+        Returns:
+            list[int]: The offsets, the first being 0.
+        """
+        return list(accumulate((chunk.length for chunk in self.chunks[:-1]), initial=0))
+
+    @cached_property
+    def firsts(self) -> list[int]:
+        """
+        Gets the index of the first segment of each chunk.
+
+        Returns:
+            list[int]: The indices, the first being 0.
+        """
+        return list(
+            accumulate((len(chunk.segments) for chunk in self.chunks[:-1]), initial=0)
+        )
+
+    @cached_property
+    def lines(self) -> list[int]:
+        """
+        Gets the line number where each chunk starts.
+
+        Returns:
+            list[int]: The line numbers, the first being 0.
+        """
+        return list(accumulate((chunk.lines for chunk in self.chunks[:-1]), initial=0))
+
+    @property
+    def count(self) -> int:
+        """
+        Gets the number of segments.
+
+        Returns:
+            int: The number of segments of all chunks.
+        """
+        return self.firsts[-1] + len(self.chunks[-1].segments)
+
+    @property
+    def length(self) -> int:
+        """
+        Gets the length of the source.
+
+        Returns:
+            int: The number of characters of all chunks.
+        """
+        return self.starts[-1] + self.chunks[-1].length
+
+    @cached_property
+    def segments(self) -> list[Segment]:
+        """
+        Gets the segments of the source.
+
+        Returns:
+            list[Segment]: The segments of all chunks, in order.
+        """
+        return list(chain.from_iterable(chunk.segments for chunk in self.chunks))
+
+    @cached_property
+    def offsets(self) -> list[int]:
+        """
+        Gets the offset of each segment in the source.
+
+        Returns:
+            list[int]: The offsets, the first being 0.
+        """
+        return list(accumulate((len(s.source) for s in self.segments[:-1]), initial=0))
+
+    @cached_property
+    def source(self) -> str:
+        """
+        Gets the source code.
+
+        Returns:
+            str: The sources of the segments, joined.
+        """
+        return "".join(segment.source for segment in self.segments)
+
+    @cached_property
+    def ast(self) -> Block:
+        """
+        Gets the root block of the parsed AST.
+
+        Returns:
+            Block: The statements of all segments.
+        """
+        return Block([stmt for segment in self.segments for stmt in segment.statements])
+
+    @cached_property
+    def tokens(self) -> TokenBuffer:
+        """
+        Gets the tokens of the whole source, joining those of the segments.
+
+        Returns:
+            TokenBuffer: The tokens, equal to those of `tokenize` on the source.
+        """
+        tokens = TokenBuffer(self.source, LineIndex(self.source))
+        for offset, segment in zip(self.offsets, self.segments):
+            tokens.extend(segment.tokens, offset)
+        return tokens
+
+    def locate(self, offset: int, after: bool = False) -> int:
+        """
+        Finds the first segment starting at an offset, like `bisect_left` on the offsets.
+
+        Args:
+            offset (int): The offset in the source.
+            after (bool): Whether to find the first segment starting after
+                the offset instead, like `bisect_right`.
+
+        Returns:
+            int: The index of the segment, or the number of segments if none.
+        """
+        index = bisect_right(self.starts, offset) - 1
+        chunk = self.chunks[index]
+        offsets = list(
+            accumulate(
+                (len(segment.source) for segment in chunk.segments[:-1]),
+                initial=self.starts[index],
+            )
+        )
+        bisect = bisect_right if after else bisect_left
+        return self.firsts[index] + bisect(offsets, offset)
+
+    def span(self, first: int, last: int) -> tuple[list[Segment], int, int]:
+        """
+        Gets a range of segments, with the offset and line where it starts.
+
+        Args:
+            first (int): The index of the first segment.
+            last (int): The index just after the last segment.
+
+        Returns:
+            tuple[list[Segment], int, int]: The segments, and the offset and
+            line number of the first one.
+        """
+        index = bisect_right(self.firsts, first) - 1
+        offset, line = self.starts[index], self.lines[index]
+        position = first - self.firsts[index]
+        for segment in self.chunks[index].segments[:position]:
+            offset += len(segment.source)
+            line += segment.lines
+
+        segments: list[Segment] = []
+        while len(segments) < last - first:
+            chunk = self.chunks[index].segments
+            segments.extend(chunk[position : position + last - first - len(segments)])
+            index, position = index + 1, 0
+        return segments, offset, line
+
+    def replace(self, first: int, last: int, segments: list[Segment]) -> "Document":
+        """
+        Replaces a range of segments, rebuilding only the chunks holding it.
+
+        Args:
+            first (int): The index of the first replaced segment.
+            last (int): The index just after the last replaced segment.
+            segments (list[Segment]): The new segments.
+
+        Returns:
+            Document: The document with the new segments, sharing the other chunks.
+        """
+        low = bisect_right(self.firsts, first) - 1
+        high = (
+            bisect_right(self.firsts, max(last - 1, first))
+            if last < self.count
+            else len(self.chunks)
+        )
+        base = self.firsts[low]
+        old = list(
+            chain.from_iterable(chunk.segments for chunk in self.chunks[low:high])
+        )
+        new = old[: first - base] + segments + old[last - base :]
+        return Document(
+            self.chunks[:low] + tuple(make_chunks(new)) + self.chunks[high:]
+        )
+
+    def edit(self, edit: TextEdit) -> "Document":
+        """
+        Applies an edit, tokenizing and parsing again only the segments it affects.
+
+        The segments are parsed again from the one before the edit. Their end
+        is pushed further, by doubling the number of old segments included,
+        until a new segment starts where an old one did, or until the end of
+        the source if the edit leaves an unterminated statement or string.
+
+        Args:
+            edit (TextEdit): The edit to apply.
+
+        Returns:
+            Document: The edited document, sharing the unaffected segments.
+
+        Raises:
+            TokenizerError: If a character starts no token.
+            ParserError: If the edited tokens do not form valid statements.
+        """
+        delta = len(edit.text) - (edit.end - edit.start)
+        count = self.count
+
+        low = max(self.locate(edit.start, after=True) - 2, 0)
+        high = self.locate(edit.end)
+
+        stop = high + 1
+        while True:
+            old, start, line = self.span(low, min(stop, count))
+            region = "".join(segment.source for segment in old)
+            region = (
+                region[: edit.start - start] + edit.text + region[edit.end - start :]
+            )
+            try:
+                segments, starts = split_segments(region, line)
+            except SourceError:
+                if stop >= count:
+                    raise
+                # A statement or a string may go on past the end
+                segments, starts = [], []
+            if stop >= count:
+                return self.replace(low, count, segments)
+
+            offset = start
+            offsets = []
+            for segment in old:
+                offsets.append(offset)
+                offset += len(segment.source)
+            for reused in range(high, stop):
+                target = offsets[reused - low] + delta - start
+                index = bisect_left(starts, target)
+                if index < len(starts) and starts[index] == target:
+                    return self.replace(low, reused, segments[:index])
+            stop = min(high + 2 * (stop - high), count)
@@ -0,0 +1,77 @@
+"""
+Provides the parallel parser, tokenizing and parsing large sources across processes.
+
+The source is cut as for `lunae.tokenizer.parallel.tokenize_parallel`, and
+each piece is tokenized and parsed in a worker process. A cut before a line
+starting with a name can only end a statement which is complete, so the
+statements of the pieces, in order, are those of the whole source.
+
+If a piece fails to tokenize or to parse, because a cut fell inside a
+string or the source is invalid, the whole source is parsed again in the
+current process, which reports any real error.
+"""
+
+from concurrent.futures import Executor
+from typing import Optional
+
+from lunae.language.ast.base.block import Block
+from lunae.language.ast.base.expr import Expr
+from lunae.parser.parsers.base.block import parse_reader
+from lunae.parser.reader import BufferReader
+from lunae.tokenizer.parallel import DEFAULT_CHUNK_SIZE, map_pieces, split_source
+from lunae.tokenizer.scanner import scan
+from lunae.utils.errors import SourceError
+
+
+def parse_piece(source: str, line: int) -> list[Expr]:
+    """
+    Tokenizes and parses a piece of source code, starting at the beginning of a line.
+
+    Args:
+        source (str): The piece of source code.
+        line (int): The line number of the piece.
+
+    Returns:
+        list[Expr]: The statements of the piece.
+
+    Raises:
+        TokenizerError: If a character starts no token.
+        ParserError: If the tokens do not form valid statements.
+    """
+    return parse_reader(BufferReader(scan(source, line))).statements
+
+
+def parse_parallel(
+    source: str,
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Block:
+    """
+    Tokenizes and parses the given source code in worker processes.
+
+    The AST is the same as that of `parse(tokenize(source))`. Sources shorter
+    than `chunk_size` are parsed in the current process.
+
+    Args:
+        source (str): The source code as a string.
+        executor (Optional[Executor]): The executor to use, or None to start one.
+        workers (Optional[int]): The number of processes started, by default one per CPU.
+        chunk_size (int): The number of characters from which a piece is cut.
+
+    Returns:
+        Block: The root block of the parsed AST.
+
+    Raises:
+        TokenizerError: If a character starts no token.
+        ParserError: If the tokens do not form valid statements.
+    """
+    cuts = split_source(source, chunk_size)
+    if len(cuts) > 1:
+        try:
+            pieces = map_pieces(parse_piece, source, cuts, executor, workers)
+        except SourceError:
+            pass
+        else:
+            return Block([statement for piece in pieces for statement in piece])
+    return parse_reader(BufferReader(scan(source)))
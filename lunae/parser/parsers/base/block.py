@@ -3,10 +3,10 @@ This module provides functionality for parsing blocks of statements or expressio
 Blocks can be multi-line (indented) or single-line.
 """
 
+from typing import Iterator
+
 from lunae.language.ast.base.block import Block
 from lunae.language.ast.base.expr import Expr
-from lunae.parser.parsers.base.expr import parse_expr
-from lunae.parser.parsers.base.statement import parse_statement
 from lunae.parser.reader import ParserReader
 from lunae.tokenizer.grammar import TokenKind
 
@@ -49,9 +49,29 @@ def parse_reader(reader: ParserReader) -> Block:
     Returns:
         Block: The parsed block of statements.
     """
-    statements: list[Expr] = []
+    return Block(list(iter_statements(reader)))
+
+
+def iter_statements(reader: ParserReader) -> Iterator[Expr]:
+    """
+    Parses the top-level statements from the reader, one at a time.
+
+    Each statement is parsed only when the previous one has been consumed,
+    so tokens produced lazily are only read as far as it needs.
+
+    Args:
+        reader (ParserReader): The parser reader instance.
+
+    Yields:
+        Expr: The parsed statements, in order.
+    """
     while reader.peek():
         if reader.match(TokenKind.NEWLINE):
             continue
-        statements.append(parse_statement(reader))
-    return Block(statements)
+        yield parse_statement(reader)
+
+
+# Imported last, since the parsers of statements parse nested blocks
+# pylint: disable=wrong-import-position,cyclic-import
+from lunae.parser.parsers.base.expr import parse_expr  # noqa: E402
+from lunae.parser.parsers.base.statement import parse_statement  # noqa: E402
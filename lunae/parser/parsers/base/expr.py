@@ -15,12 +15,15 @@ def parse_expr(reader: ParserReader) -> Expr:
     Returns:
         Expr: The parsed expression.
     """
-    from lunae.parser.parsers.operations.binary import parse_binary
-    from lunae.parser.parsers.values.assign import parse_assign
-
     # Assignment vs binary
     if reader.is_followed(TokenKind.IDENT) and reader.is_followed(
         TokenKind.ASSIGN, offset=1
     ):
         return parse_assign(reader)
     return parse_binary(reader)
+
+
+# Imported last, since the parsers of operands parse nested expressions
+# pylint: disable=wrong-import-position,cyclic-import
+from lunae.parser.parsers.operations.binary import parse_binary  # noqa: E402
+from lunae.parser.parsers.values.assign import parse_assign  # noqa: E402
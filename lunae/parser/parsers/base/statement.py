@@ -5,6 +5,7 @@ Statements can include function definitions or expressions.
 
 from lunae.language.ast.base.expr import Expr
 from lunae.parser.parsers.base.expr import parse_expr
+from lunae.parser.parsers.functions.funcdef import parse_func_def
 from lunae.parser.reader import ParserReader
 from lunae.tokenizer.grammar import TokenKind
 
@@ -19,10 +20,10 @@ def parse_statement(reader: ParserReader) -> Expr:
     Returns:
         Expr: The parsed expr.
     """
-    from lunae.parser.parsers.functions.funcdef import parse_func_def
-
     # Function definition
-    if reader.is_followed(TokenKind.KEYWORD, "func"):
+    if reader.is_followed(TokenKind.KEYWORD, "func") or reader.is_followed(
+        TokenKind.KEYWORD, "memo"
+    ):
         return parse_func_def(reader)
     expr = parse_expr(reader)
     reader.match(TokenKind.NEWLINE)
@@ -2,6 +2,8 @@
 This module provides functionality for parsing for expressions.
 """
 
+import sys
+
 from lunae.language.ast.controls.forexpr import ForExpr
 from lunae.parser.parsers.base.block import parse_block
 from lunae.parser.parsers.base.expr import parse_expr
@@ -20,7 +22,7 @@ def parse_for_expr(reader: ParserReader) -> ForExpr:
         ForExpr: The parsed for expression.
     """
     reader.expect(TokenKind.KEYWORD, "for")
-    var = reader.expect(TokenKind.IDENT).match
+    var = sys.intern(reader.expect(TokenKind.IDENT).match)
     reader.expect(TokenKind.KEYWORD, "in")
     iterable = parse_expr(reader)
     reader.expect(TokenKind.COLON)
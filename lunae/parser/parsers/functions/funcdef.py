@@ -2,6 +2,8 @@
 This module provides the parser for function definitions.
 """
 
+import sys
+
 from lunae.language.ast.functions.funcdef import FuncDef
 from lunae.parser.parsers.base.block import parse_block
 from lunae.parser.reader import ParserReader
@@ -10,7 +12,7 @@ from lunae.tokenizer.grammar import TokenKind
 
 def parse_func_def(reader: ParserReader) -> FuncDef:
     """
-    Parses a function definition.
+    Parses a function definition, optionally prefixed by `memo`.
 
     Args:
         reader (ParserReader): The parser reader.
@@ -18,14 +20,15 @@ def parse_func_def(reader: ParserReader) -> FuncDef:
     Returns:
         FuncDef: The parsed function definition node.
     """
+    memoized = reader.match(TokenKind.KEYWORD, "memo") is not None
     reader.expect(TokenKind.KEYWORD, "func")
     name_token = reader.match(TokenKind.IDENT)
-    name = name_token.match if name_token else None
+    name = sys.intern(name_token.match) if name_token else None
     reader.expect(TokenKind.LPAREN)
     params: list[tuple[str, str]] = []
     if not reader.match(TokenKind.RPAREN):
         while True:
-            param_name = reader.expect(TokenKind.IDENT).match
+            param_name = sys.intern(reader.expect(TokenKind.IDENT).match)
             if reader.match(TokenKind.COLON):
                 param_type = reader.expect(TokenKind.IDENT).match
             else:
@@ -38,4 +41,4 @@ def parse_func_def(reader: ParserReader) -> FuncDef:
             reader.expect(TokenKind.COMMA)
 
     reader.expect(TokenKind.COLON)
-    return FuncDef(name, params, parse_block(reader))
+    return FuncDef(name, params, parse_block(reader), memoized)
@@ -5,32 +5,52 @@ This module provides functionality for parsing binary operations.
 from lunae.language.ast.base.expr import Expr
 from lunae.language.ast.functions.funccall import FuncCall
 from lunae.language.ast.values.var import Var
-from lunae.language.syntax import BINARY_OPERATORS
+from lunae.language.syntax import BINARY_OPERATORS, Operator
 from lunae.parser.parsers.operations.unary import parse_unary
 from lunae.parser.reader import ParserReader
 from lunae.tokenizer.grammar import TokenKind
 
 
-def parse_binary(reader: ParserReader, min_prec: int = 0) -> FuncCall | Expr:
+def parse_binary(reader: ParserReader) -> FuncCall | Expr:
     """
-    Parses a binary operation using precedence climbing.
+    Parses a chain of binary operations, with operator precedence.
+
+    Operands and pending operators are kept on stacks, so that chains of any
+    length are parsed in a loop. Before an operator is pushed, the pending
+    operators of higher or equal priority are applied, so operators of
+    higher priority bind tighter and equal ones associate to the left.
 
     Args:
         reader (ParserReader): The parser reader instance.
-        min_prec (int, optional): The minimum precedence for the operation. Defaults to 0.
 
     Returns:
-        FuncCall: The parsed binary operation.
+        FuncCall | Expr: The parsed binary operation, or the single operand.
     """
-    left = parse_unary(reader)
+    operands: list[Expr] = [parse_unary(reader)]
+    operators: list[Operator] = []
     while True:
         tok = reader.peek()
-        if not tok or tok.kind != TokenKind.OP:
+        if not tok or tok.kind != TokenKind.OP or tok.match not in BINARY_OPERATORS:
             break
         op = BINARY_OPERATORS[tok.match]
-        if op.priority < min_prec:
-            break
         reader.next()
-        right = parse_binary(reader, min_prec + 1)
-        left = FuncCall(Var(op.function), [left, right])
-    return left
+        while operators and operators[-1].priority >= op.priority:
+            apply_operator(operands, operators.pop())
+        operators.append(op)
+        operands.append(parse_unary(reader))
+
+    while operators:
+        apply_operator(operands, operators.pop())
+    return operands[0]
+
+
+def apply_operator(operands: list[Expr], op: Operator):
+    """
+    Replaces the last two operands by the operation combining them.
+
+    Args:
+        operands (list[Expr]): The operand stack.
+        op (Operator): The binary operator.
+    """
+    right = operands.pop()
+    operands[-1] = FuncCall(Var(op.function), [operands[-1], right])
@@ -5,7 +5,7 @@ This module provides functionality for parsing unary operations.
 from lunae.language.ast.base.expr import Expr
 from lunae.language.ast.functions.funccall import FuncCall
 from lunae.language.ast.values.var import Var
-from lunae.language.syntax import UNARY_OPERATORS
+from lunae.language.syntax import UNARY_OPERATORS, Operator
 from lunae.parser.parsers.base.primary import parse_primary
 from lunae.parser.reader import ParserReader
 from lunae.tokenizer.grammar import TokenKind
@@ -13,7 +13,7 @@ from lunae.tokenizer.grammar import TokenKind
 
 def parse_unary(reader: ParserReader) -> FuncCall | Expr:
     """
-    Parses a unary operation or a primary expression.
+    Parses a primary expression, with the unary operations before it.
 
     Args:
         reader (ParserReader): The parser reader instance.
@@ -21,10 +21,15 @@ def parse_unary(reader: ParserReader) -> FuncCall | Expr:
     Returns:
         FuncCall | Expr: The parsed unary operation or primary expression.
     """
-    tok = reader.peek()
-    if tok and tok.kind == TokenKind.OP and tok.match in UNARY_OPERATORS:
-        op = UNARY_OPERATORS[tok.match]
+    operators: list[Operator] = []
+    while True:
+        tok = reader.peek()
+        if not tok or tok.kind != TokenKind.OP or tok.match not in UNARY_OPERATORS:
+            break
+        operators.append(UNARY_OPERATORS[tok.match])
         reader.next()
-        operand = parse_unary(reader)
-        return FuncCall(Var(op.function), [operand])
-    return parse_primary(reader)
+
+    operand = parse_primary(reader)
+    for op in reversed(operators):
+        operand = FuncCall(Var(op.function), [operand])
+    return operand
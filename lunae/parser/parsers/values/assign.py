@@ -2,6 +2,8 @@
 This module provides functionality for parsing assignment expressions.
 """
 
+import sys
+
 from lunae.language.ast.values.assign import Assign
 from lunae.parser.parsers.base.expr import parse_expr
 from lunae.parser.reader import ParserReader
@@ -18,7 +20,7 @@ def parse_assign(reader: ParserReader) -> Assign:
     Returns:
         Assign: The parsed assignment expression.
     """
-    name = reader.expect(TokenKind.IDENT).match
+    name = sys.intern(reader.expect(TokenKind.IDENT).match)
     reader.expect(TokenKind.ASSIGN)
     value = parse_expr(reader)
     return Assign(name, value)
@@ -2,6 +2,7 @@
 This module provides functionality for parsing variables and function calls.
 """
 
+import sys
 from ast import Expr
 
 from lunae.language.ast.functions.funccall import FuncCall
@@ -21,6 +22,6 @@ def parse_var(reader: ParserReader) -> Var | FuncCall:
     Returns:
         Var | FuncCall: The parsed variable or function call.
     """
-    name = reader.expect(TokenKind.IDENT).match
+    name = sys.intern(reader.expect(TokenKind.IDENT).match)
 
     return parse_func_call(reader, Var(name))
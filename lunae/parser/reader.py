@@ -2,30 +2,45 @@
 Handles reading and interpreting tokens for parsing.
 """
 
-from typing import Optional
+from collections import deque
+from typing import Iterable, Optional
 
-from lunae.tokenizer.grammar import TokenKind
+from lunae.tokenizer.buffer import TokenBuffer
+from lunae.tokenizer.grammar import TOKEN_CODES, TokenKind
 from lunae.tokenizer.token import Token
 from lunae.utils.errors import ParserError
 
+LOOKAHEAD = 2
+"""
+int: The number of tokens the parser may peek at, from the current one.
+"""
+
 
 class ParserReader:
     """
     A utility class for reading and processing tokens during parsing.
 
+    Tokens are pulled from their source as they are peeked at, so that a
+    lazily tokenized source is parsed while it is read. Only the tokens
+    within the lookahead are kept.
+
     Attributes:
-        tokens (list[Token]): The list of tokens to process.
-        pos (int): The current position in the token list.
+        tokens (Iterator[Token]): The tokens left to read.
+        buffer (deque[Token]): The tokens already pulled, from the current one.
+        pos (int): The number of tokens read so far.
     """
 
-    def __init__(self, tokens: list[Token]):
-        self.tokens = tokens
+    def __init__(self, tokens: Iterable[Token]):
+        self.tokens = iter(tokens)
+        self.buffer: deque[Token] = deque()
         self.pos = 0
 
     def next(self):
         """
         Advances the reader to the next token.
         """
+        if self.buffer or self.peek():
+            self.buffer.popleft()
         self.pos += 1
 
     def peek(self, offset: int = 0) -> Optional[Token]:
@@ -33,13 +48,19 @@ class ParserReader:
         Peeks at a token at a given offset from the current position.
 
         Args:
-            offset (int): The offset from the current position.
+            offset (int): The offset from the current position, lower than `LOOKAHEAD`.
 
         Returns:
             Optional[Token]: The token at the given offset, or None if out of bounds.
         """
-        idx = self.pos + offset
-        return self.tokens[idx] if idx < len(self.tokens) else None
+        assert offset < LOOKAHEAD, "Peeking beyond the lookahead"
+        buffer = self.buffer
+        while len(buffer) <= offset:
+            token = next(self.tokens, None)
+            if token is None:
+                return None
+            buffer.append(token)
+        return buffer[offset]
 
     def is_followed(self, kind: TokenKind, match: str | None = None, offset: int = 0):
         """
@@ -97,3 +118,92 @@ class ParserReader:
                 actual.end if actual else None,
             )
         return tok
+
+
+class BufferReader(ParserReader):
+    """
+    A parser reader over a `TokenBuffer`, reading it by index.
+
+    Kinds are compared as integer codes, and `Token` objects are only created
+    for the tokens which are returned.
+
+    Attributes:
+        token_buffer (TokenBuffer): The tokens to process.
+        pos (int): The index of the current token.
+    """
+
+    def __init__(self, tokens: TokenBuffer):  # pylint: disable=super-init-not-called
+        self.token_buffer = tokens
+        self.kinds = tokens.kinds
+        self.pos = 0
+        self.cached: Optional[Token] = None
+        self.cached_pos = -1
+
+    def next(self):
+        """
+        Advances the reader to the next token.
+        """
+        self.pos += 1
+
+    def peek(self, offset: int = 0) -> Optional[Token]:
+        """
+        Peeks at a token at a given offset from the current position.
+
+        The last token created is kept, since the parser peeks at the current
+        token several times before consuming it.
+
+        Args:
+            offset (int): The offset from the current position.
+
+        Returns:
+            Optional[Token]: The token at the given offset, or None if out of bounds.
+        """
+        idx = self.pos + offset
+        if idx == self.cached_pos:
+            return self.cached
+        if idx >= len(self.kinds):
+            return None
+        self.cached = self.token_buffer.token(idx)
+        self.cached_pos = idx
+        return self.cached
+
+    def is_followed(self, kind: TokenKind, match: str | None = None, offset: int = 0):
+        """
+        Checks if a token of a specific kind and value follows at a given offset.
+
+        Args:
+            kind (TokenKind): The kind of token to check.
+            match (str | None): The value of the token to check, if any.
+            offset (int): The offset from the current position.
+
+        Returns:
+            bool: True if the token matches, False otherwise.
+        """
+        idx = self.pos + offset
+        return (
+            idx < len(self.kinds)
+            and self.kinds[idx] == TOKEN_CODES[kind]
+            and (match is None or self.token_buffer.match(idx) == match)
+        )
+
+    def match(self, kind: TokenKind, value: str | None = None) -> Optional[Token]:
+        """
+        Matches the current token against a specific kind and value.
+
+        Args:
+            kind (TokenKind): The kind of token to match.
+            value (str | None): The value of the token to match, if any.
+
+        Returns:
+            Optional[Token]: The matched token, or None if no match.
+        """
+        idx = self.pos
+        if (
+            idx >= len(self.kinds)
+            or self.kinds[idx] != TOKEN_CODES[kind]
+            or (value is not None and self.token_buffer.match(idx) != value)
+        ):
+            return None
+        tok = self.cached if idx == self.cached_pos else self.token_buffer.token(idx)
+        self.pos = idx + 1
+        return tok
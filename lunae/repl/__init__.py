@@ -3,30 +3,17 @@ The `lunae.repl` module provides an interactive Read-Eval-Print Loop (REPL) for
 """
 
 import traceback
-from importlib.metadata import PackageNotFoundError, version
 from os import path
 from textwrap import dedent
+from typing import Optional
 
 from lunae.interpreter import Interpreter, create_global_env
 from lunae.parser import parse
+from lunae.parser.cache import ASTCache
 from lunae.tokenizer import tokenize
 from lunae.utils.errors import SourceError
 from lunae.utils.indent import indent
-
-
-def get_version() -> str:
-    """
-    Fetch the installed lunae version.
-    """
-    try:
-        return version("lunae")
-    except PackageNotFoundError:
-        try:
-            version_file_path = path.join(path.dirname(__file__), "..", "..", "VERSION")
-            with open(version_file_path, encoding="utf-8") as f:
-                return f.read().strip()
-        except FileNotFoundError:
-            return "unknown"
+from lunae.utils.version import get_version
 
 
 class REPL:
@@ -52,18 +39,19 @@ class REPL:
         print(f"LUNAE {v} - REPL")
         print('Type "help()" for more information')
 
-    def eval(self, source: str):
+    def eval(self, source: str, cache: Optional[ASTCache] = None):
         """
         Evaluates a source code string.
 
         Args:
             source (str): The source code to evaluate.
+            cache (Optional[ASTCache]): The cache of parsed sources to use, if any.
         """
         try:
-            ast = parse(tokenize(source))
+            ast = cache.parse(source) if cache is not None else parse(tokenize(source))
             result = None
             for child in ast.statements:
-                result = self.interpreter.eval(child)
+                result = self.interpreter.eval(self.interpreter.analyze(child))
                 formated = indent(result, ". ").replace(". ", "> ", 1)
                 print(formated)
         except Exception as e:  # pylint: disable=broad-exception-caught
@@ -89,7 +77,7 @@ class REPL:
         with open(filename, encoding="utf-8") as f:
             source = f.read()
             try:
-                self.eval(source)
+                self.eval(source, ASTCache.for_file(filename))
             except SourceError as e:
                 e.with_source(source)
                 raise e
@@ -133,7 +121,7 @@ class REPL:
         else:
             functions = []
             others = []
-            for name, env_var in self.interpreter.global_env.vars.items():
+            for name, env_var in self.interpreter.global_env.values.items():
                 if callable(env_var):
                     functions.append(f"{name.ljust(15)} - {env_var.__qualname__}")
                 else:
@@ -154,19 +142,19 @@ class REPL:
         env = create_global_env()
 
         # REPL
-        env.define("load", self.load)
-        env.define("quit", self.quit)
-        env.define("debug", self.debug)
-        env.define("reset", self.reset)
-        env.define("help", self.help)
+        env.define_function("load", self.load)
+        env.define_function("quit", self.quit)
+        env.define_function("debug", self.debug)
+        env.define_function("reset", self.reset)
+        env.define_function("help", self.help)
 
         # DEBUG
-        env.define("tokenize", tokenize)
-        env.define("parse", parse)
+        env.define_function("tokenize", tokenize)
+        env.define_function("parse", parse)
 
         # OTHERS
-        env.define("print", self.print)
-        env.define("range", lambda n: list(range(int(n))))
+        env.define_function("print", self.print)
+        env.define_function("range", lambda n: list(range(int(n))))
 
         self.interpreter.global_env = env
 
@@ -2,66 +2,24 @@
 The `lunae.tokenizer` package provides tools for tokenizing input data, including grammar definitions, token readers, and token representations.
 """
 
-from lunae.language.syntax import KEYWORDS
-from lunae.tokenizer.grammar import TokenKind
-from lunae.tokenizer.reader import TokenizerReader
+from lunae.tokenizer.buffer import TokenBuffer
+from lunae.tokenizer.parallel import tokenize_parallel
+from lunae.tokenizer.scanner import scan
+from lunae.tokenizer.stream import tokenize_stream
 from lunae.tokenizer.token import Token
 
 
-def tokenize(source: str) -> list[Token]:
+def tokenize(source: str) -> TokenBuffer:
     """
-    Tokenizes the given source code into a list of tokens.
+    Tokenizes the given source code into a sequence of tokens.
 
     Args:
         source (str): The source code as a string.
 
     Returns:
-        list[Token]: A list of tokens extracted from the source code.
+        TokenBuffer: The tokens extracted from the source code, stored compactly.
     """
-    reader = TokenizerReader(source)
-    tokens: list[Token] = []
-    indent_stack = [0]
+    return scan(source)
 
-    while not reader.is_end_of_file:
-        if reader.is_new_line:
-            token = reader.read_indentation()
-            indent_level = len(token.match.replace("\t", "    "))
 
-            if not reader.is_end_of_line:  # Non-empty line
-                if indent_level > indent_stack[-1]:
-                    indent_stack.append(indent_level)
-                    tokens.append(
-                        Token(
-                            TokenKind.INDENT,
-                            token.match,
-                            token.start,
-                            token.end,
-                        )
-                    )
-                while indent_level < indent_stack[-1]:
-                    indent_stack.pop()
-                    tokens.append(
-                        Token(
-                            TokenKind.DEDENT,
-                            token.match,
-                            token.start,
-                            token.end,
-                        )
-                    )
-            if reader.is_end_of_file:
-                break
-
-        token = reader.read_token()
-        if token.kind == TokenKind.IDENT and token.match in KEYWORDS:
-            token.kind = TokenKind.KEYWORD
-        if token.kind not in (TokenKind.WHITESPACE, TokenKind.COMMENT):
-            tokens.append(token)
-
-    while indent_stack:
-        if indent_stack.pop() != 0:
-            tokens.append(Token(TokenKind.DEDENT, "", reader.start, reader.end))
-
-    return tokens
-
-
-__all__ = ("tokenize",)
+__all__ = ("tokenize", "tokenize_parallel", "tokenize_stream")
@@ -0,0 +1,130 @@
+"""
+Provides the token buffer, a compact storage for the tokens of a source.
+
+Instead of one `Token` object per token, the buffer keeps parallel arrays: the
+kind codes as bytes, and the start and end offsets as unsigned integers. The
+matched text is sliced from the source, and `Token` objects are only created
+when a token is read through the sequence interface.
+"""
+
+from array import array
+from typing import Iterator, Sequence, overload
+
+from lunae.tokenizer.grammar import TOKEN_KINDS
+from lunae.tokenizer.token import Token
+from lunae.utils.sourceposition import LineIndex
+
+
+class TokenBuffer(Sequence[Token]):
+    """
+    A sequence of tokens stored as arrays.
+
+    Attributes:
+        source (str): The source code the tokens come from.
+        lines (LineIndex): The line index of the source.
+        kinds (array): The kind code of each token, see `TOKEN_CODES`.
+        starts (array): The offset of each token in the source.
+        ends (array): The offset just after each token.
+    """
+
+    def __init__(self, source: str, lines: LineIndex):
+        """
+        Initializes an empty buffer.
+
+        Args:
+            source (str): The source code the tokens come from.
+            lines (LineIndex): The line index of the source.
+        """
+        self.source = source
+        self.lines = lines
+        self.kinds = array("B")
+        self.starts = array("I")
+        self.ends = array("I")
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    @overload
+    def __getitem__(self, index: int) -> Token: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Token]: ...
+
+    def __getitem__(self, index: int | slice) -> Token | list[Token]:
+        """
+        Creates the token at an index, or the tokens of a slice.
+        """
+        if isinstance(index, slice):
+            return [self.token(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("token index out of range")
+        return self.token(index)
+
+    def __iter__(self) -> Iterator[Token]:
+        return map(self.token, range(len(self)))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def token(self, index: int) -> Token:
+        """
+        Creates the token at an index.
+
+        Args:
+            index (int): The index of the token.
+
+        Returns:
+            Token: The token, whose positions are computed when read.
+        """
+        start = self.starts[index]
+        end = self.ends[index]
+        return Token.at(
+            TOKEN_KINDS[self.kinds[index]],
+            self.source[start:end],
+            start,
+            end,
+            self.lines,
+        )
+
+    def match(self, index: int) -> str:
+        """
+        Gets the matched text of a token, without creating it.
+
+        Args:
+            index (int): The index of the token.
+
+        Returns:
+            str: The matched text.
+        """
+        return self.source[self.starts[index] : self.ends[index]]
+
+    def extend(self, tokens: "TokenBuffer", offset: int):
+        """
+        Appends the tokens of a piece of this buffer's source.
+
+        Args:
+            tokens (TokenBuffer): The tokens of the piece, with offsets relative to it.
+            offset (int): The offset of the piece in this buffer's source.
+        """
+        self.kinds.extend(tokens.kinds)
+        self.starts.extend(array("I", [start + offset for start in tokens.starts]))
+        self.ends.extend(array("I", [end + offset for end in tokens.ends]))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Gets the memory used by the arrays, not counting the source.
+
+        Returns:
+            int: The size of the arrays, in bytes.
+        """
+        return sum(a.itemsize * len(a) for a in (self.kinds, self.starts, self.ends))
@@ -5,6 +5,8 @@ Attributes:
     TOKEN_TYPES (list[tuple[str, str]]): A list of token types and their regex patterns.
     COMPILED_TOKEN_REGEX (re.Pattern): A compiled regex pattern for all token types.
     COMILED_INDENT_REGEX (re.Pattern): A compiled regex pattern for indentation.
+    TOKEN_KINDS (tuple[TokenKind, ...]): The token kinds, indexed by their code.
+    TOKEN_CODES (dict[TokenKind, int]): The code of each token kind.
 """
 
 import re
@@ -43,6 +45,9 @@ class TokenKind(Enum):
     def __repr__(self):
         return f"TokenKind.{self.name}"
 
+    # Members are singletons: hashing by identity keeps dict lookups in C.
+    __hash__ = object.__hash__
+
 
 COMPILED_TOKEN_REGEX = re.compile(
     "|".join(
@@ -52,3 +57,13 @@ COMPILED_TOKEN_REGEX = re.compile(
     )
 )
 COMILED_INDENT_REGEX = re.compile(r"[ \t]*")
+
+TOKEN_KINDS = tuple(TokenKind)
+"""
+tuple[TokenKind, ...]: The token kinds, indexed by their code in token buffers.
+"""
+
+TOKEN_CODES = {kind: code for code, kind in enumerate(TOKEN_KINDS)}
+"""
+dict[TokenKind, int]: The code of each token kind in token buffers.
+"""
@@ -0,0 +1,122 @@
+"""
+Provides the parallel tokenizer, splitting large sources across processes.
+
+Top-level statements start at column 0, with no block open. A source is cut
+before some of the lines starting with a name, other than `else` which
+continues an `if`, and each piece is tokenized in a worker process with the
+line number where it starts.
+
+A cut may still fall inside a multi-line string. The piece before it then
+ends with an unterminated string, which fails to tokenize, and the whole
+source is tokenized again in a single pass, which reports any real error.
+"""
+
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import accumulate
+from typing import Callable, Optional, TypeVar
+
+from lunae.tokenizer.buffer import TokenBuffer
+from lunae.tokenizer.scanner import scan
+from lunae.utils.errors import SourceError
+from lunae.utils.sourceposition import LineIndex
+
+DEFAULT_CHUNK_SIZE = 1 << 18
+"""
+int: The number of characters from which a source is cut into a new piece.
+"""
+
+COMPILED_CUT_REGEX = re.compile(r"^(?!else\b)[A-Za-z_]", re.MULTILINE)
+"""
+re.Pattern: Matches the start of the lines a source may be cut before.
+"""
+
+T = TypeVar("T")
+
+
+def split_source(source: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[int]:
+    """
+    Finds where to cut a source into pieces of about a given size.
+
+    Args:
+        source (str): The source code.
+        chunk_size (int): The number of characters from which a piece is cut.
+
+    Returns:
+        list[int]: The offset of each piece, starting with 0.
+    """
+    cuts = [0]
+    while True:
+        match = COMPILED_CUT_REGEX.search(source, cuts[-1] + chunk_size)
+        if match is None:
+            return cuts
+        cuts.append(match.start())
+
+
+def map_pieces(
+    function: Callable[[str, int], T],
+    source: str,
+    cuts: list[int],
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+) -> list[T]:
+    """
+    Applies a function to the pieces of a source, in worker processes.
+
+    Args:
+        function (Callable[[str, int], T]): The function, taking a piece and its line number.
+        source (str): The source code.
+        cuts (list[int]): The offset of each piece.
+        executor (Optional[Executor]): The executor to use, or None to start one.
+        workers (Optional[int]): The number of processes started, by default one per CPU.
+
+    Returns:
+        list[T]: The results, in the order of the pieces.
+    """
+    ends = cuts[1:] + [len(source)]
+    pieces = [source[start:end] for start, end in zip(cuts, ends)]
+    lines = list(accumulate((piece.count("\n") for piece in pieces[:-1]), initial=0))
+
+    if executor is not None:
+        return list(executor.map(function, pieces, lines))
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(function, pieces, lines))
+
+
+def tokenize_parallel(
+    source: str,
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> TokenBuffer:
+    """
+    Tokenizes the given source code in worker processes.
+
+    The tokens are the same as those of `tokenize`. Sources shorter than
+    `chunk_size` are tokenized in the current process.
+
+    Args:
+        source (str): The source code as a string.
+        executor (Optional[Executor]): The executor to use, or None to start one.
+        workers (Optional[int]): The number of processes started, by default one per CPU.
+        chunk_size (int): The number of characters from which a piece is cut.
+
+    Returns:
+        TokenBuffer: The tokens extracted from the source code.
+
+    Raises:
+        TokenizerError: If a character starts no token.
+    """
+    cuts = split_source(source, chunk_size)
+    if len(cuts) == 1:
+        return scan(source)
+
+    try:
+        pieces = map_pieces(scan, source, cuts, executor, workers)
+    except SourceError:
+        return scan(source)
+
+    tokens = TokenBuffer(source, LineIndex(source))
+    for offset, piece in zip(cuts, pieces):
+        tokens.extend(piece, offset)
+    return tokens
@@ -0,0 +1,179 @@
+"""
+Provides the single-pass tokenizer.
+
+The scanner walks the source once with `COMPILED_TOKEN_REGEX.finditer`, whose
+alternatives together match any character, so every match starts where the
+previous one ended. Tokens are recorded in a `TokenBuffer` as a kind code and
+offsets: their text is sliced, and their line and character positions
+computed from a `LineIndex`, only when they are read.
+
+A `Scanner` keeps the indentation state between calls, so a source can also
+be tokenized in consecutive pieces.
+"""
+
+from typing import Optional
+
+from lunae.language.syntax import KEYWORDS
+from lunae.tokenizer.buffer import TokenBuffer
+from lunae.tokenizer.grammar import COMPILED_TOKEN_REGEX, TOKEN_CODES, TokenKind
+from lunae.utils.errors import TokenizerError
+from lunae.utils.sourceposition import LineIndex
+
+CODES = {kind.name: TOKEN_CODES[kind] for kind in TokenKind}
+"""
+dict[str, int]: The token kind codes, by regex group name.
+"""
+
+SKIPPED = {"WHITESPACE", "COMMENT"}
+"""
+set[str]: The regex groups which produce no token.
+"""
+
+Indentation = tuple[str, int, int]
+"""
+tuple[str, int, int]: The indentation of a line, and its offsets.
+"""
+
+
+class Scanner:
+    """
+    Tokenizes a source given whole or in consecutive pieces.
+
+    Attributes:
+        indent_stack (list[int]): The indentation levels of the open blocks.
+        line_start (bool): Whether the next piece starts a line.
+        indentation (Optional[Indentation]): The indentation of the current
+            line, until its first token is read.
+    """
+
+    def __init__(self):
+        """
+        Initializes the scanner at the start of a source.
+        """
+        self.indent_stack = [0]
+        self.line_start = True
+        self.indentation: Optional[Indentation] = None
+
+    def scan(self, buffer: TokenBuffer, final: bool = True) -> int:
+        """
+        Tokenizes a piece of source code into a token buffer.
+
+        A piece which is not final must end with a line break, so that no
+        token but a string may continue in the next piece. Scanning stops at
+        a string which is not terminated in the piece.
+
+        Args:
+            buffer (TokenBuffer): The buffer of the piece, receiving its tokens.
+            final (bool): Whether the piece ends the source.
+
+        Returns:
+            int: The offset where scanning stopped.
+
+        Raises:
+            TokenizerError: If a character starts no token.
+        """
+        source = buffer.source
+        add_kind = buffer.kinds.append
+        add_start = buffer.starts.append
+        add_end = buffer.ends.append
+        ident, keyword = TOKEN_CODES[TokenKind.IDENT], TOKEN_CODES[TokenKind.KEYWORD]
+        indent, dedent = TOKEN_CODES[TokenKind.INDENT], TOKEN_CODES[TokenKind.DEDENT]
+        indent_stack = self.indent_stack
+        line_start = self.line_start
+        indentation = self.indentation
+        stop = len(source)
+
+        for match in COMPILED_TOKEN_REGEX.finditer(source):
+            group = match.lastgroup
+
+            if line_start:
+                line_start = False
+                start, end = match.span()
+                if group == "WHITESPACE":
+                    indentation = (match.group(), start, end)
+                    continue
+                indentation = ("", start, start)
+
+            if indentation is not None:
+                if group != "NEWLINE":  # Non-empty line
+                    text, indent_start, indent_end = indentation
+                    indent_level = len(text.replace("\t", "    "))
+                    if indent_level > indent_stack[-1]:
+                        indent_stack.append(indent_level)
+                        add_kind(indent)
+                        add_start(indent_start)
+                        add_end(indent_end)
+                    while indent_level < indent_stack[-1]:
+                        indent_stack.pop()
+                        add_kind(dedent)
+                        add_start(indent_start)
+                        add_end(indent_end)
+                indentation = None
+
+            if group in SKIPPED:
+                continue
+            if group == "NEWLINE":
+                line_start = True
+            elif group == "UNKNOWN":
+                if match.group() == '"' and not final:
+                    stop = match.start()
+                    break
+                raise TokenizerError(
+                    f"Unexpected character: {match.group()!r}",
+                    buffer.lines.position(match.start()),
+                )
+
+            code = CODES[group]  # type: ignore[index]
+            if code == ident and match.group() in KEYWORDS:
+                code = keyword
+            add_kind(code)
+            add_start(match.start())
+            add_end(match.end())
+
+        self.line_start = line_start
+        self.indentation = indentation
+        return stop
+
+    def finish(self, buffer: TokenBuffer, offset: int):
+        """
+        Closes the blocks still open at the end of the source.
+
+        Args:
+            buffer (TokenBuffer): The buffer of the last piece, receiving one
+                DEDENT token per open block.
+            offset (int): The offset of the end of the source in the last piece.
+        """
+        dedent = TOKEN_CODES[TokenKind.DEDENT]
+        while self.indent_stack:
+            if self.indent_stack.pop() != 0:
+                buffer.kinds.append(dedent)
+                buffer.starts.append(offset)
+                buffer.ends.append(offset)
+
+
+def scan(source: str, line: int = 0) -> TokenBuffer:
+    """
+    Tokenizes the given source code in a single pass.
+
+    The tokens are those read by `TokenizerReader`, including the INDENT and
+    DEDENT tokens marking changes of indentation. Their positions are equal
+    too, except after a string spanning several lines: the reader only counts
+    the lines ended by NEWLINE tokens, while the positions of scanned tokens
+    count every line break of the source.
+
+    Args:
+        source (str): The source code as a string.
+        line (int): The line number of the source, when it is a piece of a
+            larger one starting at the beginning of a line.
+
+    Returns:
+        TokenBuffer: The tokens extracted from the source code.
+
+    Raises:
+        TokenizerError: If a character starts no token.
+    """
+    buffer = TokenBuffer(source, LineIndex(source, line))
+    scanner = Scanner()
+    scanner.scan(buffer)
+    scanner.finish(buffer, len(source))
+    return buffer
@@ -0,0 +1,67 @@
+"""
+Provides the streaming tokenizer, reading source code from text streams.
+
+The stream is read in chunks. Each chunk is scanned up to its last line
+break, and the rest is kept for the next one, so that no token but a string
+is ever cut. Tokens are yielded as soon as their line is scanned, and only
+keep a reference to the piece of source they come from.
+"""
+
+from typing import Iterator, TextIO
+
+from lunae.tokenizer.buffer import TokenBuffer
+from lunae.tokenizer.scanner import Scanner
+from lunae.tokenizer.token import Token
+from lunae.utils.sourceposition import LineIndex
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+"""
+int: The number of characters read from a stream at once.
+"""
+
+
+def tokenize_stream(
+    stream: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Token]:
+    """
+    Tokenizes the source code read from a text stream, lazily.
+
+    The tokens and their positions are the same as those of `tokenize` on
+    the whole source.
+
+    Args:
+        stream (TextIO): The stream to read the source code from.
+        chunk_size (int): The number of characters to read at once.
+
+    Yields:
+        Token: The tokens extracted from the source code.
+
+    Raises:
+        TokenizerError: If a character starts no token.
+    """
+    scanner = Scanner()
+    pending = ""
+    line = character = 0
+
+    while True:
+        chunk = stream.read(chunk_size)
+        final = not chunk
+        source = pending + chunk
+        cut = len(source) if final else source.rfind("\n") + 1
+        if not cut and not final:  # No complete line yet
+            pending = source
+            continue
+
+        piece = source[:cut]
+        buffer = TokenBuffer(piece, LineIndex(piece, line, character))
+        stop = scanner.scan(buffer, final)
+        if final:
+            scanner.finish(buffer, len(piece))
+        yield from buffer
+
+        if final:
+            return
+
+        position = buffer.lines.position(stop)
+        line, character = position.line_number, position.character_pos
+        pending = source[stop:]
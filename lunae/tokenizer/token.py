@@ -2,11 +2,11 @@
 Represents individual tokens and their properties.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from lunae.tokenizer.grammar import TokenKind
 from lunae.utils.errors import TokenizerError
-from lunae.utils.sourceposition import SourcePosition
+from lunae.utils.sourceposition import LineIndex, SourcePosition
 
 
 @dataclass
@@ -19,12 +19,65 @@ class Token:
         match (str): The matched string for the token.
         start (SourcePosition): The starting position of the token.
         end (SourcePosition): The ending position of the token.
+        offsets (tuple[int, int]): The offsets of a token created with `at`.
+        lines (LineIndex): The line index of a token created with `at`.
     """
 
     kind: TokenKind
     match: str
     start: SourcePosition
     end: SourcePosition
+    offsets: tuple[int, int] = field(init=False, compare=False, repr=False)
+    lines: LineIndex = field(init=False, compare=False, repr=False)
+
+    @classmethod
+    def at(
+        cls, kind: TokenKind, match: str, start: int, end: int, lines: LineIndex
+    ) -> "Token":
+        """
+        Creates a token from offsets, computing its positions only when they are read.
+
+        Args:
+            kind (TokenKind): The type of the token.
+            match (str): The matched string for the token.
+            start (int): The offset of the token in the source.
+            end (int): The offset just after the token.
+            lines (LineIndex): The line index of the source.
+
+        Returns:
+            Token: The token, equal to one created with its positions.
+        """
+        token = cls.__new__(cls)
+        token.kind = kind
+        token.match = match
+        token.offsets = (start, end)
+        token.lines = lines
+        return token
+
+    def __getattr__(self, name: str):
+        """
+        Computes the positions of a token created from offsets, on first access.
+        """
+        offsets = self.__dict__.get("offsets")
+        if offsets is None or name not in ("start", "end"):
+            raise AttributeError(name)
+        position = self.lines.position(offsets[name == "end"])
+        setattr(self, name, position)
+        return position
+
+    def __getstate__(self) -> dict:
+        """
+        Gets the state of a token, with its positions computed, for `pickle`.
+
+        Returns:
+            dict: The kind, match and positions, without the line index and source.
+        """
+        return {
+            "kind": self.kind,
+            "match": self.match,
+            "start": self.start,
+            "end": self.end,
+        }
 
     @property
     def string_value(self) -> str:
@@ -60,6 +60,13 @@ class SourceError(Exception):
             full_msg = message
         super().__init__(full_msg)
 
+    def __reduce__(self):
+        """
+        Pickles the error with its formatted message, so that errors raised
+        in worker processes can be raised again.
+        """
+        return (self.__class__.__new__, (self.__class__, *self.args), self.__dict__)
+
     def with_source(self, source: str):
         """
         Adds source code context to the error message.
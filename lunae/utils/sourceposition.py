@@ -1,8 +1,11 @@
 """
-This module defines the SourcePosition class, which represents a position in the source code.
+This module defines the SourcePosition class, which represents a position in the source code,
+and the LineIndex class, which computes positions from offsets.
 """
 
+from bisect import bisect_right
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
@@ -17,3 +20,58 @@ class SourcePosition:
 
     line_number: int
     character_pos: int
+
+
+class LineIndex:
+    """
+    Maps offsets in a source to positions, through the offsets where lines start.
+
+    The table is built on the first lookup, so sources whose positions are
+    never requested are not scanned for lines.
+
+    A piece of a larger source is indexed with the position of its first
+    character, so that it maps its own offsets to positions in the source.
+
+    Attributes:
+        source (str): The source code.
+        line (int): The line number of the first character.
+        character (int): The character position of the first character.
+        line_starts (Optional[list[int]]): The offset of the first character of each
+            line, negative for a first line starting before the source.
+    """
+
+    def __init__(self, source: str, line: int = 0, character: int = 0):
+        """
+        Initializes the index of a source.
+
+        Args:
+            source (str): The source code.
+            line (int): The line number of the first character.
+            character (int): The character position of the first character.
+        """
+        self.source = source
+        self.line = line
+        self.character = character
+        self.line_starts: Optional[list[int]] = None
+
+    def position(self, offset: int) -> SourcePosition:
+        """
+        Gets the position of an offset.
+
+        Args:
+            offset (int): The offset in the source.
+
+        Returns:
+            SourcePosition: The line and character position of the offset.
+        """
+        line_starts = self.line_starts
+        if line_starts is None:
+            line_starts = self.line_starts = [-self.character]
+            find = self.source.find
+            pos = find("\n")
+            while pos != -1:
+                line_starts.append(pos + 1)
+                pos = find("\n", pos + 1)
+
+        line = bisect_right(line_starts, offset) - 1
+        return SourcePosition(self.line + line, offset - line_starts[line])
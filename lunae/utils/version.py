@@ -0,0 +1,21 @@
+"""
+This module provides the version of the installed lunae package.
+"""
+
+from importlib.metadata import PackageNotFoundError, version
+from os import path
+
+
+def get_version() -> str:
+    """
+    Fetch the installed lunae version.
+    """
+    try:
+        return version("lunae")
+    except PackageNotFoundError:
+        try:
+            version_file_path = path.join(path.dirname(__file__), "..", "..", "VERSION")
+            with open(version_file_path, encoding="utf-8") as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return "unknown"
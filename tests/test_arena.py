@@ -0,0 +1,70 @@
+from lunae.language.ast.arena import Arena, NodeView
+from lunae.language.ast.base.block import Block
+from lunae.language.ast.controls.ifexpr import IfExpr
+from lunae.language.ast.functions.funccall import FuncCall
+from lunae.language.ast.values.number import Number
+from lunae.language.ast.values.var import Var
+from lunae.parser import parse
+from lunae.tokenizer import tokenize
+
+SOURCE = (
+    "memo func f(a: number, b):\n"
+    "    if a < b: a\n"
+    "    else:\n"
+    "        for x in b: g(x)\n"
+    "y = 0\n"
+    'while y < 3: y = y + f(1, "s")\n'
+    "if y: 1\n"
+)
+
+
+def test_slotted_nodes():
+    ast = parse(tokenize(SOURCE))
+    assert not hasattr(ast, "__dict__")
+    assert not hasattr(ast.statements[1], "__dict__")
+
+
+def test_interned_names():
+    ast = parse(tokenize("count = 1\ncount + count"))
+    call = ast.statements[1]
+    assert ast.statements[0].name is call.args[0].name is call.args[1].name
+
+
+def test_arena_roundtrip():
+    ast = parse(tokenize(SOURCE))
+    arena = Arena.from_tree(ast)
+    assert arena.to_tree() == ast
+    assert len(arena) == sum(1 for _ in arena)
+
+
+def test_arena_views():
+    arena = Arena.from_tree(parse(tokenize("if y: 1\nx")))
+    root = arena.root
+    assert root.type is Block
+    ifexpr, var = root.statements
+    assert ifexpr.type is IfExpr and ifexpr.else_branch is None
+    assert ifexpr.then_branch.value == 1
+    assert var.name == "x"
+    assert list(root.children()) == [ifexpr, var]
+    assert [view.type for view in arena][-1] is Block
+    assert isinstance(ifexpr.cond, NodeView)
+
+
+def test_arena_pool():
+    arena = Arena.from_tree(Block([Var("x"), Var("x"), Number(1), Number(True)]))
+    assert len(arena.pool) == 4
+    assert arena.to_tree().statements[3].value is True
+
+
+def test_arena_deep_tree():
+    node = Number(1)
+    for _ in range(10000):
+        node = FuncCall(node, [])
+    arena = Arena.from_tree(node)
+    assert len(arena) == 10001
+    node = arena.to_tree()
+    depth = 0
+    while isinstance(node, FuncCall):
+        node = node.callee
+        depth += 1
+    assert depth == 10000 and node == Number(1)
@@ -0,0 +1,43 @@
+from lunae.interpreter.bytecode import BytecodeCompiler, OpCode, disassemble
+from lunae.parser import parse
+from lunae.tokenizer import tokenize
+
+
+def compile_source(source):
+    return BytecodeCompiler().compile(parse(tokenize(source)))
+
+
+def test_constants_are_shared():
+    code = compile_source("1 + 1")
+    assert code.consts == (1.0,)
+    assert [op for op, _ in code.instructions] == [
+        OpCode.LOAD_NAME,
+        OpCode.LOAD_CONST,
+        OpCode.LOAD_CONST,
+        OpCode.CALL,
+        OpCode.RETURN_VALUE,
+    ]
+
+
+def test_disassemble_nested_function():
+    listing = disassemble(compile_source("func f(a): a\nf(2)"))
+    assert "<code f> (a):" in listing
+    assert "MAKE_FUNCTION" in listing
+    assert "BIND_FUNCTION     0 (f)" in listing
+    assert "LOAD_CONST        1 (2.0)" in listing
+
+
+def test_tail_call():
+    (function,) = compile_source("func f(n): if n: f(n - 1)").consts
+    assert [op for op, _ in function.instructions] == [
+        OpCode.LOAD_NAME,
+        OpCode.JUMP_IF_FALSE,
+        OpCode.LOAD_NAME,
+        OpCode.LOAD_NAME,
+        OpCode.LOAD_NAME,
+        OpCode.LOAD_CONST,
+        OpCode.CALL,
+        OpCode.TAIL_CALL,
+        OpCode.LOAD_CONST,
+        OpCode.RETURN_VALUE,
+    ]
@@ -0,0 +1,153 @@
+import builtins
+import os
+
+import lunae.parser.cache
+
+from lunae.interpreter import Interpreter
+from lunae.language.ast.base.block import Block
+from lunae.language.ast.functions.funccall import FuncCall
+from lunae.language.ast.values.number import Number
+from lunae.parser import parse
+from lunae.parser.cache import ASTCache, decode, encode, fingerprint
+from lunae.tokenizer import tokenize
+
+SOURCE = (
+    "memo func f(a: number, b):\n"
+    "    if a < b: a\n"
+    "    else:\n"
+    "        for x in b: g(x)\n"
+    "y = 0\n"
+    'while y < 3: y = y + f(1, "s")\n'
+    "if y: 1\n"
+)
+
+
+def test_encode_roundtrip():
+    ast = parse(tokenize(SOURCE))
+    assert decode(encode(ast)) == ast
+
+
+def test_encode_deep_tree():
+    node = Number(1)
+    for _ in range(10000):
+        node = FuncCall(node, [])
+    decoded = decode(encode(Block([node])))
+    depth = 0
+    node = decoded.statements[0]
+    while isinstance(node, FuncCall):
+        node = node.callee
+        depth += 1
+    assert depth == 10000 and node == Number(1)
+
+
+def test_cache_hit_and_miss(tmp_path):
+    cache = ASTCache(str(tmp_path))
+    assert cache.load(SOURCE) is None
+
+    ast = cache.parse(SOURCE)
+    assert cache.load(SOURCE) == ast
+    assert cache.load(SOURCE + "z\n") is None
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_corrupted_entry(tmp_path):
+    cache = ASTCache(str(tmp_path))
+    cache.parse(SOURCE)
+    path = cache.path(cache.key(SOURCE))
+    with open(path, "r+b") as f:
+        f.truncate(20)
+
+    assert cache.load(SOURCE) is None
+    assert not os.path.exists(path)
+
+
+def test_eviction(tmp_path):
+    cache = ASTCache(str(tmp_path), max_size=0)
+    cache.parse(SOURCE)
+    assert not os.listdir(tmp_path)
+
+    cache.max_size = 1 << 20
+    sources = [f"x = {i}\n" for i in range(3)]
+    for i, source in enumerate(sources):
+        cache.parse(source)
+        os.utime(cache.path(cache.key(source)), (i, i))
+    cache.max_size = os.path.getsize(cache.path(cache.key(sources[0]))) * 2
+    cache.evict()
+    assert cache.load(sources[0]) is None
+    assert cache.load(sources[2]) is not None
+
+
+def test_cache_directory(tmp_path, monkeypatch):
+    monkeypatch.delenv("LUNAE_CACHE_DIR", raising=False)
+    assert ASTCache.for_file() is None
+    assert ASTCache.for_file(str(tmp_path / "a.lun")).directory == str(
+        tmp_path / "__lunaecache__"
+    )
+
+    monkeypatch.setenv("LUNAE_CACHE_DIR", str(tmp_path))
+    assert ASTCache.for_file("a.lun").directory == str(tmp_path)
+
+    interpreter = Interpreter()
+    assert interpreter.execute("x = 2\nx * 3") == 6
+    assert interpreter.execute("x = 2\nx * 3") == 6
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_fingerprint_sources(monkeypatch):
+    opened = []
+    real_open = builtins.open
+
+    def spy(path, *args, **kwargs):
+        opened.append(os.path.normpath(str(path)))
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", spy)
+    fingerprint.cache_clear()
+    try:
+        fingerprint()
+    finally:
+        fingerprint.cache_clear()
+    for module in ("tokenizer/scanner.py", "parser/reader.py", "parser/__init__.py"):
+        assert any(path.endswith(os.path.normpath(module)) for path in opened)
+
+
+def test_key_reads_version_once(tmp_path, monkeypatch):
+    cache = ASTCache(str(tmp_path))
+    key = cache.key(SOURCE)
+
+    def get_version():
+        raise AssertionError("version looked up again")
+
+    monkeypatch.setattr(lunae.parser.cache, "get_version", get_version)
+    assert cache.key(SOURCE) == key
+    assert cache.key("x") != key
+
+
+def test_stale_temporary_files(tmp_path):
+    cache = ASTCache(str(tmp_path))
+    stale = tmp_path / "tmpstale.tmp"
+    fresh = tmp_path / "tmpfresh.tmp"
+    stale.write_bytes(b"partial")
+    fresh.write_bytes(b"partial")
+    os.utime(stale, (0, 0))
+    cache.parse(SOURCE)
+    assert not stale.exists() and fresh.exists()
+
+
+def test_eviction_listing(tmp_path, monkeypatch):
+    listings = []
+    real_scandir = os.scandir
+
+    def spy(path):
+        listings.append(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", spy)
+    cache = ASTCache(str(tmp_path), max_entries=3)
+    for i in range(3):
+        cache.parse(f"x = {i}\n")
+    assert len(listings) == 1 and cache.entries == 3
+
+    cache.parse("x = 3\n")
+    assert len(listings) == 2 and cache.entries == 3
+    assert len(os.listdir(tmp_path)) == 3
@@ -0,0 +1,44 @@
+from lunae.interpreter import Interpreter, create_global_env
+from lunae.interpreter.codegen import PythonCodeGenerator
+from lunae.parser import parse
+from lunae.tokenizer import tokenize
+
+
+def test_native_control_flow():
+    source = PythonCodeGenerator().source(
+        parse(tokenize("i = 0\nwhile i < 3:\n    if i: i = i + 1\n    else: i = 2"))
+    )
+    assert "while _get0('i') < 3.0 if _guard_less.valid" in source
+    assert "if _get0('i'):" in source
+
+
+def test_evaluation_order():
+    env = create_global_env()
+    env.set("pair", lambda a, b: (a, b))
+    run = PythonCodeGenerator().compile(parse(tokenize("x = 1\npair(x, x = 2)")))
+    assert run(env) == (1.0, 2.0)
+
+
+def test_guarded_operators():
+    interpreter = Interpreter(engine="python")
+    program = interpreter.compile("func f(a, b): a - b\nf(5, 2) * 2")
+    assert interpreter.run(program) == 6.0
+
+    interpreter.execute("func sub(a, b): a + b")
+    assert interpreter.run(program) == 14.0
+
+
+def test_operator_rebound_while_running():
+    interpreter = Interpreter(engine="python")
+    assert (
+        interpreter.execute("x = 1 + 1\nfunc add(a, b): a * b\nx + (2 + 3) + (4 + 5)")
+        == 240.0
+    )
+
+
+def test_operator_shadowed_by_parameter():
+    interpreter = Interpreter(engine="python")
+    assert (
+        interpreter.execute("func f(add): add(1, 2)\nfunc g(a, b): a * b\n1 + f(g) + 1")
+        == 4.0
+    )
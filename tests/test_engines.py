@@ -0,0 +1,165 @@
+import tracemalloc
+
+import pytest
+
+from lunae.interpreter import ENGINES, Interpreter
+from lunae.optimizer import optimize
+from lunae.parser import parse
+from lunae.tokenizer import tokenize
+
+PROGRAMS = [
+    ("1 + 2 * 3", 7),
+    ('"lunae"', "lunae"),
+    ("a = 2\nb = a * a\nb - a", 2),
+    ("if 0: 1\nelse: 2", 2),
+    ("if 0: 1", None),
+    ("i = 0\nwhile i < 5: i = i + 1", 5),
+    ("for i in range(4): i * i", [0, 1, 4, 9]),
+    ("func double(x): x * 2\ndouble(21)", 42),
+    ("func fact(n):\n    if n < 2: 1\n    else: n * fact(n - 1)\nfact(5)", 120),
+    ("func adder(a):\n    func inner(b): a + b\n    inner\nadder(1)(2)", 3),
+    ("func zero(): 0\nzero()", 0),
+    ("func sum3(a, b, c): a + b + c\nsum3(1, 2, 3)", 6),
+    ("a = 1\nfunc f(b): a = a + b\nf(2)\na", 3),
+    (
+        "func make():\n    n = 0\n    func inc(): n = n + 1\n    inc\nc = make()\nc()\nc()",
+        2,
+    ),
+]
+
+
+def make_interpreter(engine):
+    interpreter = Interpreter(engine=engine)
+    interpreter.global_env.set("range", lambda n: list(range(int(n))))
+    return interpreter
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("source, expected", PROGRAMS)
+def test_programs(engine, source, expected):
+    assert make_interpreter(engine).execute(source) == expected
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_redefinition(engine):
+    interpreter = make_interpreter(engine)
+    source = "func f(): 1\nfunc g(): f()\nfunc f(): 2\ng()"
+    assert interpreter.execute(source) == 2
+    assert interpreter.execute("func f(): 3\nf()") == 3
+    assert interpreter.global_env.declaration("f").mutable is False
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_rebound_builtin(engine):
+    interpreter = make_interpreter(engine)
+    interpreter.global_env.set("add", lambda a, b: a * b)
+    assert interpreter.execute("3 + 4") == 12
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_function_scope(engine):
+    interpreter = make_interpreter(engine)
+    interpreter.execute("a = 1\nfunc f(a): a = a + 1\nf(5)")
+    assert interpreter.global_env.get("a") == 1
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_rebinding_deoptimizes(engine):
+    interpreter = make_interpreter(engine)
+    interpreter.execute("func f(a, b): a + b")
+    assert interpreter.execute("f(3, 4)") == 7
+    interpreter.global_env.set("add", lambda a, b: a * b)
+    assert interpreter.execute("f(3, 4)") == 12
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_shadowed_operator(engine):
+    interpreter = make_interpreter(engine)
+    assert interpreter.execute("func f(add): 1 + 2\nf(sub)") == -1
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_tail_calls(engine):
+    interpreter = make_interpreter(engine)
+    result = interpreter.execute("""
+func count(n, acc):
+    if n < 1: acc
+    else: count(n - 1, acc + 1)
+
+func even(n):
+    if n == 0: 1
+    else: odd(n - 1)
+
+func odd(n):
+    if n == 0: 0
+    else: even(n - 1)
+
+count(5000, 0) + even(5001)
+""")
+    assert result == 5000
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_deep_tail_recursion(engine):
+    interpreter = make_interpreter(engine)
+    result = interpreter.execute("""
+func loop(n, acc):
+    if n == 0: acc
+    else: loop(n - 1, acc + 1)
+
+loop(10000, 0)
+""")
+    assert result == 10000
+
+
+def test_deep_recursion():
+    interpreter = make_interpreter("stack")
+    result = interpreter.execute("""
+func total(n):
+    if n < 1: 0
+    else: n + total(n - 1)
+
+total(20000)
+""")
+    assert result == 20000 * 20001 / 2
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_optimized_loops(engine):
+    interpreter = make_interpreter(engine)
+    source = """
+n = 0
+for i in range(3): n = n + i
+for x in (for i in range(3): i * 2): x + 1
+"""
+    ast = optimize(parse(tokenize(source)), interpreter.global_env)
+    assert interpreter.eval(ast) == [1, 3, 5]
+    assert interpreter.global_env.get("n") == 3
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_statement_loops_collect_nothing(engine):
+    interpreter = make_interpreter(engine)
+    interpreter.global_env.set("range", lambda n: range(int(n)))
+    source = "n = 0\nfor i in range(10000): n = n + i * 2\nn"
+    tracemalloc.start()
+    try:
+        assert interpreter.execute(source) == 99990000
+        assert tracemalloc.get_traced_memory()[1] < 200_000
+    finally:
+        tracemalloc.stop()
+    assert interpreter.compile(source).ast.statements[1].discard
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("for x in (for i in range(3): i): i", [2, 2, 2]),
+        ("s = 0\nfor x in (for i in range(3): s = s + 1): s", [3, 3, 3]),
+    ],
+)
+def test_dependent_nested_loops(engine, source, expected):
+    interpreter = make_interpreter(engine)
+    assert interpreter.execute(source) == expected
+    assert interpreter.run(interpreter.compile(source, optimized=True)) == expected
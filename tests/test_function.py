@@ -0,0 +1,103 @@
+import inspect
+import pickle
+
+import pytest
+
+from lunae.interpreter import ENGINES, Interpreter
+from lunae.interpreter.function import LunaeFunction
+
+SOURCE = """
+func zero(): 0
+func one(a): a
+func two(a, b): a - b
+func three(a, b, c): a - b - c
+func four(a, b, c, d): a - b - c - d
+func fib(n):
+    if n < 2: n
+    else: fib(n - 1) + fib(n - 2)
+"""
+
+FUNCTION_ENGINES = [engine for engine in ENGINES if engine != "slots"]
+
+
+def functions(engine):
+    interpreter = Interpreter(engine=engine)
+    interpreter.execute(SOURCE)
+    return interpreter.global_env
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_arities(engine):
+    env = functions(engine)
+    assert env.get("zero")() == 0
+    assert env.get("one")(1) == 1
+    assert env.get("two")(5, 2) == 3
+    assert env.get("three")(9, 3, 2) == 4
+    assert env.get("four")(9, 3, 2, 1) == 3
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_arity_errors(engine):
+    env = functions(engine)
+    with pytest.raises(TypeError, match=r"zero\(\) takes 0 arguments but 1"):
+        env.get("zero")(1)
+    with pytest.raises(TypeError, match=r"one\(\) takes 1 argument but 0"):
+        env.get("one")()
+    with pytest.raises(TypeError, match="takes 3 arguments but 2"):
+        env.get("three")(1, 2)
+    with pytest.raises(TypeError, match="takes 4 arguments but 5"):
+        env.get("four")(1, 2, 3, 4, 5)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_call_arity(engine):
+    interpreter = Interpreter(engine=engine)
+    with pytest.raises(TypeError, match=r"f\(\) takes 2 arguments but 1"):
+        interpreter.execute("func f(a, b): a\nf(1)")
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_tail_call_arity(engine):
+    interpreter = Interpreter(engine=engine)
+    interpreter.execute("func f(a, b): a\nfunc g(x): f(x)")
+    with pytest.raises(TypeError, match="takes 2 arguments but 1"):
+        interpreter.execute("g(1)")
+
+
+@pytest.mark.parametrize("engine", FUNCTION_ENGINES)
+def test_introspection(engine):
+    env = functions(engine)
+    fib = env.get("fib")
+    assert isinstance(fib, LunaeFunction) and fib.engine == engine
+    assert fib.__name__ == fib.__qualname__ == "fib"
+    assert fib.arity == 1 and fib.params == ("n",) and fib.types == ("ANY",)
+    assert repr(fib) == "<function fib(n)>"
+    assert str(inspect.signature(env.get("three"))) == "(a, b, c, /)"
+
+    interpreter = Interpreter(engine=engine)
+    anonymous = interpreter.execute("func(x): x")
+    assert anonymous.__name__ == "<lambda>"
+
+    memoized = interpreter.execute("memo func square(x): x * x")
+    assert memoized.__qualname__ == "square"
+    assert str(inspect.signature(memoized)) == "(x, /)"
+
+
+@pytest.mark.parametrize("engine", FUNCTION_ENGINES)
+def test_pickle(engine):
+    env = functions(engine)
+    fib = pickle.loads(pickle.dumps(env.get("fib")))
+    assert isinstance(fib, LunaeFunction) and fib.engine == engine
+    assert fib(15) == 610
+    assert fib.env.get("three")(9, 3, 2) == 4
+    assert fib.env.get("fib") is fib
+    assert fib.env is not env
+
+
+def test_pickle_closure():
+    interpreter = Interpreter()
+    adder = interpreter.execute(
+        "func adder(x):\n    func plus(y): x + y\n    plus\nadder(3)"
+    )
+    plus = pickle.loads(pickle.dumps(adder))
+    assert plus(2) == 5
@@ -0,0 +1,91 @@
+import pytest
+
+from lunae.parser import parse
+from lunae.parser.incremental import CHUNK_SIZE, Document, TextEdit
+from lunae.tokenizer import tokenize
+from lunae.utils.errors import ParserError
+
+SOURCE = (
+    "x = 1\n"
+    "func f(a):\n"
+    "    if a: 1\n"
+    "    else: 2\n"
+    "\n"
+    "# comment\n"
+    "if x: 3\n"
+    "else: 4\n"
+    "y = f(x)\n"
+    "while y < 3: y = y + 1\n"
+)
+
+EDITS = [
+    ("x = 1", "x = 12"),
+    ("    else: 2\n", ""),
+    ("else: 4\n", ""),
+    ("y = f(x)\n", "if y: 5\n"),
+    ("# comment\n", 'z = "a\nb"\n'),
+    ("else: 4\n", "else:\n"),
+    ("x = 1\n", ""),
+    ("while y < 3: y = y + 1\n", "if y: 5\nelse: 6\n"),
+]
+
+
+@pytest.mark.parametrize("old, new", EDITS)
+def test_edit_matches_parse(old, new):
+    start = SOURCE.index(old)
+    document = Document.parse(SOURCE).edit(TextEdit(start, start + len(old), new))
+    source = SOURCE.replace(old, new, 1)
+
+    assert document.source == source
+    assert document.ast == parse(tokenize(source))
+    assert document.tokens == tokenize(source)
+    assert document.offsets == Document.parse(source).offsets
+
+
+def test_unaffected_statements_are_reused():
+    source = "".join(f"x{i} = {i}\n" for i in range(100))
+    document = Document.parse(source)
+    start = source.index("= 50") + 2
+    edited = document.edit(TextEdit(start, start + 2, "5 + 5"))
+
+    assert edited.ast.statements[50] == parse(tokenize("x50 = 5 + 5")).statements[0]
+    reused = [
+        new is old for new, old in zip(edited.ast.statements, document.ast.statements)
+    ]
+    assert reused.count(False) == 2
+
+
+def test_edit_errors():
+    document = Document.parse(SOURCE)
+    with pytest.raises(ParserError):
+        document.edit(TextEdit(0, 0, ")"))
+
+
+def test_edits_across_chunks():
+    source = "".join(f"x{i} = {i}\n" for i in range(CHUNK_SIZE * 3 + 5))
+    document = Document.parse(source)
+    for target, new in [
+        (f"x{CHUNK_SIZE} = ", "if 1:\n    y = 2\nx = "),
+        (f"x{CHUNK_SIZE - 2} = {CHUNK_SIZE - 2}\nx{CHUNK_SIZE - 1} =", "z ="),
+        ("x0 = 0\n", ""),
+        (f"x{CHUNK_SIZE * 3 + 4} = {CHUNK_SIZE * 3 + 4}\n", "w = 1\nv = 2\n"),
+        (f"x{CHUNK_SIZE * 2} = {CHUNK_SIZE * 2}\n", 's = "a\nb"\n'),
+    ]:
+        start = source.index(target)
+        document = document.edit(TextEdit(start, start + len(target), new))
+        source = source[:start] + new + source[start + len(target) :]
+        assert document.source == source
+        assert document.ast == parse(tokenize(source))
+        assert document.offsets == Document.parse(source).offsets
+
+
+def test_edit_shares_chunks():
+    source = "".join(f"x{i} = {i}\n" for i in range(CHUNK_SIZE * 8))
+    document = Document.parse(source)
+    start = source.index(f"x{CHUNK_SIZE * 4 + 1} = ")
+    edited = document.edit(TextEdit(start, start, "y = 1\n"))
+
+    shared = [new is old for new, old in zip(edited.chunks, document.chunks)]
+    assert shared[:4] == [True] * 4 and shared[5:] == [False] * 3
+    assert edited.chunks[-1] is document.chunks[-1]
+    assert edited.ast == parse(tokenize(source[:start] + "y = 1\n" + source[start:]))
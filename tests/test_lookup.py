@@ -0,0 +1,77 @@
+import pytest
+
+from lunae.interpreter import ENGINES, Interpreter, create_global_env
+from lunae.interpreter.environment import Environment, LookupCache
+
+
+def test_lookup_cache_hit():
+    global_env = Environment()
+    global_env.set("x", 1)
+    local = Environment(Environment(global_env))
+    cache = LookupCache()
+    assert local.lookup("x", cache) is global_env
+    assert cache.env is local and len(cache.guards) == 2
+    assert local.lookup("x", cache) is global_env
+    assert local.lookup("y", LookupCache()) is None
+
+
+def test_lookup_cache_shadowing():
+    global_env = Environment()
+    global_env.set("x", 1)
+    middle = Environment(global_env)
+    local = Environment(middle)
+    cache = LookupCache()
+    assert local.get_cached("x", cache) == 1
+    middle.define("x", 2)
+    assert local.get_cached("x", cache) == 2
+    local.define("x", 3)
+    assert local.get_cached("x", cache) == 3
+    assert middle.get_cached("x", cache) == 2
+
+
+def test_set_cached():
+    global_env = Environment()
+    global_env.set("x", 1)
+    local = Environment(global_env)
+    cache = LookupCache()
+    local.set_cached("x", 2, cache)
+    local.set_cached("y", 3, LookupCache())
+    assert global_env.get("x") == 2 and local.values["y"] == 3
+    global_env.define_function("f", len)
+    with pytest.raises(TypeError):
+        local.set_cached("f", 1, LookupCache())
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_host_mutation(engine):
+    interpreter = Interpreter(engine=engine)
+    interpreter.global_env.set("k", 1)
+    program = interpreter.compile("n = 2\nn * k")
+    assert interpreter.run(program) == 2
+    interpreter.global_env.set("k", 5)
+    assert interpreter.run(program) == 10
+    env = create_global_env()
+    env.set("k", 3)
+    assert interpreter.run(program, env) == 6
+
+
+def test_repeated_lookups():
+    interpreter = Interpreter()
+    source = (
+        "i = 0\ntotal = 0\nwhile i < 10:\n    total = total + i\n    i = i + 1\ntotal"
+    )
+    assert interpreter.execute(source) == 45
+    interpreter.global_env.set("i", 0)
+    assert interpreter.execute(source) == 45
+
+
+def test_declarations():
+    env = Environment()
+    env.define("x", 1)
+    env.define_function("f", len)
+    assert env.declarations is not None and "x" not in env.declarations
+    assert not env.declaration("f").mutable and env.declaration("x").mutable
+    env.set("x", 2)
+    assert env.values["x"] == 2
+    with pytest.raises(TypeError):
+        env.set("f", 1)
@@ -0,0 +1,64 @@
+import pytest
+
+from lunae.interpreter import ENGINES, Interpreter
+from lunae.interpreter.memo import MemoCache, pure
+from lunae.utils.errors import InterpreterError
+
+FIB = """
+memo func fib(n):
+    if n < 2: n
+    else: fib(n - 1) + fib(n - 2)
+"""
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_memoized_fib(engine):
+    interpreter = Interpreter(engine=engine)
+    assert interpreter.execute(FIB + "fib(30)") == 832040
+
+    info = interpreter.global_env.get("fib").cache.info()
+    assert (info.hits, info.misses, info.size) == (28, 31, 31)
+
+    interpreter.execute("fib(30)")
+    assert interpreter.global_env.get("fib").cache.hits == 29
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_impure_functions(engine):
+    interpreter = Interpreter(engine=engine)
+    interpreter.global_env.set("log", print)
+    interpreter.execute("total = 0")
+
+    for source in (
+        "memo func f(n): total = n\nf(1)",
+        "memo func g(n): log(n)\ng(1)",
+        "memo func h(n): undefined(n)\nh(1)",
+    ):
+        with pytest.raises(InterpreterError):
+            interpreter.execute(source)
+
+
+def test_pure_host_functions():
+    interpreter = Interpreter()
+    interpreter.global_env.set("double", pure(lambda n: n * 2))
+    interpreter.execute("memo func f(n): double(n)\nf(2)\nf(2)")
+    assert interpreter.global_env.get("f").cache.hits == 1
+
+
+def test_rebinding_clears_cache():
+    interpreter = Interpreter()
+    interpreter.execute("k = 1\nmemo func f(n): n + k\nf(1)")
+    assert interpreter.execute("k = 10\nf(1)") == 11
+
+
+def test_lru_eviction():
+    cache = MemoCache(maxsize=2)
+    cache.store((1,), "a")
+    cache.store((2,), "b")
+    cache.lookup((1,))
+    cache.store((3,), "c")
+    assert list(cache.entries) == [(1,), (3,)]
+    assert cache.evictions == 1
+
+    cache.resize(None, max_memory=0)
+    assert len(cache) == 0 and cache.memory == 0
@@ -0,0 +1,64 @@
+from lunae.interpreter import Interpreter, create_global_env
+from lunae.language.ast.base.block import Block
+from lunae.language.ast.functions.funccall import FuncCall
+from lunae.language.ast.values.number import Number
+from lunae.language.ast.values.string import String
+from lunae.optimizer import optimize
+from lunae.parser import parse
+from lunae.tokenizer import tokenize
+
+
+def optimize_source(source, global_env=None):
+    return optimize(parse(tokenize(source)), global_env)
+
+
+def test_fold_constants():
+    assert optimize_source("(2 * 3) + 1") == Block([Number(7.0)])
+    assert optimize_source("-(1 - 3) < 4") == Block([Number(True)])
+
+
+def test_keep_runtime_errors():
+    ast = optimize_source('1 / 0\n"a" - 1')
+    assert all(isinstance(s, FuncCall) for s in ast.statements)
+
+
+def test_collapse_if():
+    assert optimize_source('if 1 < 2: "yes"\nelse: "no"') == Block([String("yes")])
+    assert optimize_source("x = 1\nif 0: x\n2") == optimize_source("x = 1\n2")
+
+
+def test_drop_dead_loop():
+    assert optimize_source("while 0: 1") == Block([Block([])])
+
+
+def test_rebound_operator():
+    env = create_global_env()
+    env.set("add", lambda a, b: a * b)
+    assert isinstance(optimize_source("2 + 3", env).statements[0], FuncCall)
+
+    ast = optimize_source("func mul(a, b): a + b\n2 * 3")
+    assert isinstance(ast.statements[1], FuncCall)
+    assert Interpreter().eval(ast) == 5
+
+
+def test_discard_unused_loops():
+    ast = optimize_source("for i in range(3): i\nfunc f(): for j in range(2): j\n1")
+    loop, funcdef, _ = ast.statements
+    assert loop.discard and not loop.lazy
+    assert not funcdef.body.discard
+
+
+def test_lazy_nested_loop():
+    ast = optimize_source("for x in (for i in range(3): i * 2): x + 1")
+    outer = ast.statements[0]
+    assert not outer.discard
+    assert outer.iterable.lazy
+
+
+def test_eager_dependent_loop():
+    ast = optimize_source("for x in (for i in range(3): i): i")
+    assert not ast.statements[0].iterable.lazy
+    ast = optimize_source("for x in (for i in range(3): i): f(x)")
+    assert not ast.statements[0].iterable.lazy
+    ast = optimize_source("func add(a, b): a\nfor x in (for i in range(3): i): x + 1")
+    assert not ast.statements[1].iterable.lazy
@@ -0,0 +1,38 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from lunae.parser import parse, parse_parallel
+from lunae.tokenizer import tokenize, tokenize_parallel
+from lunae.tokenizer.parallel import split_source
+from lunae.utils.errors import ParserError
+
+SOURCES = [
+    "x = 1\nfunc f(a):\n    if a: 1\n    else: 2\ny = f(x)\nif y: 3\nelse: 4\nz = y\n",
+    'x = "a\nb = 1\n"\ny = x\n',
+    "\n\n# comment\n" + "".join(f"x{i} = {i}\n" for i in range(20)),
+]
+
+
+@pytest.fixture(scope="module", name="executor")
+def fixture_executor():
+    with ProcessPoolExecutor(2) as executor:
+        yield executor
+
+
+def test_split_source():
+    source = SOURCES[0]
+    assert split_source(source, 1) == [0, 6, 41, 50, 66]
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_parallel_matches_serial(source, executor):
+    assert tokenize_parallel(source, executor, chunk_size=4) == tokenize(source)
+    assert parse_parallel(source, executor, chunk_size=4) == parse(tokenize(source))
+
+
+def test_parallel_errors(executor):
+    source = "x = 1\ny = (\nz = 2\n"
+    with pytest.raises(ParserError) as error:
+        parse_parallel(source, executor, chunk_size=4)
+    assert error.value.start.line_number == 1
@@ -0,0 +1,29 @@
+from lunae.interpreter import Interpreter
+from lunae.language.ast.functions.funccall import FuncCall
+from lunae.parser import parse
+from lunae.tokenizer import tokenize
+
+
+def test_precedence():
+    interpreter = Interpreter()
+    assert interpreter.execute("2 * 3 + 1") == 7
+    assert interpreter.execute("1 + 2 * 3") == 7
+    assert interpreter.execute("- 2 * 3 + 1") == -5
+
+
+def test_left_associativity():
+    interpreter = Interpreter()
+    assert interpreter.execute("10 - 3 - 2") == 5
+    assert interpreter.execute("8 / 2 / 2") == 2
+
+
+def test_long_chain():
+    ast = parse(tokenize("1" + " + 1" * 5000))
+    node = ast.statements[0]
+    depth = 0
+    while isinstance(node, FuncCall):
+        assert node.callee.name == "add"
+        node = node.args[0]
+        depth += 1
+    assert depth == 5000
+    assert Interpreter().execute("1" + " + 1" * 100) == 101
@@ -0,0 +1,98 @@
+import pytest
+
+from lunae.interpreter import ENGINES, Interpreter
+from lunae.interpreter.environment import Environment
+from lunae.interpreter.pool import MAX_POOLED_FRAMES, FramePool, escapes
+from lunae.parser import parse
+from lunae.tokenizer import tokenize
+
+
+def funcdef(source: str):
+    return parse(tokenize(source)).statements[0]
+
+
+def test_escapes():
+    assert not escapes(funcdef("func f(x): x * x"))
+    assert not escapes(funcdef("func f(x):\n    for i in x: i\n    x"))
+    assert escapes(funcdef("func f(x):\n    func g(y): x + y\n    g"))
+
+
+def test_frame_reuse():
+    pool = FramePool(Environment(), ("x",))
+    first = pool.call(lambda local: local, (1,))
+    assert not first.values and pool.free == [first]
+    assert pool.call(lambda local: local.get("x"), (2,)) == 2
+    assert pool.call(lambda local: local, (3,)) is first
+
+    nested = pool.call(
+        lambda local: pool.call(lambda inner: (local, inner), (4,)), (5,)
+    )
+    assert nested[0] is not nested[1]
+    assert len(pool.free) == 2
+
+
+def test_frame_release_on_error():
+    pool = FramePool(Environment(), ("x",))
+
+    def fail(_local):
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        pool.call(fail, (1,))
+    assert len(pool.free) == 1 and not pool.free[0].values
+
+
+def test_pool_size():
+    pool = FramePool(Environment(), ("x",))
+
+    def recurse(local):
+        n = local.get("x")
+        return pool.call(recurse, (n - 1,)) if n else 0
+
+    pool.call(recurse, (MAX_POOLED_FRAMES * 2,))
+    assert len(pool.free) == MAX_POOLED_FRAMES
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_pooled_calls(engine):
+    interpreter = Interpreter(engine=engine)
+    source = """
+func fib(n):
+    if n < 2: n
+    else: fib(n - 1) + fib(n - 2)
+func local(x):
+    y = x + 1
+    y
+func adder(x):
+    func plus(y): x + y
+    plus
+[fib(15), local(1), local(2), adder(1)(2), adder(3)(2)]
+"""
+    interpreter.global_env.set("list", lambda *items: list(items))
+    assert interpreter.execute(source.replace("[", "list(").replace("]", ")")) == [
+        610,
+        2,
+        3,
+        3,
+        5,
+    ]
+
+
+@pytest.mark.parametrize("engine", ["tree", "closure", "stack"])
+def test_locals_cleared(engine):
+    interpreter = Interpreter(engine=engine)
+    interpreter.execute("func f(x):\n    if x: y = x\n    y")
+    assert interpreter.execute("f(1)") == 1
+    with pytest.raises(NameError):
+        interpreter.execute("f(0)")
+
+
+@pytest.mark.parametrize("engine", ["tree", "closure", "bytecode", "python", "stack"])
+def test_scopes_released(engine):
+    interpreter = Interpreter(engine=engine)
+    interpreter.execute(
+        "func fib(n):\n    if n < 2: n\n    else: fib(n - 1) + fib(n - 2)\nfib(15)"
+    )
+    free = interpreter.global_env.get("fib").pool.free
+    assert 0 < len(free) <= MAX_POOLED_FRAMES
+    assert not any(local.values for local in free)
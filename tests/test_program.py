@@ -0,0 +1,71 @@
+import pytest
+
+from lunae.interpreter import ENGINES, Interpreter, create_global_env
+from lunae.language.ast.base.block import Block
+from lunae.language.ast.values.number import Number
+
+SOURCE = "func f(n):\n    if n < 2: n\n    else: f(n - 1) + f(n - 2)\nf(x)"
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_run_in_environments(engine):
+    interpreter = Interpreter(engine=engine)
+    program = interpreter.compile(SOURCE)
+
+    for x, expected in ((10, 55), (12, 144)):
+        env = create_global_env()
+        env.set("x", x)
+        assert interpreter.run(program, env) == expected
+        assert env.get("f")
+
+
+def test_optimized_program():
+    interpreter = Interpreter()
+    program = interpreter.compile("(2 * 3) + 1", optimized=True)
+    assert program.ast == Block([Number(7.0)])
+    assert program.optimized and program.nbytes > 0
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_execute_cache(engine):
+    interpreter = Interpreter(engine=engine)
+    interpreter.execute("x = 0")
+    for _ in range(3):
+        interpreter.execute("x = x + 1")
+    assert interpreter.execute("x") == 3
+
+    info = interpreter.programs.info()
+    assert (info.hits, info.misses, info.size) == (2, 3, 3)
+
+    interpreter.programs.resize(1)
+    assert interpreter.programs.info().evictions == 2
+
+
+@pytest.mark.parametrize("engine", ["closure", "slots"])
+def test_compiled_closures(engine):
+    interpreter = Interpreter(engine=engine)
+    interpreter.global_env.set("x", 10)
+    program = interpreter.compile(SOURCE)
+    assert interpreter.run(program) == 55
+    compiled = program.compiled[engine]
+    assert interpreter.run(program) == 55
+    assert program.compiled[engine] is compiled
+
+    env = create_global_env()
+    env.set("x", 12)
+    assert interpreter.run(program, env) == 144
+    assert program.compiled[engine] is not compiled
+    assert program.compiled[engine][0] is env
+
+
+@pytest.mark.parametrize("engine", ["closure", "slots"])
+def test_compiled_closures_rebound_global(engine):
+    interpreter = Interpreter(engine=engine)
+    program = interpreter.compile("func f(): y = 2\nf()")
+    interpreter.run(program)
+    with pytest.raises(NameError):
+        interpreter.global_env.get("y")
+
+    interpreter.global_env.set("y", 0)
+    interpreter.run(program)
+    assert interpreter.global_env.get("y") == 2
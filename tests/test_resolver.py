@@ -0,0 +1,31 @@
+from lunae.interpreter import create_global_env
+from lunae.interpreter.resolver import Resolver
+from lunae.parser import parse
+from lunae.tokenizer import tokenize
+
+
+def resolve(source):
+    return Resolver().resolve(parse(tokenize(source)), create_global_env())
+
+
+def test_function_layout():
+    outer = resolve(
+        "total = 0\nfunc outer(a):\n    b = a\n    total = b\n    func inner(): b = a\n    inner"
+    ).statements[1]
+    assert outer.layout == ("a", "inner", "b")
+
+    body = outer.body.statements
+    assert body[0].address == (0, 2)  # b, local
+    assert body[0].value.address == (0, 0)  # a, parameter
+    assert body[1].address is None  # total, global
+    assert body[2].address == (0, 1)  # inner, local function
+
+    inner = body[2]
+    assert inner.layout == ()
+    assert inner.body.address == (1, 2)
+    assert inner.body.value.address == (1, 0)
+
+
+def test_builtins_stay_global():
+    call = resolve("func f(x): x + 1").statements[0].body
+    assert call.callee.address is None
@@ -0,0 +1,87 @@
+import pytest
+
+from lunae.interpreter import ENGINES, Interpreter, create_global_env
+from lunae.interpreter.environment import Environment
+
+PRELUDE = "limit = 10\nfunc double(x): x * 2\n"
+
+
+def prelude() -> Environment:
+    interpreter = Interpreter()
+    interpreter.execute(PRELUDE)
+    return interpreter.global_env.snapshot()
+
+
+def test_snapshot_is_frozen():
+    snapshot = prelude()
+    assert snapshot.frozen and snapshot.get("limit") == 10
+    with pytest.raises(TypeError):
+        snapshot.set("limit", 1)
+    with pytest.raises(TypeError):
+        snapshot.define("other", 1)
+
+
+def test_snapshot_is_a_copy():
+    env = create_global_env()
+    env.set("x", 1)
+    snapshot = env.snapshot()
+    env.set("x", 2)
+    assert snapshot.get("x") == 1
+
+
+def test_fork_writes_are_private():
+    snapshot = prelude()
+    first, second = snapshot.fork(), snapshot.fork()
+    assert first.parent is snapshot and list(first.values) == ["double"]
+    first.set("limit", 20)
+    first.set("y", 1)
+    assert first.get("limit") == 20 and snapshot.get("limit") == 10
+    assert second.get("limit") == 10
+    with pytest.raises(NameError):
+        second.get("y")
+
+
+def test_fork_is_one_scope():
+    fork = prelude().fork()
+    with pytest.raises(NameError):
+        fork.define("limit", 1)
+    fork.define_function("double", len)
+    assert fork.get("double") is len and fork.parent.get("double") is not len
+    assert fork.fork().parent.get("limit") == 10
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_tenants(engine):
+    snapshot = prelude()
+    results = []
+    for value in (1, 2):
+        interpreter = Interpreter(snapshot.fork(), engine)
+        results.append(interpreter.execute(f"limit = limit + {value}\ndouble(limit)"))
+    assert results == [22, 24]
+    assert snapshot.get("limit") == 10
+
+
+@pytest.mark.parametrize("engine", [engine for engine in ENGINES if engine != "slots"])
+def test_prelude_functions_use_the_fork(engine):
+    interpreter = Interpreter(engine=engine)
+    interpreter.execute(
+        "count = 0\nfunc incr(): count = count + 1\nmemo func square(x): x * x"
+    )
+    snapshot = interpreter.global_env.snapshot()
+    first, second = snapshot.fork(), snapshot.fork()
+    assert first.get("incr").env is first and first.get("incr") is not second.get(
+        "incr"
+    )
+
+    results = []
+    for fork, calls in ((first, 2), (second, 3)):
+        tenant = Interpreter(fork, engine)
+        results.append(tenant.execute("incr()\n" * calls + "square(count)"))
+    assert results == [4, 9]
+    assert first.get("count") == 2 and second.get("count") == 3
+    assert snapshot.get("count") == 0 and interpreter.global_env.get("count") == 0
+
+    with pytest.raises(TypeError):
+        first.set("incr", 1)
+    Interpreter(first, engine).execute("func incr(): count = count - 1\nincr()")
+    assert first.get("count") == 1
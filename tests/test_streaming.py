@@ -0,0 +1,50 @@
+import io
+
+import pytest
+
+from lunae.interpreter import ENGINES, Interpreter
+from lunae.parser import parse, parse_iter
+from lunae.tokenizer import tokenize, tokenize_stream
+from lunae.utils.errors import ParserError
+
+SOURCE = """
+x = 1
+func f(a):
+    a + x
+
+f(2)
+if x: 3
+else: 4
+"""
+
+
+def test_parse_iter():
+    statements = list(parse_iter(tokenize_stream(io.StringIO(SOURCE), 8)))
+    assert statements == parse(tokenize(SOURCE)).statements
+    assert list(parse_iter(tokenize(SOURCE))) == statements
+
+
+def test_parse_iter_lazy():
+    def tokens():
+        yield from tokenize("1\n2\n")
+        raise AssertionError("Read past the first statements")
+
+    statements = parse_iter(tokens())
+    assert next(statements) == parse(tokenize("1")).statements[0]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_execute_stream(engine):
+    interpreter = Interpreter(engine=engine)
+    results = list(interpreter.execute_stream(io.StringIO(SOURCE), 8))
+    assert results[0] == 1
+    assert results[2:] == [3, 3]
+
+
+def test_execute_stream_runs_before_errors():
+    interpreter = Interpreter()
+    results = interpreter.execute_stream(io.StringIO("x = 1\nx + 1\n)\n"))
+    assert next(results) == 1
+    assert next(results) == 2
+    with pytest.raises(ParserError):
+        next(results)
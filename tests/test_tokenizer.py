@@ -0,0 +1,79 @@
+import io
+import pickle
+
+import pytest
+
+from lunae.parser import parse
+from lunae.tokenizer import tokenize, tokenize_stream
+from lunae.tokenizer.reader import read_tokens
+from lunae.utils.errors import TokenizerError
+from lunae.utils.sourceposition import SourcePosition
+
+SOURCES = [
+    "",
+    "a\n  b\n\n  c\nd",
+    "func f(x):\n    if x: 1\n    else: 2\n# comment\n  # indented\nf(1)",
+    'a\n\tb\n    c\n  \nx = "s\\"t" # end\n',
+    "if a:\n  if b:\n    c\nd\n",
+    "x\n   ",
+]
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_scan_matches_reader(source):
+    tokens = tokenize(source)
+    assert tokens == read_tokens(source)
+    assert repr(tokens) == repr(read_tokens(source))
+
+
+def test_lazy_positions():
+    token = tokenize("a\n  bc")[3]
+    assert "start" not in vars(token)
+    assert token.start == SourcePosition(1, 2)
+    assert token.end == SourcePosition(1, 4)
+
+
+def test_positions_after_multiline_string():
+    tokens = tokenize('a = "x\ny"\nb c')
+    assert [token.match for token in tokens] == ["a", "=", '"x\ny"', "\n", "b", "c"]
+    assert tokens[2].end == SourcePosition(1, 2)
+    assert tokens[4].start == SourcePosition(2, 0)
+    assert tokens[5].start == SourcePosition(2, 2)
+    # The reader does not count the line break inside the string
+    assert read_tokens('a = "x\ny"\nb c')[4].start == SourcePosition(1, 0)
+
+
+def test_pickle_token():
+    token = tokenize("a\n  bc")[3]
+    data = pickle.dumps(token)
+    assert b"LineIndex" not in data
+    assert pickle.loads(data) == token
+    assert pickle.loads(data).end == SourcePosition(1, 4)
+
+
+def test_unknown_character():
+    with pytest.raises(TokenizerError) as error:
+        tokenize("a\n  $")
+    assert error.value.start == SourcePosition(1, 2)
+
+
+@pytest.mark.parametrize("chunk_size", (1, 3, 64))
+@pytest.mark.parametrize("source", [*SOURCES, 'a = "multi\nline"\n  b\nc'])
+def test_stream_matches_scan(source, chunk_size):
+    tokens = list(tokenize_stream(io.StringIO(source), chunk_size))
+    assert tokens == tokenize(source)
+    assert [t.start for t in tokens] == [t.start for t in tokenize(source)]
+
+
+def test_parse_stream():
+    source = "func f(x):\n    x * 2\nf(21)\n" * 10
+    assert parse(tokenize_stream(io.StringIO(source), 8)) == parse(tokenize(source))
+
+
+def test_token_buffer():
+    source = "func f(x):\n    if x: 1\n    else: 2\nf(1)"
+    tokens = tokenize(source)
+    assert tokens.nbytes == 9 * len(tokens)
+    assert tokens[-1] == read_tokens(source)[-1]
+    assert tokens.match(0) == "func"
+    assert parse(tokens) == parse(list(tokens))